@@ -1,97 +1,367 @@
 # api/azdo.py
 
 import asyncio
+import functools
+import json
+import time
 from datetime import datetime, timedelta
 
 import aiohttp
+from azdotui.api.connections import ConnectionStats, create_connector, create_timeout
 from azdotui.config.logger import logger
-from azdotui.config.settings import AZDO_ORGANIZATION, AZDO_PAT
+from azdotui.config.settings import (AZDO_BASE_URL, AZDO_ORGANIZATION, AZDO_PAT, MAX_RETRIES, ORG_CONNECTION_LIMIT,
+                                     PREFETCH_TTL, WARM_CONNECTIONS)
+from azdotui.utils.bulk import run_bounded
+from azdotui.utils.metrics import metrics
+
+
+def prefetch_key(method, args, kwargs):
+    return method, args, tuple(sorted(kwargs.items()))
+
+
+def prefetchable(method):
+    """
+    Let `method` be warmed by AzureDevOpsClient.prefetch. A call with the same
+    arguments takes over the prefetched result, or the request still in
+    flight, instead of starting its own.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = prefetch_key(method.__name__, args, kwargs)
+        entry = self.prefetches.pop(key, None)
+        if entry:
+            started, task = entry
+            if not task.done() or time.monotonic() - started < PREFETCH_TTL:
+                data = await task
+                metrics.record_cache('prefetch', hit=bool(data))
+                if data:  # Failed prefetches return {}; fetch again
+                    return data
+        return await method(self, *args, **kwargs)
+
+    wrapper.fetch = method
+    return wrapper
 
 
 class AzureDevOpsClient:
-    def __init__(self):
+    """
+    Client for one organization. Every instance has its own connection pool,
+    caches, prefetches and rate-limit backoff, so several organizations can be
+    used side by side without one's traffic or throttling affecting another.
+    """
+
+    def __init__(self, base_url=None, pat=None, organization=None, connection_limit=ORG_CONNECTION_LIMIT):
+        self.connection_stats = ConnectionStats()
         self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            connector=aiohttp.TCPConnector(limit=100)
+            timeout=create_timeout(),
+            connector=create_connector(connection_limit),
+            trace_configs=[self.connection_stats.trace_config()]
         )
-        self.auth = aiohttp.BasicAuth('', AZDO_PAT)
-        self.base_url = f'https://dev.azure.com/{AZDO_ORGANIZATION}'
+        self.auth = aiohttp.BasicAuth('', pat or AZDO_PAT)
+        self.base_url = (base_url or AZDO_BASE_URL).rstrip('/')
+        self.organization = organization or AZDO_ORGANIZATION
+        self.throttled_until = 0.0  # Monotonic time before which requests wait out a 429
         self.projects_cache = None
         self.projects_cache_expiry = datetime.utcnow()
         self.pipelines_cache = {}
         self.pipelines_cache_expiry = {}
+        self.pools_cache = None
+        self.pools_cache_expiry = datetime.utcnow()
+        self.prefetches = {}  # prefetch_key(...) -> (start time, task)
+        self.warm_up_task = None
+
+    def start_warm_up(self, connections=WARM_CONNECTIONS):
+        """Run warm_up in the background, e.g. while the UI initialises."""
+        if connections > 0:
+            self.warm_up_task = asyncio.create_task(self.warm_up(connections))
+        return self.warm_up_task
+
+    async def warm_up(self, connections=WARM_CONNECTIONS):
+        """
+        Open `connections` pooled connections in parallel, so DNS, TCP and TLS
+        setup is paid before the user asks for anything. One of them fetches
+        the project list as a prefetch, so the first real request takes over
+        its result; the others make a minimal authenticated request.
+        """
+        url = f'{self.base_url}/_apis/connectionData'
+
+        async def connect():
+            start = time.perf_counter()
+            status = 'error'
+            try:
+                async with self.session.get(url, auth=self.auth) as response:
+                    status = response.status
+                    await response.read()  # Leaves the connection in the pool
+            except asyncio.CancelledError:
+                status = 'cancelled'
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm a connection to {self.organization}: {e}")
+            finally:
+                metrics.record_request('warm_up', time.perf_counter() - start, status, 0)
+
+        await asyncio.gather(self.prefetch('get_projects'), *[connect() for _ in range(connections - 1)])
+        logger.info(f"Pre-warmed {connections} connections to {self.organization}: {self.connection_stats.summary()}")
 
     async def close(self):
+        if self.warm_up_task:
+            self.warm_up_task.cancel()
+            await asyncio.gather(self.warm_up_task, return_exceptions=True)
         try:
             await self.session.close()
             logger.info("AzureDevOpsClient session closed successfully.")
         except Exception as e:
             logger.error(f"Failed to close the AzureDevOpsClient session: {e}")
 
+    async def _request(self, method, endpoint, url, **kwargs):
+        """
+        Perform a request and decode its JSON body, recording latency, status,
+        payload size and decode time under `endpoint`. Responses with status
+        429 are retried up to MAX_RETRIES times after their Retry-After delay,
+        and other requests of this client wait out the same delay.
+        A continuation token header is returned as data['continuationToken'].
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            backoff = self.throttled_until - time.monotonic()
+            if backoff > 0:
+                await asyncio.sleep(backoff)
+            start = time.perf_counter()
+            status = 'error'
+            body = b''
+            retry_after = None
+            continuation = None
+            try:
+                async with self.session.request(method, url, auth=self.auth, **kwargs) as response:
+                    status = response.status
+                    if status == 429 and attempt < MAX_RETRIES:
+                        retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+                    else:
+                        response.raise_for_status()
+                        body = await response.read()
+                        continuation = response.headers.get('x-ms-continuationtoken')
+            except asyncio.CancelledError:
+                status = 'cancelled'  # Superseded loads and abandoned prefetches
+                raise
+            finally:
+                metrics.record_request(endpoint, time.perf_counter() - start, status, len(body))
+            if retry_after is None:
+                break
+            logger.warning(f"Rate limited on {endpoint} in {self.organization}, retrying in {retry_after}s")
+            self.throttled_until = max(self.throttled_until, time.monotonic() + retry_after)
+        if not body:
+            return {}
+        with metrics.timer(f'decode.{endpoint}'):
+            data = json.loads(body)
+        if continuation and isinstance(data, dict):
+            data['continuationToken'] = continuation  # Pass to the next request to get the following page
+        return data
+
+    @prefetchable
     async def get_projects(self):
         if self.projects_cache and self.projects_cache_expiry > datetime.utcnow():
+            metrics.record_cache('projects', hit=True)
             return self.projects_cache
+        metrics.record_cache('projects', hit=False)
         url = f'{self.base_url}/_apis/projects?api-version=6.0'
         try:
-            async with self.session.get(url, auth=self.auth) as response:
-                response.raise_for_status()
-                data = await response.json()
-                self.projects_cache = data
-                self.projects_cache_expiry = datetime.utcnow() + timedelta(minutes=10)
-                logger.info("Fetched projects successfully.")
-                return data
+            data = await self._request('GET', 'projects', url)
+            self.projects_cache = data
+            self.projects_cache_expiry = datetime.utcnow() + timedelta(minutes=10)
+            logger.info("Fetched projects successfully.")
+            return data
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Failed to get projects: {e}")
             return {}
 
+    async def prefetch(self, method, *args, **kwargs):
+        """
+        Fetch `method(*args, **kwargs)` ahead of time for the next call that asks for it.
+        Cancelling the prefetch cancels the request unless a caller has
+        already taken it over.
+        """
+        now = time.monotonic()
+        for key, (started, task) in list(self.prefetches.items()):
+            if task.done() and now - started >= PREFETCH_TTL:
+                del self.prefetches[key]
+        key = prefetch_key(method, args, kwargs)
+        if key in self.prefetches:
+            return
+        task = asyncio.ensure_future(getattr(self, method).fetch(self, *args, **kwargs))
+        self.prefetches[key] = (now, task)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self.prefetches.get(key, (None, None))[1] is task:
+                del self.prefetches[key]
+                task.cancel()
+            raise
+
+    @prefetchable
     async def get_pipelines(self, project_id):
         if project_id in self.pipelines_cache and self.pipelines_cache_expiry.get(project_id, datetime.min) > datetime.utcnow():
+            metrics.record_cache('pipelines', hit=True)
             return self.pipelines_cache[project_id]
+        metrics.record_cache('pipelines', hit=False)
         url = f'{self.base_url}/{project_id}/_apis/pipelines?api-version=6.0'
         try:
-            async with self.session.get(url, auth=self.auth) as response:
-                response.raise_for_status()
-                data = await response.json()
-                self.pipelines_cache[project_id] = data
-                self.pipelines_cache_expiry[project_id] = datetime.utcnow() + timedelta(minutes=10)
-                logger.info(f"Fetched pipelines for project {project_id} successfully.")
-                return data
+            data = await self._request('GET', 'pipelines', url)
+            self.pipelines_cache[project_id] = data
+            self.pipelines_cache_expiry[project_id] = datetime.utcnow() + timedelta(minutes=10)
+            logger.info(f"Fetched pipelines for project {project_id} successfully.")
+            return data
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Failed to get pipelines for project {project_id}: {e}")
             return {}
 
+    @prefetchable
     async def get_build_status(self, project_id, pipeline_id):
         url = f'{self.base_url}/{project_id}/_apis/build/builds?definitions={pipeline_id}&$top=10&api-version=6.0'
         try:
-            async with self.session.get(url, auth=self.auth) as response:
-                response.raise_for_status()
-                data = await response.json()
-                logger.info(f"Fetched build status for pipeline {pipeline_id} successfully.")
-                return data
+            data = await self._request('GET', 'build_status', url)
+            logger.info(f"Fetched build status for pipeline {pipeline_id} successfully.")
+            return data
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Failed to get build status: {e}")
             return {}
 
+    @prefetchable
     async def get_all_builds(self, project_id):
         url = f'{self.base_url}/{project_id}/_apis/build/builds?$top=50&api-version=6.0'
         try:
-            async with self.session.get(url, auth=self.auth) as response:
-                response.raise_for_status()
-                data = await response.json()
-                logger.info(f"Fetched all builds for project {project_id} successfully.")
-                return data
+            data = await self._request('GET', 'builds', url)
+            logger.info(f"Fetched all builds for project {project_id} successfully.")
+            return data
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Failed to get all builds for project {project_id}: {e}")
             return {}
 
+    @prefetchable
+    async def get_builds(self, project_id, status_filter=None, top=50, **params):
+        """
+        List builds using the API's server-side filters. Extra keyword
+        arguments are passed through as query parameters.
+        """
+        url = f'{self.base_url}/{project_id}/_apis/build/builds'
+        query = {'api-version': '6.0', '$top': str(top)}
+        if status_filter:
+            query['statusFilter'] = status_filter
+        query.update({key: str(value) for key, value in params.items() if value is not None})
+        try:
+            data = await self._request('GET', 'builds', url, params=query)
+            logger.info(f"Fetched builds for project {project_id} with {query}.")
+            return data
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get builds for project {project_id}: {e}")
+            return {}
+
+    async def iter_builds(self, project_id, continuation_token=None, **params):
+        """
+        Yield (builds, continuation token) for each page of builds matching
+        the query parameters in `params`, starting at `continuation_token`.
+        The token is None on the last page. Errors are raised rather than
+        swallowed, so callers can resume from the last token they saw.
+        """
+        url = f'{self.base_url}/{project_id}/_apis/build/builds'
+        query = {'api-version': '6.0'}
+        query.update({key: str(value) for key, value in params.items() if value is not None})
+        while True:
+            if continuation_token:
+                query['continuationToken'] = continuation_token
+            data = await self._request('GET', 'builds', url, params=query)
+            continuation_token = data.get('continuationToken')
+            yield data.get('value', []), continuation_token
+            if not continuation_token:
+                return
+
+    async def get_build(self, project_id, build_id):
+        url = f'{self.base_url}/{project_id}/_apis/build/builds/{build_id}?api-version=6.0'
+        try:
+            return await self._request('GET', 'build', url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get build {build_id}: {e}")
+            return {}
+
+    async def get_build_timeline(self, project_id, build_id, change_id=None):
+        """
+        Fetch a build's timeline. With `change_id` only records changed since
+        that timeline change are returned.
+        """
+        url = f'{self.base_url}/{project_id}/_apis/build/builds/{build_id}/timeline'
+        params = {'api-version': '6.0'}
+        if change_id is not None:
+            params['changeId'] = str(change_id)
+        try:
+            return await self._request('GET', 'timeline', url, params=params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get timeline for build {build_id}: {e}")
+            return {}
+
+    async def get_build_logs(self, project_id, build_id):
+        url = f'{self.base_url}/{project_id}/_apis/build/builds/{build_id}/logs?api-version=6.0'
+        try:
+            return await self._request('GET', 'logs', url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get logs for build {build_id}: {e}")
+            return {}
+
+    async def iter_build_log_lines(self, project_id, build_id, log_id, start_line=None):
+        """
+        Stream the lines of one build log as raw bytes, starting at the
+        1-based `start_line`. The body is read in chunks so large logs are
+        never held in memory at once; decoding is left to the caller.
+        Throttling is handled as in _request: 429 responses are retried after
+        their Retry-After delay, which other requests of this client wait out too.
+        """
+        url = f'{self.base_url}/{project_id}/_apis/build/builds/{build_id}/logs/{log_id}'
+        params = {'api-version': '6.0'}
+        if start_line:
+            params['startLine'] = str(start_line)
+        for attempt in range(MAX_RETRIES + 1):
+            backoff = self.throttled_until - time.monotonic()
+            if backoff > 0:
+                await asyncio.sleep(backoff)
+            start = time.perf_counter()
+            status = 'error'
+            nbytes = 0
+            retry_after = None
+            try:
+                async with self.session.get(url, auth=self.auth, params=params, headers={'Accept': 'text/plain'}) as response:
+                    status = response.status
+                    if status == 429 and attempt < MAX_RETRIES:
+                        retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+                    else:
+                        response.raise_for_status()
+                        pending = b''
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            nbytes += len(chunk)
+                            pending += chunk
+                            *lines, pending = pending.split(b'\n')
+                            for line in lines:
+                                yield line.rstrip(b'\r')
+                        if pending:
+                            yield pending.rstrip(b'\r')
+            finally:
+                metrics.record_request('log_lines', time.perf_counter() - start, status, nbytes)
+            if retry_after is None:
+                return
+            logger.warning(f"Rate limited on log_lines in {self.organization}, retrying in {retry_after}s")
+            self.throttled_until = max(self.throttled_until, time.monotonic() + retry_after)
+
     async def trigger_pipeline(self, project_id, pipeline_id, branch):
         url = f'{self.base_url}/{project_id}/_apis/pipelines/{pipeline_id}/runs?api-version=6.0-preview.1'
         json_data = {
@@ -104,40 +374,129 @@ class AzureDevOpsClient:
             }
         }
         try:
-            async with self.session.post(url, json=json_data, auth=self.auth) as response:
-                response.raise_for_status()
-                logger.info(f"Triggered pipeline {pipeline_id} on branch '{branch}'")
+            data = await self._request('POST', 'trigger', url, json=json_data)
+            logger.info(f"Triggered pipeline {pipeline_id} on branch '{branch}'")
+            return data
         except asyncio.CancelledError:
             raise  # Re-raise to allow task cancellation
         except Exception as e:
             logger.error(f"Failed to trigger pipeline {pipeline_id}: {e}")
             raise  # Optionally re-raise or handle as needed
 
-    async def get_pipeline_runs(self, project_id, pipeline_id):
-        url = f'{self.base_url}/{project_id}/_apis/pipelines/{pipeline_id}/runs?api-version=6.0-preview.1'
+    async def get_pipeline_runs(self, project_id, pipeline_id, continuation_token=None):
+        url = f'{self.base_url}/{project_id}/_apis/pipelines/{pipeline_id}/runs'
+        query = {'api-version': '6.0-preview.1'}
+        if continuation_token:
+            query['continuationToken'] = continuation_token
         try:
-            async with self.session.get(url, auth=self.auth) as response:
-                response.raise_for_status()
-                data = await response.json()
-                logger.info(f"Fetched pipeline runs for pipeline {pipeline_id} successfully.")
-                return data
+            data = await self._request('GET', 'runs', url, params=query)
+            logger.info(f"Fetched pipeline runs for pipeline {pipeline_id} successfully.")
+            return data
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Failed to get pipeline runs: {e}")
             return {}
 
+    async def get_agent_pools(self):
+        if self.pools_cache and self.pools_cache_expiry > datetime.utcnow():
+            metrics.record_cache('pools', hit=True)
+            return self.pools_cache
+        metrics.record_cache('pools', hit=False)
+        url = f'{self.base_url}/_apis/distributedtask/pools?api-version=6.0'
+        try:
+            data = await self._request('GET', 'pools', url)
+            self.pools_cache = data
+            self.pools_cache_expiry = datetime.utcnow() + timedelta(minutes=10)
+            return data
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get agent pools: {e}")
+            return {}
+
+    async def get_pool_agents(self, pool_id):
+        # Capabilities are most of an agent's payload and aren't needed for counting
+        url = f'{self.base_url}/_apis/distributedtask/pools/{pool_id}/agents'
+        params = {'api-version': '6.0', 'includeCapabilities': 'false', 'includeAssignedRequest': 'true'}
+        try:
+            return await self._request('GET', 'pool_agents', url, params=params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get agents of pool {pool_id}: {e}")
+            return {}
+
+    async def get_pool_job_requests(self, pool_id):
+        """Queued and running job requests of an agent pool; completed ones are left out."""
+        url = f'{self.base_url}/_apis/distributedtask/pools/{pool_id}/jobrequests'
+        params = {'api-version': '6.0', 'completedRequestCount': '0'}
+        try:
+            return await self._request('GET', 'pool_jobs', url, params=params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get job requests of pool {pool_id}: {e}")
+            return {}
+
     async def cancel_build(self, project_id, build_id):
         url = f'{self.base_url}/{project_id}/_apis/build/builds/{build_id}?api-version=6.0'
         json_data = {
             "status": "Cancelling"
         }
         try:
-            async with self.session.patch(url, json=json_data, auth=self.auth) as response:
-                response.raise_for_status()
-                logger.info(f"Cancelled build {build_id} in project {project_id}")
+            data = await self._request('PATCH', 'cancel', url, json=json_data)
+            logger.info(f"Cancelled build {build_id} in project {project_id}")
+            return data
         except asyncio.CancelledError:
             raise  # Re-raise to allow task cancellation
         except Exception as e:
             logger.error(f"Failed to cancel build {build_id}: {e}")
             raise  # Optionally re-raise or handle as needed
+
+    async def get_approvals(self, project_id, state='pending'):
+        """All of a project's approvals in `state`, with their steps, in one request."""
+        url = f'{self.base_url}/{project_id}/_apis/pipelines/approvals'
+        params = {'api-version': '7.1-preview.1', 'state': state, '$expand': 'steps'}
+        try:
+            return await self._request('GET', 'approvals', url, params=params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get approvals for project {project_id}: {e}")
+            return {}
+
+    async def update_approval(self, project_id, approval_id, status, comment=''):
+        """Approve or reject one approval; `status` is 'approved' or 'rejected'."""
+        url = f'{self.base_url}/{project_id}/_apis/pipelines/approvals?api-version=7.1-preview.1'
+        json_data = [{'approvalId': approval_id, 'status': status, 'comment': comment}]
+        try:
+            data = await self._request('PATCH', 'approve', url, json=json_data)
+            logger.info(f"Set approval {approval_id} in project {project_id} to {status}")
+            return data
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to set approval {approval_id} to {status}: {e}")
+            raise
+
+    def trigger_pipelines(self, project_id, pipeline_ids, branch):
+        """
+        Trigger several pipelines with bounded concurrency, yielding
+        (pipeline_id, result, error) as each request completes.
+        """
+        return run_bounded(pipeline_ids, lambda pipeline_id: self.trigger_pipeline(project_id, pipeline_id, branch))
+
+    def cancel_builds(self, project_id, build_ids):
+        """
+        Cancel several builds with bounded concurrency, yielding
+        (build_id, result, error) as each request completes.
+        """
+        return run_bounded(build_ids, lambda build_id: self.cancel_build(project_id, build_id))
+
+    def update_approvals(self, project_id, approval_ids, status, comment=''):
+        """
+        Approve or reject several approvals with bounded concurrency, yielding
+        (approval_id, result, error) as each request completes.
+        """
+        return run_bounded(approval_ids, lambda approval_id: self.update_approval(project_id, approval_id, status, comment))
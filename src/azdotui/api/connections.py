@@ -0,0 +1,76 @@
+# api/connections.py
+
+import time
+from collections import defaultdict
+
+import aiohttp
+from azdotui.config.settings import CONNECT_TIMEOUT, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, READ_TIMEOUT
+from azdotui.utils.metrics import metrics
+
+
+def create_connector(limit):
+    # A client talks to one organization's host, so its limit applies per host too
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+
+
+def create_timeout():
+    # No total timeout, so long log streams are not cut off; a stalled connect or read still fails
+    return aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+
+
+class ConnectionStats:
+    """
+    Counts how one client's requests got their connections: reused from the
+    pool, newly created (with DNS, TCP and TLS setup), or queued for a free
+    slot. Totals across clients also go to `metrics` under `connections.*`.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+
+    def count(self, name):
+        self.counts[name] += 1
+        metrics.increment(f'connections.{name}')
+
+    def trace_config(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_start.append(self.on_create_start)
+        trace.on_connection_create_end.append(self.on_create_end)
+        trace.on_connection_reuseconn.append(self.on_reuse)
+        trace.on_connection_queued_start.append(self.on_queued_start)
+        trace.on_connection_queued_end.append(self.on_queued_end)
+        trace.on_dns_cache_hit.append(self.on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self.on_dns_cache_miss)
+        return trace
+
+    async def on_create_start(self, session, context, params):
+        context.create_start = time.perf_counter()
+
+    async def on_create_end(self, session, context, params):
+        self.count('created')
+        metrics.observe('connections.setup', (time.perf_counter() - context.create_start) * 1000)
+
+    async def on_reuse(self, session, context, params):
+        self.count('reused')
+
+    async def on_queued_start(self, session, context, params):
+        context.queued_start = time.perf_counter()
+
+    async def on_queued_end(self, session, context, params):
+        self.count('queued')
+        metrics.observe('connections.queued', (time.perf_counter() - context.queued_start) * 1000)
+
+    async def on_dns_cache_hit(self, session, context, params):
+        self.count('dns_cache_hit')
+
+    async def on_dns_cache_miss(self, session, context, params):
+        self.count('dns_cache_miss')
+
+    def summary(self):
+        created, reused = self.counts['created'], self.counts['reused']
+        return dict(self.counts, reuse_ratio=reused / (created + reused) if created + reused else None)
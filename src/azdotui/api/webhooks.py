@@ -0,0 +1,107 @@
+# api/webhooks.py
+
+import hmac
+
+from aiohttp import BasicAuth, web
+from azdotui.config.logger import logger
+
+# Pipeline run states mapped onto the build API's status values
+RUN_STATES = {
+    'inprogress': 'inProgress',
+    'completed': 'completed',
+    'canceling': 'cancelling',
+    'unknown': 'notStarted',
+}
+
+
+def build_from_payload(payload):
+    """
+    Turn a build.complete or run-state-changed service hook payload into
+    (project_id, build) where `build` has the same shape as the builds API.
+    Returns (None, None) for events that are not about builds.
+    """
+    event_type = payload.get('eventType', '')
+    resource = payload.get('resource') or {}
+    project_id = ((payload.get('resourceContainers') or {}).get('project') or {}).get('id')
+
+    if event_type == 'build.complete':
+        build = dict(resource)
+        project_id = (resource.get('project') or {}).get('id', project_id)
+        build.setdefault('status', 'completed')
+        return project_id, build
+
+    if event_type == 'ms.vss-pipelines.run-state-changed-event':
+        run = resource.get('run') or {}
+        pipeline = resource.get('pipeline') or run.get('pipeline') or {}
+        build = {
+            'id': run.get('id', resource.get('runId')),
+            'buildNumber': run.get('name'),
+            'status': RUN_STATES.get((run.get('state') or '').lower(), run.get('state')),
+            'queueTime': run.get('createdDate'),
+            'definition': {'id': pipeline.get('id'), 'name': pipeline.get('name'), 'path': pipeline.get('folder')},
+            'sourceBranch': ((run.get('resources') or {}).get('repositories') or {}).get('self', {}).get('refName'),
+        }
+        if run.get('result'):
+            build['result'] = run['result']
+            build['finishTime'] = run.get('finishedDate')
+        return project_id, build
+
+    return None, None
+
+
+class WebhookReceiver:
+    """
+    Embedded HTTP endpoint for Azure DevOps service hooks. Each build event is
+    passed to `on_build(project_id, build)` as soon as it arrives.
+
+    When `secret` is set, requests must carry it as the basic auth password or
+    in an X-Webhook-Secret header, both of which service hooks can be configured to send.
+    """
+
+    def __init__(self, on_build, host='127.0.0.1', port=8787, secret=None):
+        self.on_build = on_build
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.runner = None
+
+    def authorized(self, request):
+        if not self.secret:
+            return True
+        supplied = request.headers.get('X-Webhook-Secret', '')
+        auth = request.headers.get('Authorization', '')
+        if auth.startswith('Basic '):
+            try:
+                supplied = BasicAuth.decode(auth).password or supplied
+            except ValueError:
+                pass
+        return hmac.compare_digest(supplied, self.secret)
+
+    async def handle(self, request):
+        if not self.authorized(request):
+            return web.Response(status=401)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=400, text='Invalid JSON')
+        project_id, build = build_from_payload(payload)
+        if build and build.get('id') is not None:
+            logger.info(f"Webhook {payload.get('eventType')} for build {build['id']} in project {project_id}")
+            try:
+                self.on_build(project_id, build)
+            except Exception as e:
+                logger.error(f"Failed to apply webhook update: {e}", exc_info=True)
+        return web.Response(status=204)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/{tail:.*}', self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"Webhook receiver listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,366 @@
+# cli.py
+#
+# Non-interactive subcommands for scripts, CI and cron. Every command writes
+# JSON Lines to stdout as results arrive:
+#
+#   azdotui status --project MyProject
+#   azdotui trigger --project MyProject --folder '\services' --branch main
+#   azdotui cancel --project MyProject --state running
+#   azdotui watch --project MyProject --interval 10
+#   azdotui export --since 2024-01-01 --format csv --output builds.csv --checkpoint export.ckpt
+#
+# `azdotui daemon` instead runs the shared polling daemon in the foreground.
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+
+from azdotui.api.azdo import AzureDevOpsClient
+from azdotui.config.logger import logger
+from azdotui.config.settings import DAEMON_SOCKET
+from azdotui.daemon.client import connect_client
+from azdotui.daemon.protocol import resolve_gid
+from azdotui.daemon.server import PollingDaemon
+from azdotui.utils.bulk import run_bounded
+
+BUILD_STATES = {
+    'running': 'inProgress',
+    'queued': 'notStarted',
+    'all': 'inProgress,notStarted',
+}
+
+EXPORT_FIELDS = [
+    'project', 'id', 'pipeline_id', 'pipeline', 'buildNumber', 'status', 'result', 'reason',
+    'branch', 'requestedFor', 'queueTime', 'startTime', 'finishTime',
+]
+
+
+def emit(record):
+    sys.stdout.write(json.dumps(record) + '\n')
+    sys.stdout.flush()
+
+
+def build_record(project, build):
+    return {
+        'project': project['name'],
+        'id': build.get('id'),
+        'pipeline': build.get('definition', {}).get('name'),
+        'buildNumber': build.get('buildNumber'),
+        'status': build.get('status'),
+        'result': build.get('result'),
+        'branch': build.get('sourceBranch'),
+        'queueTime': build.get('queueTime'),
+    }
+
+
+def export_record(project, build):
+    record = build_record(project, build)
+    record.update({
+        'pipeline_id': build.get('definition', {}).get('id'),
+        'reason': build.get('reason'),
+        'requestedFor': (build.get('requestedFor') or {}).get('uniqueName'),
+        'startTime': build.get('startTime'),
+        'finishTime': build.get('finishTime'),
+    })
+    return record
+
+
+def export_writer(stream, fmt, write_header):
+    """Return a function that writes one export record to `stream`."""
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        if write_header:
+            writer.writeheader()
+        return writer.writerow
+    return lambda record: stream.write(json.dumps(record) + '\n')
+
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, checkpoint):
+    # Write then rename, so an interrupted save never leaves a truncated checkpoint
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + '.tmp', path)
+
+
+async def resolve_projects(client, names):
+    """
+    Map project names or ids to project dicts. An empty `names` selects all
+    projects. Returns (projects, failures), where failures counts names that
+    matched no project, or is 1 if the project list couldn't be fetched.
+    """
+    data = await client.get_projects()
+    if 'value' not in data:
+        emit({'error': 'Could not fetch the project list'})
+        return [], 1
+    projects = data['value']
+    if not names:
+        return projects, 0
+    wanted = {name.lower() for name in names}
+    selected = [p for p in projects if p['name'].lower() in wanted or p['id'].lower() in wanted]
+    missing = wanted - {p['name'].lower() for p in selected} - {p['id'].lower() for p in selected}
+    for name in sorted(missing):
+        emit({'error': f"Project '{name}' not found"})
+    return selected, len(missing)
+
+
+def in_folder(pipeline, folder):
+    folder = '\\' + folder.strip('\\/').replace('/', '\\')
+    path = pipeline.get('folder', '\\')
+    return folder == '\\' or path == folder or path.startswith(folder + '\\')
+
+
+async def status(client, args):
+    projects, failures = await resolve_projects(client, args.project)
+
+    async def fetch(project):
+        return project, await client.get_builds(project['id'], status_filter=args.status_filter, top=args.top)
+
+    for next_done in asyncio.as_completed([fetch(project) for project in projects]):
+        project, data = await next_done
+        if 'value' not in data:
+            failures += 1
+            emit({'project': project['name'], 'error': 'Could not fetch builds'})
+            continue
+        for build in data['value']:
+            emit(build_record(project, build))
+    return 1 if failures else 0
+
+
+async def trigger(client, args):
+    projects, failures = await resolve_projects(client, args.project)
+    for project in projects:
+        data = await client.get_pipelines(project['id'])
+        if 'value' not in data:
+            failures += 1
+            emit({'project': project['name'], 'error': 'Could not fetch pipelines'})
+            continue
+        pipelines = data['value']
+        selected = {
+            p['id']: p for p in pipelines
+            if in_folder(p, args.folder) and (not args.pipeline or p['name'] in args.pipeline)
+        }
+        if args.dry_run:
+            for pipeline in selected.values():
+                emit({'project': project['name'], 'pipeline_id': pipeline['id'],
+                      'pipeline': pipeline['name'], 'branch': args.branch, 'dry_run': True})
+            continue
+        async for pipeline_id, run, error in client.trigger_pipelines(project['id'], list(selected), args.branch):
+            record = {'project': project['name'], 'pipeline_id': pipeline_id,
+                      'pipeline': selected[pipeline_id]['name'], 'branch': args.branch, 'ok': error is None}
+            if error:
+                failures += 1
+                record['error'] = str(error)
+            else:
+                record['run_id'] = (run or {}).get('id')
+            emit(record)
+    return 1 if failures else 0
+
+
+async def cancel(client, args):
+    projects, failures = await resolve_projects(client, args.project)
+    for project in projects:
+        data = await client.get_builds(project['id'], status_filter=BUILD_STATES[args.state], top=args.top)
+        if 'value' not in data:
+            failures += 1
+            emit({'project': project['name'], 'error': 'Could not fetch builds'})
+            continue
+        builds = {build['id']: build for build in data['value']}
+        async for build_id, _, error in client.cancel_builds(project['id'], list(builds)):
+            record = build_record(project, builds[build_id])
+            record['ok'] = error is None
+            if error:
+                failures += 1
+                record['error'] = str(error)
+            emit(record)
+    return 1 if failures else 0
+
+
+async def watch(client, args):
+    projects, _ = await resolve_projects(client, args.project)
+    if not projects:
+        return 1
+    seen = {}
+    while True:
+        results = await asyncio.gather(*[
+            client.get_builds(project['id'], top=args.top) for project in projects
+        ])
+        for project, data in zip(projects, results):
+            for build in data.get('value', []):
+                key = (project['id'], build.get('id'))
+                state = (build.get('status'), build.get('result'))
+                if seen.get(key) != state:
+                    seen[key] = state
+                    emit(build_record(project, build))
+        await asyncio.sleep(args.interval)
+
+
+async def export(client, args):
+    """
+    Stream every build matching the filters to NDJSON or CSV one page at a
+    time, so memory stays flat however many builds there are. With
+    --checkpoint, each project's continuation token is saved after every
+    page and a rerun carries on from there (a page written just before an
+    interruption may be written twice).
+    """
+    query = {
+        'minTime': args.since,
+        'maxTime': args.until,
+        'branchName': args.branch,
+        'statusFilter': args.status_filter,
+        'resultFilter': args.result_filter,
+        'definitions': ','.join(map(str, args.pipeline_id)) if args.pipeline_id else None,
+        'queryOrder': 'queueTimeDescending',
+    }
+    checkpoint = load_checkpoint(args.checkpoint) if args.checkpoint else None
+    if checkpoint and (checkpoint.get('query') != query or checkpoint.get('format') != args.format):
+        emit({'error': f"Checkpoint {args.checkpoint} is for a different export; remove it to start over"})
+        return 1
+    resuming = checkpoint is not None
+    checkpoint = checkpoint or {'query': query, 'format': args.format, 'projects': {}}
+
+    projects, failures = await resolve_projects(client, args.project)
+    if not projects and failures:
+        return 1
+    to_file = args.output != '-'
+    stream = open(args.output, 'a' if resuming else 'w', newline='') if to_file else sys.stdout
+    write = export_writer(stream, args.format, write_header=stream.tell() == 0 if to_file else not resuming)
+
+    async def export_project(project):
+        state = checkpoint['projects'].setdefault(project['id'], {'token': None, 'done': False, 'exported': 0})
+        if state['done']:
+            return state['exported']
+        async for builds, token in client.iter_builds(project['id'], state['token'], **query):
+            for build in builds:
+                write(export_record(project, build))
+            # Records must reach the output before the checkpoint moves past them
+            stream.flush()
+            state.update(token=token, done=token is None, exported=state['exported'] + len(builds))
+            if args.checkpoint:
+                save_checkpoint(args.checkpoint, checkpoint)
+        return state['exported']
+
+    try:
+        async for project, exported, error in run_bounded(projects, export_project, args.concurrency):
+            if error:
+                failures += 1
+                logger.error(f"Export of project {project['name']} failed: {error}")
+            if to_file:
+                record = {'project': project['name'], 'exported': checkpoint['projects'][project['id']]['exported'],
+                          'ok': error is None}
+                if error:
+                    record['error'] = str(error)
+                emit(record)
+    finally:
+        if to_file:
+            stream.close()
+    return 1 if failures else 0
+
+
+async def daemon(client, args):
+    if not args.socket:
+        emit({'error': 'No socket path; set AZDOTUI_DAEMON_SOCKET or pass --socket'})
+        return 1
+    allow_group = None
+    if args.allow_group:
+        try:
+            allow_group = resolve_gid(args.allow_group)
+        except KeyError:
+            emit({'error': f"Unknown group '{args.allow_group}'"})
+            return 1
+    await PollingDaemon(client, args.socket, args.interval, args.idle_timeout, allow_group).serve()
+    return 0
+
+
+COMMANDS = {
+    'status': status,
+    'trigger': trigger,
+    'cancel': cancel,
+    'watch': watch,
+    'export': export,
+    'daemon': daemon,
+}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='azdotui', description='Azure DevOps TUI. Run without arguments for the interactive UI.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    status_parser = subparsers.add_parser('status', help='List recent builds')
+    status_parser.add_argument('--project', action='append', help='Project name or id (repeatable, default: all)')
+    status_parser.add_argument('--status-filter', help="API statusFilter, e.g. 'inProgress,notStarted'")
+    status_parser.add_argument('--top', type=int, default=50)
+
+    trigger_parser = subparsers.add_parser('trigger', help='Trigger every pipeline under a folder')
+    trigger_parser.add_argument('--project', action='append', required=True)
+    trigger_parser.add_argument('--folder', default='\\', help="Pipeline folder, e.g. '\\\\services\\\\api'")
+    trigger_parser.add_argument('--pipeline', action='append', help='Restrict to these pipeline names')
+    trigger_parser.add_argument('--branch', required=True)
+    trigger_parser.add_argument('--dry-run', action='store_true', help='List the pipelines without triggering them')
+
+    cancel_parser = subparsers.add_parser('cancel', help='Cancel running and/or queued builds')
+    cancel_parser.add_argument('--project', action='append', required=True)
+    cancel_parser.add_argument('--state', choices=sorted(BUILD_STATES), default='all')
+    cancel_parser.add_argument('--top', type=int, default=1000)
+
+    watch_parser = subparsers.add_parser('watch', help='Stream build state changes')
+    watch_parser.add_argument('--project', action='append')
+    watch_parser.add_argument('--interval', type=float, default=10)
+    watch_parser.add_argument('--top', type=int, default=50)
+
+    export_parser = subparsers.add_parser('export', help='Stream build history to NDJSON or CSV')
+    export_parser.add_argument('--project', action='append', help='Project name or id (repeatable, default: all)')
+    export_parser.add_argument('--since', help='Only builds queued at or after this ISO 8601 time')
+    export_parser.add_argument('--until', help='Only builds queued before this ISO 8601 time')
+    export_parser.add_argument('--branch', help="Branch, e.g. 'refs/heads/main'")
+    export_parser.add_argument('--pipeline-id', type=int, action='append', help='Restrict to these pipeline ids')
+    export_parser.add_argument('--status-filter', help="API statusFilter, e.g. 'completed'")
+    export_parser.add_argument('--result-filter', help="API resultFilter, e.g. 'failed,canceled'")
+    export_parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    export_parser.add_argument('--output', default='-', help="File to write (default '-' for stdout)")
+    export_parser.add_argument('--checkpoint', help='Save progress here and resume from it when rerun')
+    export_parser.add_argument('--concurrency', type=int, default=4, help='Projects exported at once')
+
+    daemon_parser = subparsers.add_parser('daemon', help='Run the shared polling daemon for other azdotui processes')
+    daemon_parser.add_argument('--socket', default=DAEMON_SOCKET)
+    daemon_parser.add_argument('--interval', type=float, default=5, help='Seconds between build polls')
+    daemon_parser.add_argument('--idle-timeout', type=float, default=300,
+                               help='Stop polling results nobody has requested for this many seconds')
+    daemon_parser.add_argument('--allow-group', metavar='GROUP',
+                               help="Also serve members of this group (socket mode 0660); they read with the daemon's PAT")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    # The daemon itself must poll Azure DevOps, not another daemon
+    client = AzureDevOpsClient() if args.command == 'daemon' else await connect_client()
+    try:
+        return await COMMANDS[args.command](client, args)
+    finally:
+        await client.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        sys.stdout = open(os.devnull, 'w')
+        return 0
+    except Exception as e:
+        logger.error(f"Command '{args.command}' failed: {e}", exc_info=True)
+        emit({'error': str(e)})
+        return 1
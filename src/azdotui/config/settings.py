@@ -1,7 +1,77 @@
 # config/settings.py
 
 import os
+import re
+import tempfile
 
 AZDO_ORGANIZATION = os.getenv('AZDO_ORGANIZATION', 'your_organization')
 AZDO_PAT = os.getenv('AZDO_PAT', 'your_personal_access_token')
+# Override to point the client at a proxy or the local mock server (azdotui.devtools.mock_server)
+AZDO_BASE_URL = os.getenv('AZDO_BASE_URL', f'https://dev.azure.com/{AZDO_ORGANIZATION}').rstrip('/')
+# Show several organizations at once, e.g. "contoso,fabrikam" (just AZDO_ORGANIZATION when unset).
+# Each may set AZDO_PAT_<NAME> and AZDO_BASE_URL_<NAME>, with NAME upper-cased and other characters as _
+AZDO_ORGANIZATIONS = [org.strip() for org in os.getenv('AZDO_ORGANIZATIONS', AZDO_ORGANIZATION).split(',') if org.strip()]
+# Connections each organization's client may keep open at once. Its requests all go to one host, so this is also
+# the per-host limit. One Builds refresh sends a request per category, plus pipelines, history and prefetches
+ORG_CONNECTION_LIMIT = int(os.getenv('AZDOTUI_ORG_CONNECTION_LIMIT', '16'))
+# Seconds idle connections stay pooled; longer than the slowest polling interval, so polls reuse them
+KEEPALIVE_TIMEOUT = float(os.getenv('AZDOTUI_KEEPALIVE_TIMEOUT', '75'))
+# Seconds resolved host addresses are reused
+DNS_CACHE_TTL = int(os.getenv('AZDOTUI_DNS_CACHE_TTL', '300'))
+# Seconds to establish a connection, and to wait for each read of a response
+CONNECT_TIMEOUT = float(os.getenv('AZDOTUI_CONNECT_TIMEOUT', '10'))
+READ_TIMEOUT = float(os.getenv('AZDOTUI_READ_TIMEOUT', '30'))
+# Connections opened at startup, while the UI initialises; 0 disables pre-warming
+WARM_CONNECTIONS = int(os.getenv('AZDOTUI_WARM_CONNECTIONS', '6'))
 
+
+def organization_settings(org):
+    """(base URL, PAT) for one of AZDO_ORGANIZATIONS."""
+    suffix = re.sub(r'[^A-Z0-9]', '_', org.upper())
+    default_url = AZDO_BASE_URL if org == AZDO_ORGANIZATION else f'https://dev.azure.com/{org}'
+    return (os.getenv(f'AZDO_BASE_URL_{suffix}', default_url).rstrip('/'),
+            os.getenv(f'AZDO_PAT_{suffix}', AZDO_PAT))
+
+
+# Append a JSON snapshot of collected metrics to this file on exit (disabled when unset)
+METRICS_FILE = os.getenv('AZDOTUI_METRICS_FILE')
+
+# Maximum concurrent requests for bulk operations (trigger, cancel)
+BULK_CONCURRENCY = int(os.getenv('AZDOTUI_BULK_CONCURRENCY', '8'))
+# Times a request answered with 429 Too Many Requests is retried after its Retry-After delay
+MAX_RETRIES = int(os.getenv('AZDOTUI_MAX_RETRIES', '3'))
+# Lines of build log kept in memory by the log viewer; older lines are dropped
+LOG_BUFFER_LINES = int(os.getenv('AZDOTUI_LOG_BUFFER_LINES', '10000'))
+# Port for the embedded service-hook receiver (disabled when unset)
+WEBHOOK_PORT = os.getenv('AZDOTUI_WEBHOOK_PORT')
+WEBHOOK_HOST = os.getenv('AZDOTUI_WEBHOOK_HOST', '127.0.0.1')
+WEBHOOK_SECRET = os.getenv('AZDOTUI_WEBHOOK_SECRET')
+# Builds polling interval in seconds while the receiver is pushing updates
+WEBHOOK_POLL_INTERVAL = int(os.getenv('AZDOTUI_WEBHOOK_POLL_INTERVAL', '60'))
+# Unix socket of the shared polling daemon (`azdotui daemon`); set to empty to always talk to Azure DevOps directly.
+# Defaults to a per-user path: in $XDG_RUNTIME_DIR when set, otherwise in the temp dir with the uid in the name.
+RUNTIME_DIR = os.getenv('XDG_RUNTIME_DIR')
+DAEMON_SOCKET = os.getenv('AZDOTUI_DAEMON_SOCKET', os.path.join(RUNTIME_DIR, 'azdotui.sock') if RUNTIME_DIR
+                          else os.path.join(tempfile.gettempdir(), f'azdotui-{os.getuid()}.sock'))
+# User (name or uid) whose shared daemon may be trusted besides your own, e.g. a service account started with --allow-group
+DAEMON_OWNER = os.getenv('AZDOTUI_DAEMON_OWNER')
+# Seconds the cursor must rest on a project or pipeline before its data is prefetched
+PREFETCH_DELAY = float(os.getenv('AZDOTUI_PREFETCH_DELAY', '0.4'))
+# Most prefetches started per minute; 0 disables prefetching
+PREFETCH_BUDGET = int(os.getenv('AZDOTUI_PREFETCH_BUDGET', '30'))
+# Seconds a prefetched result may be served in place of a fresh request
+PREFETCH_TTL = int(os.getenv('AZDOTUI_PREFETCH_TTL', '10'))
+# Worker threads for CPU-heavy data preparation kept off the UI loop
+OFFLOAD_WORKERS = int(os.getenv('AZDOTUI_OFFLOAD_WORKERS', '2'))
+# Pipeline count at which tree building moves to a worker thread
+OFFLOAD_MIN_PIPELINES = int(os.getenv('AZDOTUI_OFFLOAD_MIN_PIPELINES', '1000'))
+# Only show builds of this branch in the Builds pane, e.g. refs/heads/main (all branches when unset)
+BUILDS_BRANCH = os.getenv('AZDOTUI_BUILDS_BRANCH')
+# Completed runs per pipeline kept for duration and failure-rate statistics
+HISTORY_RUNS = int(os.getenv('AZDOTUI_HISTORY_RUNS', '200'))
+# Seconds between agent pool queue depth polls while the Agent Pools view is open
+AGENT_POOLS_INTERVAL = int(os.getenv('AZDOTUI_AGENT_POOLS_INTERVAL', '15'))
+# Seconds between fetches of each pool's agents; online and busy counts change less often than queues
+AGENT_POOLS_AGENTS_INTERVAL = int(os.getenv('AZDOTUI_AGENT_POOLS_AGENTS_INTERVAL', '60'))
+# Seconds between refreshes of the pending approvals, in the Approvals view and for the Builds pane's marks
+APPROVALS_INTERVAL = int(os.getenv('AZDOTUI_APPROVALS_INTERVAL', '15'))
@@ -0,0 +1,161 @@
+# daemon/client.py
+
+import asyncio
+import functools
+import itertools
+import time
+
+from azdotui.api.azdo import AzureDevOpsClient
+from azdotui.config.logger import logger
+from azdotui.config.settings import AZDO_ORGANIZATIONS, DAEMON_OWNER, DAEMON_SOCKET, organization_settings
+from azdotui.daemon.protocol import READ_METHODS, STREAM_LIMIT, decode, encode, resolve_uid, trusted_peer
+
+RECONNECT_INTERVAL = 30  # Seconds between attempts to reach a daemon that went away
+REQUEST_TIMEOUT = 60
+
+
+class DaemonClient:
+    """
+    Drop-in replacement for AzureDevOpsClient that serves reads from the
+    shared polling daemon and sends everything else through `direct`. If the
+    daemon goes away, reads fall back to `direct` until it can be reached again.
+    Only a daemon run by this user, or by uid `owner`, is used.
+    """
+
+    def __init__(self, socket_path, direct, owner=None):
+        self.socket_path = socket_path
+        self.direct = direct
+        self.owner = owner
+        self.reader = None
+        self.writer = None
+        self.reader_task = None
+        self.pending = {}
+        self.ids = itertools.count(1)
+        self.last_connect_attempt = 0.0
+
+    @classmethod
+    async def connect(cls, socket_path, direct, owner=None):
+        client = cls(socket_path, direct, owner)
+        return client if await client.open() else None
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def open(self):
+        self.last_connect_attempt = time.monotonic()
+        try:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+        except OSError:
+            return False
+        if not trusted_peer(self.writer.get_extra_info('socket'), owner=self.owner):
+            logger.warning(f"Ignoring {self.socket_path}: it is served by another user")
+            self.writer.close()
+            self.writer = None
+            return False
+        self.reader_task = asyncio.create_task(self.read_loop())
+        logger.info(f"Connected to polling daemon at {self.socket_path}")
+        return True
+
+    async def read_loop(self):
+        try:
+            while line := await self.reader.readline():
+                message = decode(line)
+                future = self.pending.pop(message.get('id'), None)
+                if future and not future.done():
+                    if 'error' in message:
+                        future.set_exception(RuntimeError(message['error']))
+                    else:
+                        future.set_result(message.get('result'))
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Lost connection to polling daemon: {e}")
+        finally:
+            self.writer.close()
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Polling daemon disconnected'))
+            self.pending.clear()
+
+    async def send(self, method, args, kwargs):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(encode({'id': request_id, 'method': method, 'args': list(args), 'kwargs': kwargs}))
+        await self.writer.drain()
+        return request_id, future
+
+    async def call(self, method, *args, **kwargs):
+        if not self.connected and time.monotonic() - self.last_connect_attempt > RECONNECT_INTERVAL:
+            await self.open()
+        if self.connected:
+            try:
+                request_id, future = await self.send(method, args, kwargs)
+                try:
+                    return await asyncio.wait_for(future, REQUEST_TIMEOUT)
+                finally:
+                    self.pending.pop(request_id, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Daemon call {method} failed, falling back to direct mode: {e}")
+        return await getattr(self.direct, method)(*args, **kwargs)
+
+    async def prefetch(self, method, *args, **kwargs):
+        # Warm the daemon's shared cache; without a daemon, warm the direct client
+        if self.connected:
+            await self.call(method, *args, **kwargs)
+        else:
+            await self.direct.prefetch(method, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name == 'direct':
+            raise AttributeError(name)  # Not initialised yet
+        if name in READ_METHODS:
+            return functools.partial(self.call, name)
+        return getattr(self.direct, name)
+
+    async def close(self):
+        if self.reader_task:
+            self.reader_task.cancel()
+            await asyncio.gather(self.reader_task, return_exceptions=True)
+        await self.direct.close()
+
+
+async def connect_client(organization=None):
+    """
+    Return a DaemonClient when a polling daemon is listening on
+    DAEMON_SOCKET, otherwise a plain AzureDevOpsClient.
+    """
+    if organization:
+        base_url, pat = organization_settings(organization)
+        direct = AzureDevOpsClient(base_url, pat, organization=organization)
+    else:
+        direct = AzureDevOpsClient()
+    if DAEMON_SOCKET:
+        try:
+            owner = resolve_uid(DAEMON_OWNER) if DAEMON_OWNER else None
+        except KeyError:
+            logger.warning(f"Unknown AZDOTUI_DAEMON_OWNER '{DAEMON_OWNER}'; only your own daemon is used")
+            owner = None
+        shared = await DaemonClient.connect(DAEMON_SOCKET, direct, owner)
+        if shared:
+            return shared
+    direct.start_warm_up()  # Reads go to Azure DevOps; open connections while the caller gets ready
+    return direct
+
+
+async def connect_clients():
+    """
+    Return {organization: client} for every organization in
+    AZDO_ORGANIZATIONS, in configured order. A polling daemon serves a single
+    organization, so it is only used when one organization is configured.
+    """
+    if len(AZDO_ORGANIZATIONS) <= 1:
+        client = await connect_client(next(iter(AZDO_ORGANIZATIONS), None))
+        return {client.organization: client}
+    clients = {}
+    for org in AZDO_ORGANIZATIONS:
+        base_url, pat = organization_settings(org)
+        clients[org] = AzureDevOpsClient(base_url, pat, organization=org)
+        clients[org].start_warm_up()
+    return clients
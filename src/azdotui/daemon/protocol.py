@@ -0,0 +1,91 @@
+# daemon/protocol.py
+#
+# Newline-delimited JSON over a Unix domain socket.
+#
+#   request:  {"id": 1, "method": "get_all_builds", "args": ["<project id>"], "kwargs": {}}
+#   response: {"id": 1, "result": {...}}  or  {"id": 1, "error": "..."}
+
+import grp
+import json
+import os
+import pwd
+import socket
+import struct
+
+# Client calls the daemon serves from its shared cache. Everything else
+# (triggers, cancels, log streaming) goes straight to Azure DevOps with the
+# user's own credentials.
+READ_METHODS = frozenset({
+    'get_projects',
+    'get_pipelines',
+    'get_all_builds',
+    'get_build_status',
+    'get_builds',
+    'get_build',
+    'get_build_timeline',
+    'get_build_logs',
+    'get_pipeline_runs',
+    'get_agent_pools',
+    'get_pool_agents',
+    'get_pool_job_requests',
+    'get_approvals',
+})
+
+# Largest single message; project and pipeline lists can be several MB
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+def encode(message):
+    return (json.dumps(message) + '\n').encode()
+
+
+def decode(line):
+    return json.loads(line)
+
+
+def cache_key(method, args, kwargs):
+    return json.dumps([method, list(args), kwargs], sort_keys=True)
+
+
+def peer_credentials(sock):
+    """
+    (uid, gid) of the process at the other end of a connected Unix socket, or
+    None where SO_PEERCRED isn't available and only the socket's file mode
+    protects it.
+    """
+    if sock is None or not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    _, uid, gid = struct.unpack('3i', sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i')))
+    return uid, gid
+
+
+def resolve_uid(user):
+    """Uid for a user name or numeric uid. Raises KeyError for unknown users."""
+    return int(user) if str(user).isdigit() else pwd.getpwnam(user).pw_uid
+
+
+def resolve_gid(group):
+    """Gid for a group name or numeric gid. Raises KeyError for unknown groups."""
+    return int(group) if str(group).isdigit() else grp.getgrnam(group).gr_gid
+
+
+def in_group(uid, gid, group):
+    # SO_PEERCRED only reports the primary group, so supplementary members are looked up
+    if gid == group:
+        return True
+    try:
+        return pwd.getpwuid(uid).pw_name in grp.getgrgid(group).gr_mem
+    except KeyError:
+        return False
+
+
+def trusted_peer(sock, owner=None, group=None):
+    """
+    True if the peer on `sock` runs as the same user as this process, as
+    uid `owner`, or as a member of gid `group`.
+    """
+    credentials = peer_credentials(sock)
+    if credentials is None:
+        return True
+    uid, gid = credentials
+    return uid in (os.getuid(), owner) or (group is not None and in_group(uid, gid, group))
@@ -0,0 +1,180 @@
+# daemon/server.py
+
+import asyncio
+import os
+import time
+
+from azdotui.config.logger import logger
+from azdotui.daemon.protocol import READ_METHODS, STREAM_LIMIT, cache_key, decode, encode, trusted_peer
+
+# Methods whose results change often enough to be re-polled in the background
+POLLED_METHODS = frozenset({'get_all_builds', 'get_build_status', 'get_builds', 'get_build', 'get_build_timeline',
+                            'get_build_logs', 'get_pipeline_runs', 'get_pool_agents', 'get_pool_job_requests',
+                            'get_approvals'})
+# Everything else (project, pipeline and pool lists) is re-fetched on request once
+# it is this old, matching the direct client's caches
+LIST_TTL = 600
+# Only the daemon's own user may connect; the peer uid is checked as well where the platform allows
+SOCKET_MODE = 0o600
+# With --allow-group, members of that group may connect too
+SHARED_SOCKET_MODE = 0o660
+
+
+class CacheEntry:
+    __slots__ = ('method', 'args', 'kwargs', 'data', 'fetched_at', 'last_requested', 'pending')
+
+    def __init__(self, method, args, kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.data = None
+        self.fetched_at = 0.0
+        self.last_requested = time.monotonic()
+        self.pending = None
+
+
+class PollingDaemon:
+    """
+    Owns one AzureDevOpsClient and shares its results between every azdotui
+    process of the same user connected to `socket_path`, and of members of
+    gid `allow_group` when given. Identical requests from different sessions
+    hit Azure DevOps once per `poll_interval`; results nobody has asked for
+    within `idle_timeout` seconds are dropped, so load and memory follow the
+    number of distinct things being watched.
+    """
+
+    def __init__(self, client, socket_path, poll_interval=5, idle_timeout=300, allow_group=None):
+        self.client = client
+        self.socket_path = socket_path
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.allow_group = allow_group
+        self.entries = {}
+        self.connections = 0
+
+    async def fetch(self, entry):
+        # Concurrent requests for the same key share one upstream call
+        if entry.pending is None:
+            entry.pending = asyncio.ensure_future(getattr(self.client, entry.method)(*entry.args, **entry.kwargs))
+        pending = entry.pending
+        try:
+            data = await asyncio.shield(pending)
+        finally:
+            if entry.pending is pending and pending.done():
+                entry.pending = None
+        entry.data = data
+        entry.fetched_at = time.monotonic()
+
+    async def get(self, method, args, kwargs):
+        key = cache_key(method, args, kwargs)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = CacheEntry(method, args, kwargs)
+        entry.last_requested = time.monotonic()
+        # Empty results are failed fetches, so retry them instead of serving them
+        if not entry.data or time.monotonic() - entry.fetched_at >= self.ttl(method):
+            await self.fetch(entry)
+        return entry
+
+    def ttl(self, method):
+        return self.poll_interval if method in POLLED_METHODS else LIST_TTL
+
+    async def poll_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            now = time.monotonic()
+            for key, entry in list(self.entries.items()):
+                if now - entry.last_requested > self.idle_timeout:
+                    del self.entries[key]
+            due = [
+                entry for entry in self.entries.values()
+                if entry.method in POLLED_METHODS and now - entry.fetched_at >= self.poll_interval
+            ]
+            results = await asyncio.gather(*[self.fetch(entry) for entry in due], return_exceptions=True)
+            for entry, error in zip(due, results):
+                if isinstance(error, Exception):
+                    logger.error(f"Daemon poll of {entry.method}{entry.args} failed: {error}")
+
+    async def handle_request(self, request, send):
+        request_id = request.get('id')
+        method = request.get('method')
+        args = request.get('args', [])
+        kwargs = request.get('kwargs', {})
+        try:
+            if method not in READ_METHODS:
+                raise ValueError(f"Unsupported method '{method}'")
+            entry = await self.get(method, args, kwargs)
+            send({'id': request_id, 'result': entry.data})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Daemon request {method} failed: {e}", exc_info=True)
+            send({'id': request_id, 'error': str(e)})
+
+    async def handle_connection(self, reader, writer):
+        if not trusted_peer(writer.get_extra_info('socket'), group=self.allow_group):
+            logger.warning("Daemon refused a connection from another user")
+            writer.close()
+            return
+        self.connections += 1
+        tasks = set()
+
+        def send(message):
+            if not writer.is_closing():
+                writer.write(encode(message))
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self.handle_request(decode(line), send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.info(f"Daemon connection closed: {e}")
+        finally:
+            self.connections -= 1
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def remove_stale_socket(self):
+        """
+        Remove a socket left behind by a previous run. Raises RuntimeError if
+        a daemon still answers on it.
+        """
+        try:
+            _, writer = await asyncio.open_unix_connection(self.socket_path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            os.unlink(self.socket_path)
+            return
+        writer.close()
+        raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+
+    async def serve(self):
+        await self.remove_stale_socket()
+        mode = SOCKET_MODE if self.allow_group is None else SHARED_SOCKET_MODE
+        # Create the socket without group or world access rather than narrowing it afterwards
+        umask = os.umask(0o777 & ~SOCKET_MODE)
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path, limit=STREAM_LIMIT)
+        finally:
+            os.umask(umask)
+        try:
+            if self.allow_group is not None:
+                os.chown(self.socket_path, -1, self.allow_group)
+            os.chmod(self.socket_path, mode)
+        except OSError:
+            server.close()
+            os.unlink(self.socket_path)
+            raise
+        logger.info(f"Polling daemon listening on {self.socket_path}")
+        poll_task = asyncio.create_task(self.poll_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poll_task.cancel()
+            await asyncio.gather(poll_task, return_exceptions=True)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
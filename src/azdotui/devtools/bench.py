@@ -0,0 +1,190 @@
+# devtools/bench.py
+#
+# Benchmarks for the tree, formatting and render hot paths.
+#
+#   python -m azdotui.devtools.bench --output bench.json
+#   python -m azdotui.devtools.bench --compare bench.json --max-regression 0.25
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Log to a temp dir rather than the working tree. config/logger.py reads LOG_FILE when first imported, so this
+# must come before any azdotui import.
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.mkdtemp(prefix='azdotui-bench-'), 'app.log'))
+
+from azdotui.devtools.headless import headless_curses  # noqa: E402
+from azdotui.devtools.synthetic import make_builds, make_pipelines, make_project  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+
+def measure(fn, min_time=0.2, max_rounds=200):
+    """
+    Call `fn` repeatedly until `min_time` seconds have elapsed (at least
+    three rounds) and return per-call timings in seconds.
+    """
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < 3 or (time.perf_counter() < deadline and len(timings) < max_rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def expand_all(node):
+    node.expanded = True
+    for child in node.children:
+        if child.is_folder:
+            expand_all(child)
+
+
+def make_dataset(size, seed=0):
+    rng = random.Random(seed)
+    project = make_project(rng, 0)
+    pipelines = make_pipelines(rng, size, folder_depth=4, folder_fanout=6)
+    builds = make_builds(rng, size, pipelines, project)
+    projects = [make_project(rng, index) for index in range(size)]
+    return projects, pipelines, builds
+
+
+def run_cases(layout, size, min_time):
+    from azdotui.ui.panes.builds_pane import BUILDS_PER_CATEGORY, category_queries
+    from azdotui.utils.tree import build_tree
+
+    projects, pipelines, builds = make_dataset(size)
+    projects_pane = layout.panes['projects']
+    pipelines_pane = layout.panes['pipelines']
+    builds_pane = layout.panes['builds']
+
+    tree = build_tree(pipelines)
+    expand_all(tree)
+    pipelines_pane.tree_root = tree
+    pipelines_pane.items = pipelines_pane.flatten_tree(tree)
+    pipelines_pane.selected_pipelines = {p['id'] for p in pipelines[::2]}
+    projects_pane.items = projects_pane.projects = projects
+    builds_pane.items = builds
+    # What the per-category queries return: each category's first builds
+    builds_pane.builds_by_category = {
+        category: [build for build in builds if builds_pane.category_for(build) == category][:BUILDS_PER_CATEGORY]
+        for category, _ in category_queries(projects[0]['id'])
+    }
+
+    def render(pane):
+        def fn():
+            pane.needs_render = True
+            pane.render()
+        return fn
+
+    cases = {
+        'build_tree': lambda: build_tree(pipelines),
+        'flatten_tree': lambda: pipelines_pane.flatten_tree(tree),
+        'are_all_pipelines_selected': lambda: pipelines_pane.are_all_pipelines_selected(tree),
+        'format_item': lambda: [builds_pane.format_item(build) for build in builds],
+        'render.projects': render(projects_pane),
+        'render.pipelines': render(pipelines_pane),
+        'render.builds': render(builds_pane),
+    }
+    results = []
+    for name, fn in cases.items():
+        timings = measure(fn, min_time=min_time)
+        results.append({
+            'name': name,
+            'size': size,
+            'rounds': len(timings),
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.fmean(timings),
+        })
+    return results
+
+
+async def run(sizes, min_time, lines, cols):
+    from azdotui.ui.layout import Layout
+
+    with headless_curses(lines, cols) as screen:
+        layout = Layout(screen, azdo_client=None)
+        for task in layout.auto_refresh_tasks:
+            task.cancel()
+        await asyncio.gather(*layout.auto_refresh_tasks, return_exceptions=True)
+        results = []
+        for size in sizes:
+            results.extend(run_cases(layout, size, min_time))
+        return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """
+    Print the change in median time against `baseline` and return the
+    cases that slowed down by more than `max_regression` (a fraction).
+    """
+    previous = {(r['name'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['name'], result['size']))
+        if not before or not before['median']:
+            continue
+        change = result['median'] / before['median'] - 1
+        print(f"{result['name']:<28} {result['size']:>7} {before['median'] * 1000:>10.3f}ms "
+              f"-> {result['median'] * 1000:>10.3f}ms {change:+8.1%}")
+        if change > max_regression:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark azdotui hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds to spend on each case')
+    parser.add_argument('--lines', type=int, default=50, help='Virtual screen height')
+    parser.add_argument('--cols', type=int, default=200, help='Virtual screen width')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a previous --output file')
+    parser.add_argument('--max-regression', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.sizes, args.min_time, args.lines, args.cols))
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.max_regression:.0%}")
+            return 1
+    else:
+        for result in results:
+            print(f"{result['name']:<28} {result['size']:>7} {result['median'] * 1000:>10.3f}ms "
+                  f"({result['rounds']} rounds)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# devtools/headless.py
+#
+# In-memory stand-ins for curses windows and panels so panes and the layout
+# can be driven without a terminal (benchmarks, soak runs).
+
+import curses
+import curses.panel
+from collections import deque
+from contextlib import contextmanager
+
+
+class VirtualWindow:
+    def __init__(self, height, width, y=0, x=0):
+        self.height = height
+        self.width = width
+        self.y = y
+        self.x = x
+        self.keys = deque()
+        self.writes = 0
+        self.erase()
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def erase(self):
+        self.rows = [[' '] * self.width for _ in range(self.height)]
+
+    clear = erase
+
+    def border(self, *args):
+        self.rows[0] = ['-'] * self.width
+        self.rows[-1] = ['-'] * self.width
+        for row in self.rows:
+            row[0] = row[-1] = '|'
+
+    def addnstr(self, y, x, text, n, attr=0):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error('addnstr() returned ERR')
+        text = str(text)[:max(0, n)][:self.width - x]
+        self.rows[y][x:x + len(text)] = list(text)
+        self.writes += 1
+
+    def addstr(self, y, x, text, attr=0):
+        self.addnstr(y, x, text, len(str(text)), attr)
+
+    def text(self):
+        return '\n'.join(''.join(row) for row in self.rows)
+
+    def subwin(self, height, width, y, x):
+        return VirtualWindow(height, width, y, x)
+
+    def feed(self, keys):
+        self.keys.extend(keys)
+
+    def getch(self):
+        return self.keys.popleft() if self.keys else -1
+
+    def refresh(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def nodelay(self, flag):
+        pass
+
+    def timeout(self, delay):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+
+class VirtualPanel:
+    def __init__(self, window):
+        self.window = window
+        self.visible = True
+
+    def top(self):
+        pass
+
+    def show(self):
+        self.visible = True
+
+    def hide(self):
+        self.visible = False
+
+    def hidden(self):
+        return not self.visible
+
+
+@contextmanager
+def headless_curses(lines=50, cols=200):
+    """
+    Patch the curses entry points used by the UI so that windows are
+    VirtualWindow instances. Yields the virtual root screen.
+    """
+    patches = {
+        (curses, 'newwin'): lambda height, width, y=0, x=0: VirtualWindow(height, width, y, x),
+        (curses, 'curs_set'): lambda visibility: None,
+        (curses, 'doupdate'): lambda: None,
+        (curses, 'LINES'): lines,
+        (curses, 'COLS'): cols,
+        (curses.panel, 'new_panel'): VirtualPanel,
+        (curses.panel, 'update_panels'): lambda: None,
+    }
+    missing = object()
+    saved = {key: getattr(key[0], key[1], missing) for key in patches}
+    for (module, name), value in patches.items():
+        setattr(module, name, value)
+    try:
+        yield VirtualWindow(lines, cols)
+    finally:
+        for (module, name), value in saved.items():
+            if value is missing:
+                delattr(module, name)
+            else:
+                setattr(module, name, value)
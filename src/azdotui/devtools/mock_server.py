@@ -0,0 +1,425 @@
+# devtools/mock_server.py
+#
+# Local stand-in for the Azure DevOps REST API. Serves synthetic data, or
+# records/replays real sessions, so client and pane changes can be measured
+# without network access:
+#
+#   python -m azdotui.devtools.mock_server --projects 10 --pipelines 500 --latency 80
+#   AZDO_BASE_URL=http://127.0.0.1:8081/mock azdotui
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import defaultdict
+
+import aiohttp
+from aiohttp import web
+from azdotui.devtools.synthetic import SyntheticOrg
+
+CASSETTE_HEADERS = ('Content-Type', 'x-ms-continuationtoken', 'ETag', 'Retry-After')
+LOG_STEPS = ['Checkout', 'Build', 'Test']
+LOG_LINES_PER_STEP = 300
+
+
+def _split(value):
+    return [part.strip().lower() for part in value.split(',') if part.strip()] if value else []
+
+
+def filter_builds(builds, query):
+    """
+    Apply the subset of build list query parameters the client uses. Like
+    the service, minTime and maxTime bound the time field `queryOrder` sorts by.
+    """
+    definitions = {int(d) for d in _split(query.get('definitions'))}
+    statuses = set(_split(query.get('statusFilter'))) - {'all'}
+    results = set(_split(query.get('resultFilter')))
+    branch = query.get('branchName')
+    order = query.get('queryOrder', 'queueTimeDescending')
+    time_field = next((field for field in ('finishTime', 'startTime') if order.startswith(field)), 'queueTime')
+    min_time = query.get('minTime')
+    max_time = query.get('maxTime')
+    selected = [
+        build for build in builds
+        if (not definitions or build['definition']['id'] in definitions)
+        and (not statuses or build['status'].lower() in statuses)
+        and (not results or build.get('result', '').lower() in results)
+        and (not branch or build.get('sourceBranch') == branch)
+        and (not min_time or build.get(time_field, '') >= min_time)
+        and (not max_time or '' < build.get(time_field, '') < max_time)
+    ]
+    if time_field != 'queueTime':
+        selected.sort(key=lambda build: build.get(time_field, ''), reverse=order.endswith('Descending'))
+    elif order == 'queueTimeAscending':
+        selected.sort(key=lambda build: build['queueTime'])
+    return selected
+
+
+def build_to_run(build):
+    state = {'notStarted': 'unknown', 'cancelling': 'canceling'}.get(build['status'], build['status'])
+    run = {
+        'id': build['id'],
+        'name': build['buildNumber'],
+        'state': state,
+        'createdDate': build['queueTime'],
+        'pipeline': {'id': build['definition']['id'], 'name': build['definition']['name'],
+                     'folder': build['definition']['path']},
+    }
+    if 'result' in build:
+        run['result'] = build['result']
+        run['finishedDate'] = build['finishTime']
+    return run
+
+
+class MockAzureDevOps:
+    def __init__(self, org=None, latency=0, jitter=0, throttle_rate=0.0, retry_after=1,
+                 page_size=100, churn_interval=0, seed=0):
+        self.org = org or SyntheticOrg(seed=seed)
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.churn_interval = churn_interval
+        self.rng = random.Random(seed)
+        self.request_counts = defaultdict(int)
+        self.log_progress = defaultdict(int)  # build id -> log lines written so far
+
+    def paginate(self, request, items):
+        """
+        One page of `items`. `$top` caps the total across pages, so a query
+        for more than a page still gets a continuation token until `$top`
+        items have been returned.
+        """
+        offset = int(request.query.get('continuationToken') or 0)
+        top = request.query.get('$top')
+        end = min(len(items), int(top)) if top else len(items)
+        page = items[offset:min(offset + self.page_size, end)]
+        headers = {}
+        if offset + len(page) < end:
+            headers['x-ms-continuationtoken'] = str(offset + len(page))
+        return {'count': len(page), 'value': page}, headers
+
+    def project_or_404(self, request):
+        project = self.org.project(request.match_info['project'])
+        if not project:
+            raise web.HTTPNotFound(text=json.dumps({'message': 'Project not found'}))
+        return project
+
+    async def connection_data(self, request):
+        return web.json_response({'authenticatedUser': {'id': 'mock-user', 'providerDisplayName': 'Mock User'}})
+
+    def pool_or_404(self, request):
+        pool_id = int(request.match_info['pool_id'])
+        if pool_id not in self.org.agents:
+            raise web.HTTPNotFound()
+        return pool_id
+
+    async def pools(self, request):
+        return web.json_response({'count': len(self.org.pools), 'value': self.org.pools})
+
+    async def pool_agents(self, request):
+        agents = self.org.pool_agents(self.pool_or_404(request))
+        return web.json_response({'count': len(agents), 'value': agents})
+
+    async def pool_job_requests(self, request):
+        requests = self.org.job_requests(self.pool_or_404(request))
+        return web.json_response({'count': len(requests), 'value': requests})
+
+    async def projects(self, request):
+        body, headers = self.paginate(request, self.org.projects)
+        return web.json_response(body, headers=headers)
+
+    async def pipelines(self, request):
+        project = self.project_or_404(request)
+        body, headers = self.paginate(request, self.org.pipelines[project['id']])
+        return web.json_response(body, headers=headers)
+
+    async def builds(self, request):
+        project = self.project_or_404(request)
+        builds = filter_builds(self.org.builds[project['id']], request.query)
+        body, headers = self.paginate(request, builds)
+        return web.json_response(body, headers=headers)
+
+    async def build(self, request):
+        build = self.find_build(request)
+        if request.method == 'PATCH':
+            patch = await request.json()
+            if patch.get('status', '').lower() == 'cancelling' and build['status'] != 'completed':
+                build['status'] = 'cancelling'
+        return web.json_response(build)
+
+    def find_build(self, request):
+        project = self.project_or_404(request)
+        build_id = int(request.match_info['build_id'])
+        build = next((b for b in self.org.builds[project['id']] if b['id'] == build_id), None)
+        if not build:
+            raise web.HTTPNotFound()
+        return build
+
+    def log_line_counts(self, build):
+        """
+        Lines written per step. Completed builds have full logs; running ones
+        gain lines every time their logs are listed.
+        """
+        total = LOG_LINES_PER_STEP * len(LOG_STEPS)
+        written = total if build['status'] == 'completed' else min(total, self.log_progress[build['id']])
+        return [max(0, min(LOG_LINES_PER_STEP, written - index * LOG_LINES_PER_STEP)) for index in range(len(LOG_STEPS))]
+
+    async def timeline(self, request):
+        build = self.find_build(request)
+        counts = self.log_line_counts(build)
+        records = []
+        for index, (step, count) in enumerate(zip(LOG_STEPS, counts), start=1):
+            record = {'id': f'{build["id"]}-{index}', 'type': 'Task', 'name': step, 'order': index,
+                      'log': {'id': index} if count else None}
+            if count == LOG_LINES_PER_STEP:
+                record['state'] = 'completed'
+                record['result'] = build.get('result', 'succeeded') if index == len(LOG_STEPS) else 'succeeded'
+            else:
+                record['state'] = 'inProgress' if count else 'pending'
+            records.append(record)
+        return web.json_response({'id': str(build['id']), 'changeId': sum(counts), 'records': records})
+
+    async def logs(self, request):
+        build = self.find_build(request)
+        if build['status'] == 'inProgress':
+            self.log_progress[build['id']] += 25
+        logs = [{'id': index, 'lineCount': count} for index, count in enumerate(self.log_line_counts(build), start=1) if count]
+        return web.json_response({'count': len(logs), 'value': logs})
+
+    async def log_lines(self, request):
+        build = self.find_build(request)
+        log_id = int(request.match_info['log_id'])
+        counts = self.log_line_counts(build)
+        if not 1 <= log_id <= len(counts):
+            raise web.HTTPNotFound()
+        start = max(1, int(request.query.get('startLine') or 1))
+        end = min(counts[log_id - 1], int(request.query.get('endLine') or counts[log_id - 1]))
+        step = LOG_STEPS[log_id - 1]
+        text = ''.join(f'{line:06d} [{step}] synthetic output for build {build["id"]}\n' for line in range(start, end + 1))
+        return web.Response(text=text, content_type='text/plain')
+
+    async def approvals(self, request):
+        project = self.project_or_404(request)
+        if request.method == 'PATCH':
+            updated = []
+            for update in await request.json():
+                approval = self.org.update_approval(update.get('approvalId'), update.get('status'), update.get('comment', ''))
+                if not approval:
+                    raise web.HTTPBadRequest(text=json.dumps({'message': f"Approval {update.get('approvalId')} is not pending"}))
+                updated.append(approval)
+            return web.json_response({'count': len(updated), 'value': updated})
+        approvals = self.org.pending_approvals(project['id']) if request.query.get('state', 'pending') == 'pending' else []
+        return web.json_response({'count': len(approvals), 'value': approvals})
+
+    async def runs(self, request):
+        project = self.project_or_404(request)
+        pipeline_id = int(request.match_info['pipeline_id'])
+        if request.method == 'POST':
+            payload = await request.json()
+            ref = payload.get('resources', {}).get('repositories', {}).get('self', {}).get('refName', 'refs/heads/main')
+            build = self.org.queue_build(project['id'], pipeline_id, ref.removeprefix('refs/heads/'))
+            return web.json_response(build_to_run(build))
+        builds = [b for b in self.org.builds[project['id']] if b['definition']['id'] == pipeline_id]
+        body, headers = self.paginate(request, [build_to_run(build) for build in builds])
+        return web.json_response(body, headers=headers)
+
+    @web.middleware
+    async def conditions(self, request, handler):
+        """
+        Apply simulated latency, throttling and ETag revalidation to every route.
+        """
+        self.request_counts[request.path] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+        if self.throttle_rate and self.rng.random() < self.throttle_rate:
+            return web.json_response(
+                {'message': 'Request was blocked due to exceeding usage of resource.'},
+                status=429, headers={'Retry-After': str(self.retry_after)}
+            )
+        response = await handler(request)
+        if request.method == 'GET' and response.status == 200 and getattr(response, 'body', None):
+            etag = '"' + hashlib.sha1(response.body).hexdigest() + '"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers={'ETag': etag})
+            response.headers['ETag'] = etag
+        return response
+
+    async def churn_loop(self, app):
+        while True:
+            await asyncio.sleep(self.churn_interval)
+            self.org.churn(max_builds=5000)
+
+    async def start_churn(self, app):
+        if self.churn_interval > 0:
+            app['churn_task'] = asyncio.create_task(self.churn_loop(app))
+
+    async def stop_churn(self, app):
+        task = app.get('churn_task')
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def create_app(self):
+        app = web.Application(middlewares=[self.conditions])
+        app.router.add_get('/{org}/_apis/connectionData', self.connection_data)
+        app.router.add_get('/{org}/_apis/projects', self.projects)
+        app.router.add_get('/{org}/_apis/distributedtask/pools', self.pools)
+        app.router.add_get('/{org}/_apis/distributedtask/pools/{pool_id}/agents', self.pool_agents)
+        app.router.add_get('/{org}/_apis/distributedtask/pools/{pool_id}/jobrequests', self.pool_job_requests)
+        app.router.add_get('/{org}/{project}/_apis/pipelines', self.pipelines)
+        app.router.add_route('*', '/{org}/{project}/_apis/pipelines/approvals', self.approvals)
+        app.router.add_route('*', '/{org}/{project}/_apis/pipelines/{pipeline_id}/runs', self.runs)
+        app.router.add_get('/{org}/{project}/_apis/build/builds', self.builds)
+        app.router.add_route('*', '/{org}/{project}/_apis/build/builds/{build_id}', self.build)
+        app.router.add_get('/{org}/{project}/_apis/build/builds/{build_id}/timeline', self.timeline)
+        app.router.add_get('/{org}/{project}/_apis/build/builds/{build_id}/logs', self.logs)
+        app.router.add_get('/{org}/{project}/_apis/build/builds/{build_id}/logs/{log_id}', self.log_lines)
+        app.on_startup.append(self.start_churn)
+        app.on_cleanup.append(self.stop_churn)
+        return app
+
+
+class Recorder:
+    """
+    Reverse proxy that forwards every request to `upstream` and appends the
+    exchange to a JSON Lines cassette.
+    """
+
+    def __init__(self, upstream, cassette):
+        self.upstream = upstream.rstrip('/')
+        self.cassette = cassette
+        self.session = None
+
+    async def forward(self, request):
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        headers = {k: v for k, v in request.headers.items() if k in ('Authorization', 'Content-Type', 'If-None-Match')}
+        body = await request.read()
+        async with self.session.request(request.method, self.upstream + request.path_qs,
+                                        headers=headers, data=body or None) as upstream_response:
+            payload = await upstream_response.read()
+            kept = {k: v for k, v in upstream_response.headers.items() if k in CASSETTE_HEADERS}
+            entry = {
+                'method': request.method,
+                'path': request.path_qs,
+                'status': upstream_response.status,
+                'headers': kept,
+                'body': payload.decode('utf-8', errors='replace'),
+            }
+        with open(self.cassette, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return web.Response(status=entry['status'], body=payload, headers=kept)
+
+    async def close(self, app):
+        if self.session:
+            await self.session.close()
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.forward)
+        app.on_cleanup.append(self.close)
+        return app
+
+
+class Replayer:
+    """
+    Serves the exchanges of a cassette in recorded order. Once a request's
+    recordings are exhausted the last one keeps being served.
+    """
+
+    def __init__(self, cassette):
+        self.entries = defaultdict(list)
+        self.positions = defaultdict(int)
+        with open(cassette) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[(entry['method'], entry['path'])].append(entry)
+
+    async def serve(self, request):
+        key = (request.method, request.path_qs)
+        recorded = self.entries.get(key)
+        if not recorded:
+            return web.json_response({'message': f'No recording for {request.method} {request.path_qs}'}, status=404)
+        index = min(self.positions[key], len(recorded) - 1)
+        self.positions[key] += 1
+        entry = recorded[index]
+        return web.Response(status=entry['status'], text=entry['body'], headers=entry['headers'])
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.serve)
+        return app
+
+
+class MockServer:
+    """
+    Runs an application on a local port for the duration of an `async with`
+    block. `base_url` is what AzureDevOpsClient should be pointed at.
+    """
+
+    def __init__(self, app, host='127.0.0.1', port=0, organization='mock'):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.organization = organization
+        self.runner = None
+
+    @property
+    def base_url(self):
+        return f'http://{self.host}:{self.port}/{self.organization}'
+
+    async def __aenter__(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]  # The bound port when 0 was asked for
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in for the Azure DevOps REST API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--projects', type=int, default=5)
+    parser.add_argument('--pipelines', type=int, default=50, help='Pipelines per project')
+    parser.add_argument('--builds', type=int, default=200, help='Builds per project')
+    parser.add_argument('--folder-depth', type=int, default=3)
+    parser.add_argument('--folder-fanout', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0, help='Added latency per request in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='Random extra latency up to this many ms')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--page-size', type=int, default=100, help='Items per page before a continuation token')
+    parser.add_argument('--churn-interval', type=float, default=0, help='Seconds between build state changes')
+    parser.add_argument('--record', metavar='CASSETTE', help='Proxy to --upstream and record exchanges')
+    parser.add_argument('--upstream', default='https://dev.azure.com')
+    parser.add_argument('--replay', metavar='CASSETTE', help='Serve exchanges from a recorded cassette')
+    return parser.parse_args(argv)
+
+
+def create_app_from_args(args):
+    if args.replay:
+        return Replayer(args.replay).create_app()
+    if args.record:
+        return Recorder(args.upstream, args.record).create_app()
+    org = SyntheticOrg(args.projects, args.pipelines, args.builds, args.folder_depth, args.folder_fanout, args.seed)
+    return MockAzureDevOps(org, args.latency, args.jitter, args.throttle_rate, args.retry_after,
+                           args.page_size, args.churn_interval, args.seed).create_app()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    web.run_app(create_app_from_args(args), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
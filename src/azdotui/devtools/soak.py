@@ -0,0 +1,257 @@
+# devtools/soak.py
+#
+# Soak test: drives the UI headlessly against the mock server for a long
+# time with fast polling and random navigation, samples memory, tasks and
+# sockets, and fails if any of them grow faster than the given limits.
+#
+#   python -m azdotui.devtools.soak --duration 1800 --report soak.json
+#
+# Polling runs at --refresh-interval instead of every 5 seconds, so each real
+# minute covers many minutes of normal use. Growth rates are reported per
+# simulated hour: 720 Builds pane refreshes, one hour at the normal interval.
+
+import argparse
+import asyncio
+import curses
+import gc
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Log to a temp dir rather than the working tree. config/logger.py reads LOG_FILE when first imported, so this
+# must come before any azdotui import; the mock server process inherits it.
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.mkdtemp(prefix='azdotui-soak-'), 'app.log'))
+
+from azdotui.devtools.headless import headless_curses  # noqa: E402
+
+NORMAL_REFRESH_INTERVAL = 5  # Seconds between Builds pane refreshes outside the soak
+REFRESHES_PER_HOUR = 3600 / NORMAL_REFRESH_INTERVAL
+
+# Keys a user browsing the UI presses; nothing that opens a prompt or quits
+NAVIGATION_KEYS = [
+    [curses.KEY_UP], [curses.KEY_DOWN], [curses.KEY_DOWN] * 3, [curses.KEY_UP] * 2,
+    [curses.KEY_NPAGE], [curses.KEY_PPAGE], [curses.KEY_LEFT], [curses.KEY_RIGHT],
+    [10], [9], [27], [ord(' ')], [ord('m')],  # Enter, Tab, Esc, Space, metrics overlay
+]
+
+
+def rss_bytes():
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def open_sockets():
+    try:
+        fds = os.listdir('/proc/self/fd')
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f'/proc/self/fd/{fd}').startswith('socket:')
+        except OSError:
+            pass  # Closed while listing
+    return count
+
+
+def growth_per_hour(samples, key):
+    """Least-squares slope of `key` against simulated hours."""
+    points = [(s['simulated_hours'], s[key]) for s in samples if s[key] is not None]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def start_mock_server(args):
+    """
+    Run the mock server in its own process, so its memory, tasks and sockets
+    are not counted against the UI.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'azdotui.devtools.mock_server', '--port', str(port),
+         '--projects', str(args.projects), '--pipelines', str(args.pipelines), '--builds', str(args.builds),
+         '--churn-interval', str(args.refresh_interval), '--latency', str(args.latency)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return process, f'http://127.0.0.1:{port}/mock'
+        except OSError:
+            await asyncio.sleep(0.1)
+    process.kill()
+    raise RuntimeError('Mock server did not start')
+
+
+def log_file_bytes():
+    from azdotui.config.logger import LOG_FILE
+    try:
+        return os.path.getsize(LOG_FILE)
+    except OSError:
+        return None
+
+
+def sample(layout, refreshes, started):
+    gc.collect()
+    return {
+        'elapsed': round(time.monotonic() - started, 1),
+        'refreshes': refreshes,
+        'simulated_hours': refreshes / REFRESHES_PER_HOUR,
+        'rss': rss_bytes(),
+        'heap': tracemalloc.get_traced_memory()[0],
+        'tasks': len(asyncio.all_tasks()),
+        'sockets': open_sockets(),
+        'log_file': log_file_bytes(),
+        'log_lines': len(layout.panes['logs'].lines),
+    }
+
+
+async def soak(args):
+    from azdotui.api.azdo import AzureDevOpsClient
+    from azdotui.events.bus import BuildsUpdated
+    from azdotui.events.keybindings import handle_keys
+    from azdotui.ui.layout import Layout
+
+    rng = random.Random(args.seed)
+    process, base_url = await start_mock_server(args)
+    tracemalloc.start(args.traceback_frames)
+    client = AzureDevOpsClient(base_url)
+    samples = []
+    try:
+        with headless_curses() as screen:
+            layout = Layout(screen, client)
+            for pane in layout.panes.values():
+                if pane.auto_refresh_interval:
+                    pane.auto_refresh_interval = args.refresh_interval
+            refreshes = 0
+
+            def count_refresh(event):
+                nonlocal refreshes
+                refreshes += 1
+
+            layout.events.subscribe(BuildsUpdated, count_refresh)
+            await layout.panes['projects'].refresh_data()  # Also selects the first project
+
+            started = time.monotonic()
+            baseline = None
+            next_sample = started + args.warmup
+            while time.monotonic() - started < args.duration:
+                layout.render()
+                await handle_keys(layout, rng.choice(NAVIGATION_KEYS))
+                await asyncio.sleep(args.key_interval)
+                if time.monotonic() >= next_sample:
+                    if baseline is None:
+                        baseline = tracemalloc.take_snapshot()
+                    samples.append(sample(layout, refreshes, started))
+                    last = samples[-1]
+                    print(f"{last['elapsed']:>8}s  {last['simulated_hours']:6.2f}h  rss {last['rss'] / 2**20:7.1f}MB  "
+                          f"heap {last['heap'] / 2**20:6.1f}MB  tasks {last['tasks']:3}  sockets {last['sockets']}",
+                          file=sys.stderr)
+                    next_sample += args.sample_interval
+
+            top = []
+            if baseline:
+                diff = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+                top = [{'where': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                       for stat in diff[:args.top]]
+            for task in layout.auto_refresh_tasks:
+                task.cancel()
+            layout.prefetcher.cancel()
+            await asyncio.gather(*layout.auto_refresh_tasks, return_exceptions=True)
+    finally:
+        await client.close()
+        tracemalloc.stop()
+        process.terminate()
+        process.wait()
+    return samples, top
+
+
+def check(samples, args):
+    """Return (growth rates, limit violations)."""
+    rates = {
+        'rss_mb_per_hour': growth_per_hour(samples, 'rss') / 2**20,
+        'heap_mb_per_hour': growth_per_hour(samples, 'heap') / 2**20,
+        'tasks_per_hour': growth_per_hour(samples, 'tasks'),
+        'sockets_per_hour': growth_per_hour(samples, 'sockets'),
+        'log_file_mb_per_hour': growth_per_hour(samples, 'log_file') / 2**20,
+    }
+    violations = []
+    if rates['rss_mb_per_hour'] > args.max_rss_growth:
+        violations.append(f"RSS grows {rates['rss_mb_per_hour']:.2f}MB/h (limit {args.max_rss_growth})")
+    if rates['heap_mb_per_hour'] > args.max_heap_growth:
+        violations.append(f"Heap grows {rates['heap_mb_per_hour']:.2f}MB/h (limit {args.max_heap_growth})")
+    if rates['log_file_mb_per_hour'] > args.max_log_growth:
+        violations.append(f"Log file grows {rates['log_file_mb_per_hour']:.2f}MB/h (limit {args.max_log_growth})")
+    peak_tasks = max((s['tasks'] for s in samples), default=0)
+    if peak_tasks > args.max_tasks:
+        violations.append(f'{peak_tasks} asyncio tasks (limit {args.max_tasks})')
+    peak_sockets = max((s['sockets'] or 0 for s in samples), default=0)
+    if peak_sockets > args.max_sockets:
+        violations.append(f'{peak_sockets} open sockets (limit {args.max_sockets})')
+    return rates, violations
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Soak test the UI against the mock server.')
+    parser.add_argument('--duration', type=float, default=600, help='Real seconds to run')
+    parser.add_argument('--warmup', type=float, default=30, help='Seconds before the first sample, excluded from growth rates')
+    parser.add_argument('--sample-interval', type=float, default=10)
+    parser.add_argument('--refresh-interval', type=float, default=0.1, help='Auto-refresh interval during the soak')
+    parser.add_argument('--key-interval', type=float, default=0.05, help='Seconds between simulated key presses')
+    parser.add_argument('--projects', type=int, default=5)
+    parser.add_argument('--pipelines', type=int, default=200)
+    parser.add_argument('--builds', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=5, help='Mock server latency in ms')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--traceback-frames', type=int, default=1)
+    parser.add_argument('--top', type=int, default=10, help='Allocation sites to report')
+    parser.add_argument('--max-rss-growth', type=float, default=5, help='MB per simulated hour')
+    parser.add_argument('--max-heap-growth', type=float, default=2, help='MB per simulated hour')
+    parser.add_argument('--max-log-growth', type=float, default=10, help='Log file MB per simulated hour')
+    parser.add_argument('--max-tasks', type=int, default=50)
+    parser.add_argument('--max-sockets', type=int, default=110)
+    parser.add_argument('--report', help='Write samples, growth rates and top allocators to this JSON file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    samples, top = asyncio.run(soak(args))
+    rates, violations = check(samples, args)
+    report = {'samples': samples, 'growth': rates, 'top_allocations': top, 'violations': violations}
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({'growth': rates, 'violations': violations}, indent=2))
+    for stat in top:
+        print(f"{stat['size_diff'] / 1024:+10.1f}KB  {stat['count_diff']:+7}  {stat['where']}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
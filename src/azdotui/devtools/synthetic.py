@@ -0,0 +1,217 @@
+# devtools/synthetic.py
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+BUILD_RESULTS = ['succeeded', 'succeeded', 'succeeded', 'failed', 'partiallySucceeded', 'canceled']
+BRANCHES = ['main', 'develop', 'release/1.0', 'feature/login', 'feature/search']
+# (name, hosted, agents) of the agent pools builds run on
+AGENT_POOLS = [('Azure Pipelines', True, 0), ('linux-x64', False, 12), ('windows', False, 6), ('macos', False, 3)]
+
+
+def _iso(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def make_project(rng, index):
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128))),
+        'name': f'project-{index:04d}',
+        'state': 'wellFormed',
+        'visibility': 'private',
+    }
+
+
+def make_pipelines(rng, count, folder_depth=3, folder_fanout=4, start_id=1):
+    """
+    Generate `count` pipelines spread across a folder tree up to `folder_depth`
+    levels deep with at most `folder_fanout` folders per level.
+    """
+    pipelines = []
+    for offset in range(count):
+        depth = rng.randint(0, folder_depth)
+        parts = [f'folder-{level}-{rng.randrange(folder_fanout)}' for level in range(depth)]
+        pipelines.append({
+            'id': start_id + offset,
+            'name': f'pipeline-{start_id + offset:05d}',
+            'folder': '\\' + '\\'.join(parts),
+            'revision': 1,
+        })
+    return pipelines
+
+
+def make_build(rng, build_id, pipeline, project, now=None, status=None):
+    now = now or datetime.now(timezone.utc)
+    queue_time = now - timedelta(minutes=rng.randint(0, 60 * 24 * 7))
+    status = status or rng.choice(['completed'] * 8 + ['inProgress', 'notStarted'])
+    build = {
+        'id': build_id,
+        'buildNumber': f'{queue_time:%Y%m%d}.{build_id}',
+        'status': status,
+        'queueTime': _iso(queue_time),
+        'sourceBranch': f'refs/heads/{rng.choice(BRANCHES)}',
+        'definition': {'id': pipeline['id'], 'name': pipeline['name'], 'path': pipeline['folder']},
+        'project': {'id': project['id'], 'name': project['name']},
+    }
+    if status in ('inProgress', 'completed'):
+        start_time = queue_time + timedelta(seconds=rng.randint(1, 300))
+        build['startTime'] = _iso(start_time)
+        if status == 'completed':
+            build['result'] = rng.choice(BUILD_RESULTS)
+            build['finishTime'] = _iso(start_time + timedelta(seconds=rng.randint(30, 3600)))
+    return build
+
+
+def make_pools(rng):
+    pools = []
+    agents = {}
+    for pool_id, (name, hosted, size) in enumerate(AGENT_POOLS, start=1):
+        pools.append({'id': pool_id, 'name': name, 'isHosted': hosted, 'size': size})
+        agents[pool_id] = [
+            {'id': pool_id * 1000 + index, 'name': f'{name}-{index:02d}', 'enabled': True,
+             'status': 'online' if rng.random() < 0.85 else 'offline'}
+            for index in range(size)
+        ]
+    return pools, agents
+
+
+def make_builds(rng, count, pipelines, project, start_id=1):
+    now = datetime.now(timezone.utc)
+    builds = [
+        make_build(rng, start_id + offset, rng.choice(pipelines), project, now=now)
+        for offset in range(count)
+    ] if pipelines else []
+    # Newest first, as the builds API returns them
+    builds.sort(key=lambda build: build['queueTime'], reverse=True)
+    return builds
+
+
+class SyntheticOrg:
+    """
+    In-memory organization with projects, pipelines and builds that the mock
+    server and benchmarks share.
+    """
+
+    def __init__(self, projects=5, pipelines=50, builds=200, folder_depth=3, folder_fanout=4, seed=0):
+        self.rng = random.Random(seed)
+        self.projects = [make_project(self.rng, index) for index in range(projects)]
+        self.pipelines = {}
+        self.builds = {}
+        self.next_build_id = 1
+        self.approvals = {}  # Approval id -> approval, created when first listed
+        self.pools, self.agents = make_pools(random.Random(seed))  # Own generator, so other data is unchanged per seed
+        next_pipeline_id = 1
+        for project in self.projects:
+            project_pipelines = make_pipelines(self.rng, pipelines, folder_depth, folder_fanout, next_pipeline_id)
+            next_pipeline_id += pipelines
+            self.pipelines[project['id']] = project_pipelines
+            self.builds[project['id']] = make_builds(self.rng, builds, project_pipelines, project, self.next_build_id)
+            self.next_build_id += builds
+
+    def project(self, project_id):
+        return next((p for p in self.projects if p['id'] == project_id or p['name'] == project_id), None)
+
+    def pool_for(self, build):
+        return self.pools[build['definition']['id'] % len(self.pools)]
+
+    def job_requests(self, pool_id):
+        """Queued and running builds of a pool as job requests, the running ones reserving online agents in turn."""
+        online = [agent for agent in self.agents[pool_id] if agent['status'] == 'online']
+        requests = []
+        running = 0
+        for project in self.projects:
+            for build in self.builds[project['id']]:
+                if build['status'] not in ('notStarted', 'inProgress') or self.pool_for(build)['id'] != pool_id:
+                    continue
+                request = {'requestId': build['id'], 'poolId': pool_id, 'queueTime': build['queueTime'],
+                           'scopeId': project['id'], 'planType': 'Build',
+                           'definition': {'id': build['definition']['id'], 'name': build['definition']['name']}}
+                if build['status'] == 'inProgress':
+                    request['assignTime'] = build.get('startTime')
+                    if online:
+                        agent = online[running % len(online)]
+                        request['reservedAgent'] = {'id': agent['id'], 'name': agent['name']}
+                    running += 1
+                requests.append(request)
+        return requests
+
+    def pool_agents(self, pool_id):
+        busy = {request['reservedAgent']['id']: request for request in self.job_requests(pool_id)
+                if 'reservedAgent' in request}
+        return [dict(agent, assignedRequest={'requestId': busy[agent['id']]['requestId']}) if agent['id'] in busy
+                else dict(agent) for agent in self.agents[pool_id]]
+
+    def pending_approvals(self, project_id):
+        """
+        Approvals gating the queued builds of every third pipeline, as the
+        approvals API returns them.
+        """
+        project = self.project(project_id)
+        for build in self.builds[project['id']]:
+            approval_id = str(uuid.UUID(int=build['id']))
+            if build['status'] != 'notStarted' or build['definition']['id'] % 3 or approval_id in self.approvals:
+                continue
+            self.approvals[approval_id] = {
+                'id': approval_id,
+                'status': 'pending',
+                'createdOn': build['queueTime'],
+                'instructions': f"Deploy {build['definition']['name']} to production",
+                'minRequiredApprovers': 1,
+                'steps': [{'assignedApprover': {'displayName': 'Release Managers'}, 'status': 'pending'}],
+                'pipeline': {'id': str(build['definition']['id']), 'name': build['definition']['name'],
+                             'owner': {'id': build['id'], 'name': build['buildNumber']}},
+                'projectId': project['id'],
+            }
+        return [approval for approval in self.approvals.values()
+                if approval['projectId'] == project['id'] and approval['status'] == 'pending']
+
+    def update_approval(self, approval_id, status, comment=''):
+        """Complete a pending approval; rejecting it cancels the build it gated. Returns None if it isn't pending."""
+        approval = self.approvals.get(approval_id)
+        if not approval or approval['status'] != 'pending':
+            return None
+        approval['status'] = status
+        for step in approval['steps']:
+            step.update(status=status, comment=comment)
+        if status == 'rejected':
+            build = next((b for b in self.builds[approval['projectId']] if b['id'] == approval['pipeline']['owner']['id']), None)
+            if build and build['status'] == 'notStarted':
+                build.update(status='completed', result='canceled', finishTime=_iso(datetime.now(timezone.utc)))
+        return approval
+
+    def queue_build(self, project_id, pipeline_id, branch='main'):
+        project = self.project(project_id)
+        pipeline = next(p for p in self.pipelines[project['id']] if p['id'] == pipeline_id)
+        build = make_build(self.rng, self.next_build_id, pipeline, project, status='notStarted')
+        build['queueTime'] = _iso(datetime.now(timezone.utc))
+        build['sourceBranch'] = f'refs/heads/{branch}'
+        self.next_build_id += 1
+        self.builds[project['id']].insert(0, build)
+        return build
+
+    def churn(self, new_builds=1, max_builds=None):
+        """
+        Advance build states one step and queue `new_builds` builds per project.
+        Returns the builds whose state changed.
+        """
+        now = _iso(datetime.now(timezone.utc))
+        changed = []
+        for project in self.projects:
+            builds = self.builds[project['id']]
+            for build in builds:
+                if build['status'] == 'notStarted' and self.rng.random() < 0.5:
+                    build['status'] = 'inProgress'
+                    build['startTime'] = now
+                    changed.append(build)
+                elif build['status'] in ('inProgress', 'cancelling') and self.rng.random() < 0.3:
+                    build['result'] = 'canceled' if build['status'] == 'cancelling' else self.rng.choice(BUILD_RESULTS)
+                    build['status'] = 'completed'
+                    build['finishTime'] = now
+                    changed.append(build)
+            pipelines = self.pipelines[project['id']]
+            for _ in range(new_builds if pipelines else 0):
+                changed.append(self.queue_build(project['id'], self.rng.choice(pipelines)['id']))
+            if max_builds:
+                del builds[max_builds:]
+        return changed
@@ -0,0 +1,82 @@
+# events/bus.py
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from azdotui.config.logger import logger
+from azdotui.utils.metrics import metrics
+
+
+@dataclass(frozen=True)
+class ProjectSelected:
+    project_id: str
+    name: str = ''
+    organization: str = ''
+
+
+@dataclass(frozen=True)
+class PipelineSelected:
+    project_id: str
+    pipeline_id: int
+
+
+@dataclass(frozen=True)
+class BuildsUpdated:
+    """A fresh set of builds per category, fetched once and shared with every subscriber."""
+    project_id: str
+    pipeline_id: int | None
+    builds_by_category: dict = field(compare=False)
+
+
+@dataclass(frozen=True)
+class BuildChanged:
+    """A single build changed state, e.g. reported by a service hook."""
+    project_id: str
+    build: dict = field(compare=False)
+
+
+@dataclass(frozen=True)
+class BuildsCancelled:
+    project_id: str
+    build_ids: tuple
+
+
+@dataclass(frozen=True)
+class ApprovalsUpdated:
+    """Run ids of a project's builds that are waiting on a pending approval."""
+    project_id: str
+    run_ids: frozenset
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for data flowing between panes. Publishers
+    don't know who is listening, so a new pane only has to subscribe to the
+    events it cares about.
+
+    Handlers run synchronously in subscription order. A handler that returns
+    a coroutine has it scheduled as a task, so publishing never waits.
+    """
+
+    def __init__(self):
+        self.handlers = defaultdict(list)
+        self.tasks = set()
+
+    def subscribe(self, event_type, handler):
+        """Call `handler(event)` for every published `event_type`. Returns an unsubscribe function."""
+        self.handlers[event_type].append(handler)
+        return lambda: self.handlers[event_type].remove(handler)
+
+    def publish(self, event):
+        metrics.increment(f'events.{type(event).__name__}')
+        for handler in list(self.handlers.get(type(event), ())):
+            try:
+                result = handler(event)
+            except Exception as e:
+                logger.error(f"Handler {handler} failed for {event}: {e}", exc_info=True)
+                continue
+            if asyncio.iscoroutine(result):
+                task = asyncio.create_task(result)
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
@@ -7,14 +7,22 @@ COMMANDS = {
     ord('q'): "exit",                    # Quit application
     curses.KEY_UP: ("navigate", 'UP'),   # Up arrow
     curses.KEY_DOWN: ("navigate", 'DOWN'),# Down arrow
+    curses.KEY_PPAGE: ("navigate", 'PAGE_UP'),   # Page Up
+    curses.KEY_NPAGE: ("navigate", 'PAGE_DOWN'), # Page Down
     curses.KEY_LEFT: "handle_input",     # Left arrow
     curses.KEY_RIGHT: "handle_input",    # Right arrow
     curses.KEY_ENTER: "handle_selection",
     10: "handle_selection",              # Enter key
     13: "handle_selection",
     ord(' '): "handle_input",            # Spacebar
+    27: "close_pane",                    # Escape closes full-screen views
     ord('t'): "trigger_pipelines",       # Trigger pipelines
     ord('c'): "cancel_builds",           # Cancel builds
+    ord('m'): "toggle_metrics",          # Show/hide metrics overlay
+    ord('p'): "show_agent_pools",        # Agent pool capacity view
+    ord('a'): "show_approvals",          # Pending approvals of the selected project
+    ord('A'): "approve_selected",        # Approve the selected approvals
+    ord('R'): "reject_selected",         # Reject the selected approvals
     # Add more keybindings as needed
 }
 
@@ -6,6 +6,69 @@ from azdotui.events.commands import COMMANDS
 from azdotui.utils.enums import InputAction
 from azdotui.utils.helpers import call_async_if_coroutine
 
+# Row steps for arrow keys; a run of them within one batch becomes a single cursor move
+NAVIGATION_STEPS = {'UP': -1, 'DOWN': 1}
+
+
+def _switch_pane_repeats(layout, run):
+    cycle = len(layout.pane_order)
+    if layout.active_pane_name not in layout.pane_order:
+        return 1 + (run - 1) % cycle  # The first Tab only closes the full-screen view
+    return run % cycle
+
+
+# How many times a run of the same key actually needs handling
+COLLAPSIBLE_COMMANDS = {
+    "switch_pane": _switch_pane_repeats,
+    "toggle_metrics": lambda layout, run: run % 2,
+    "close_pane": lambda layout, run: 1,
+}
+
+
+def read_keys(screen, limit=256):
+    """
+    Drain every key already waiting in the input queue (screen must be in
+    nodelay mode).
+    """
+    keys = []
+    while len(keys) < limit:
+        key = screen.getch()
+        if key == -1:
+            break
+        keys.append(key)
+    return keys
+
+
+async def handle_keys(layout, keys):
+    """
+    Handle a batch of keys read since the last frame. Consecutive Up/Down
+    presses are merged into one move and redundant repeats of toggles are
+    dropped; keys typed into a prompt are always handled one by one.
+    """
+    delta = 0
+    index = 0
+    while index < len(keys) and layout.running:
+        key = keys[index]
+        command = None if layout.input_mode else COMMANDS.get(key)
+        if isinstance(command, tuple) and command[0] == "navigate" and command[1] in NAVIGATION_STEPS:
+            delta += NAVIGATION_STEPS[command[1]]
+            index += 1
+            continue
+        if delta:
+            layout.active_pane.navigate_by(delta)
+            delta = 0
+        run = 1
+        repeats = 1
+        if command in COLLAPSIBLE_COMMANDS:
+            while index + run < len(keys) and keys[index + run] == key:
+                run += 1
+            repeats = COLLAPSIBLE_COMMANDS[command](layout, run)
+        for _ in range(repeats):
+            await handle_key(layout, key)
+        index += run
+    if delta and layout.running:
+        layout.active_pane.navigate_by(delta)
+
 
 async def handle_key(layout, key):
     if layout.input_mode:
@@ -28,6 +91,18 @@ async def handle_key(layout, key):
                 layout.set_input_mode(prompt="Enter branch/tag: ", action=InputAction.TRIGGER_PIPELINES)
             elif command == "cancel_builds":
                 layout.set_input_mode(prompt="Confirm cancelling all running and queued builds? (y/n): ", action=InputAction.CANCEL_BUILDS)
+            elif command == "close_pane":
+                layout.close_pane()
+            elif command == "toggle_metrics":
+                layout.toggle_metrics()
+            elif command == "show_agent_pools":
+                layout.open_agent_pools()
+            elif command == "show_approvals":
+                layout.open_approvals()
+            elif command == "approve_selected":
+                layout.prompt_approvals('approved')
+            elif command == "reject_selected":
+                layout.prompt_approvals('rejected')
             else:
                 pass  # Handle other commands
         else:
@@ -43,6 +118,10 @@ async def handle_input_mode(layout, key):
             elif layout.input_action == InputAction.CANCEL_BUILDS:
                 await layout.cancel_running_and_queued_builds()
                 layout.status_bar.set_message("Cancelling builds...")
+            elif layout.input_action == InputAction.APPROVE:
+                await layout.update_selected_approvals('approved')
+            elif layout.input_action == InputAction.REJECT:
+                await layout.update_selected_approvals('rejected')
             # Reset input mode
             layout.input_mode = False
             layout.confirmation_mode = False
@@ -54,12 +133,17 @@ async def handle_input_mode(layout, key):
             pass  # Ignore other keys
     elif key in [10, 13]:  # Enter key
         # User finished typing input
-        if layout.input_buffer or layout.input_action == InputAction.CANCEL_BUILDS:
+        # Cancelling needs no input and approval comments are optional
+        if layout.input_buffer or layout.input_action in (InputAction.CANCEL_BUILDS, InputAction.APPROVE, InputAction.REJECT):
             layout.confirmation_mode = True
             if layout.input_action == InputAction.TRIGGER_PIPELINES:
                 layout.status_bar.set_message(f"Confirm triggering on '{layout.input_buffer}'? (y/n)")
             elif layout.input_action == InputAction.CANCEL_BUILDS:
                 layout.status_bar.set_message("Confirm cancelling all running and queued builds? (y/n)")
+            elif layout.input_action in (InputAction.APPROVE, InputAction.REJECT):
+                verb = 'approving' if layout.input_action == InputAction.APPROVE else 'rejecting'
+                count = len(layout.panes['approvals'].selected_approvals)
+                layout.status_bar.set_message(f"Confirm {verb} {count} approvals? (y/n)")
         else:
             layout.status_bar.set_message("Input cannot be empty. Try again.")
             layout.input_buffer = ''
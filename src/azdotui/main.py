@@ -2,30 +2,60 @@
 
 import asyncio
 import curses
+import sys
 
-from azdotui.api.azdo import AzureDevOpsClient
+from azdotui.api.webhooks import WebhookReceiver
 from azdotui.config.logger import logger
-from azdotui.events.keybindings import handle_key
+from azdotui.config.settings import (METRICS_FILE, WEBHOOK_HOST, WEBHOOK_POLL_INTERVAL, WEBHOOK_PORT,
+                                     WEBHOOK_SECRET)
+from azdotui.daemon.client import connect_clients
+from azdotui.events.bus import BuildChanged
+from azdotui.events.keybindings import handle_keys, read_keys
 from azdotui.ui.layout import Layout
 from azdotui.utils.cursed import init_colors
+from azdotui.utils.metrics import metrics
+from azdotui.utils.offload import shutdown as offload_shutdown
+
+
+async def start_webhook_receiver(layout):
+    builds_pane = layout.panes['builds']
+    receiver = WebhookReceiver(
+        lambda project_id, build: layout.events.publish(BuildChanged(project_id, build)),
+        WEBHOOK_HOST, int(WEBHOOK_PORT), WEBHOOK_SECRET
+    )
+    try:
+        await receiver.start()
+    except OSError as e:
+        logger.error(f"Failed to start webhook receiver on {WEBHOOK_HOST}:{WEBHOOK_PORT}: {e}")
+        layout.status_bar.set_message(f"Webhook receiver disabled: {e}")
+        return None
+    # Pushed updates keep builds current; polling becomes a slow safety net
+    builds_pane.auto_refresh_interval = WEBHOOK_POLL_INTERVAL
+    return receiver
 
 
 async def main(screen):
     init_colors()
     curses.curs_set(0)  # Hide the cursor
-    azdo_client = AzureDevOpsClient()
-    layout = Layout(screen, azdo_client)
+    screen.nodelay(True)  # Poll for keys so background refreshes keep running and reach the screen
+    clients = await connect_clients()  # One per organization; the shared polling daemon when one is running
+    layout = Layout(screen, next(iter(clients.values())), clients)
+    webhook_receiver = None
 
     try:
-        # Initial data load
-        await layout.panes['projects'].refresh_data()  # Updated line
-        if layout.panes['projects'].items:             # Updated line
-            await layout.panes['projects'].handle_selection()  # Updated line
+        if WEBHOOK_PORT:
+            webhook_receiver = await start_webhook_receiver(layout)
+
+        # Initial data load; each organization's projects appear, and the first is selected, as they arrive
+        layout.panes['projects'].start_load()
 
         while layout.running:
-            layout.render()
-            key = screen.getch()
-            await handle_key(layout, key)  # Await the async handle_key function
+            layout.render()  # One render per batch of input
+            keys = read_keys(screen)
+            if not keys:
+                await asyncio.sleep(0.05)  # No input; let refresh tasks run
+                continue
+            await handle_keys(layout, keys)
             await asyncio.sleep(0)  # Yield control to the event loop
     except Exception:
         logger.error("An unexpected error occurred during program execution.", exc_info=True)
@@ -36,9 +66,22 @@ async def main(screen):
             task.cancel()
         # Wait for tasks to be cancelled
         await asyncio.gather(*layout.auto_refresh_tasks, return_exceptions=True)
-        await azdo_client.close()  # Ensure the client session is closed
+        layout.prefetcher.cancel()
+        offload_shutdown()
+        if webhook_receiver:
+            await webhook_receiver.stop()
+        await asyncio.gather(*[client.close() for client in clients.values()])  # Ensure the client sessions are closed
+        if METRICS_FILE:
+            try:
+                metrics.dump(METRICS_FILE)
+            except OSError as e:
+                logger.error(f"Failed to write metrics to {METRICS_FILE}: {e}")
 
 def main_entry():
+    if len(sys.argv) > 1:
+        # Subcommands run headless without starting curses
+        from azdotui import cli
+        sys.exit(cli.main(sys.argv[1:]))
     curses.wrapper(lambda scr: asyncio.run(main(scr)))
 
 if __name__ == '__main__':
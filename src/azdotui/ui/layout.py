@@ -4,29 +4,49 @@ import asyncio
 import curses.panel
 
 from azdotui.config.logger import logger
+from azdotui.config.settings import BUILDS_BRANCH
+from azdotui.events.bus import BuildsCancelled, EventBus
+from azdotui.utils.enums import InputAction
+from azdotui.ui.metrics_overlay import MetricsOverlay
+from azdotui.ui.panes.agent_pools_pane import AgentPoolsPane
+from azdotui.ui.panes.approvals_pane import ApprovalsPane
 from azdotui.ui.panes.builds_pane import BuildsPane
+from azdotui.ui.panes.log_pane import LogPane
 from azdotui.ui.panes.pipelines_pane import PipelinesPane
 from azdotui.ui.panes.projects_pane import ProjectsPane
+from azdotui.ui.prefetch import Prefetcher
 from azdotui.ui.status_bar import StatusBar
+from azdotui.utils.metrics import metrics
 
 
 class Layout:
-    def __init__(self, screen, azdo_client):
+    def __init__(self, screen, azdo_client, clients=None):
         self.screen = screen
-        self.azdo_client = azdo_client
+        # One client per organization; azdo_client is the one of the selected project
+        self.clients = clients or {getattr(azdo_client, 'organization', None): azdo_client}
+        self.organization = next(iter(self.clients))
+        self.azdo_client = self.clients[self.organization]
         self.running = True
 
+        self.events = EventBus()  # Panes publish and subscribe here instead of calling each other
         self.status_bar = StatusBar(self)
+        self.metrics_overlay = MetricsOverlay(self)
+        self.prefetcher = Prefetcher(self)
 
         # Use a dictionary to store panes
         self.panes = {
             "projects": ProjectsPane(self),
             "pipelines": PipelinesPane(self),
-            "builds": BuildsPane(self)
+            "builds": BuildsPane(self),
+            "logs": LogPane(self),
+            "agent_pools": AgentPoolsPane(self),
+            "approvals": ApprovalsPane(self)
         }
+        # Panes reachable with Tab; the others are full-screen views opened on demand
         self.pane_order = ["projects", "pipelines", "builds"]
         self.active_pane_name = "projects"
         self.active_pane = self.panes[self.active_pane_name]
+        self.previous_pane_name = self.active_pane_name
 
         self.full_render_needed = True
         self.input_mode = False
@@ -44,24 +64,111 @@ class Layout:
                 self.auto_refresh_tasks.append(task)
 
     def switch_pane(self):
+        if self.active_pane_name not in self.pane_order:
+            self.close_pane()
+            return
         current_index = self.pane_order.index(self.active_pane_name)
         self.active_pane_name = self.pane_order[(current_index + 1) % len(self.pane_order)]
         self.active_pane = self.panes[self.active_pane_name]
         self.status_bar.set_message(f"Switched to {self.active_pane.title} pane")
         self.full_render_needed = True
 
+    def use_organization(self, organization):
+        """
+        Point the panes at `organization`'s client. Its caches stay warm while
+        other organizations are in use, so switching back costs no requests.
+        """
+        if organization == self.organization:
+            return
+        self.organization = organization
+        self.azdo_client = self.clients[organization]
+        self.prefetcher.cancel()
+        self.panes['pipelines'].selected_pipelines.clear()  # Pipeline ids are only meaningful within one organization
+
+    def activate_pane(self, name):
+        self.active_pane_name = name
+        self.active_pane = self.panes[name]
+        self.full_render_needed = True
+
+    async def open_build_log(self, project_id, build):
+        log_pane = self.panes['logs']
+        log_pane.open(project_id, build)
+        self.previous_pane_name = self.active_pane_name
+        self.activate_pane('logs')
+        self.status_bar.set_message("Up/Down/PgUp/PgDn to scroll, Esc to close the log")
+        log_pane.start_load()
+
+    def open_agent_pools(self):
+        pools_pane = self.panes['agent_pools']
+        if pools_pane.visible:
+            return
+        pools_pane.open()
+        self.previous_pane_name = self.active_pane_name
+        self.activate_pane('agent_pools')
+        self.status_bar.set_message("Agent pools; '!' marks pools with jobs queued and no idle agents. Esc to close")
+        pools_pane.start_load()
+
+    def open_approvals(self):
+        approvals_pane = self.panes['approvals']
+        if approvals_pane.visible:
+            return
+        if not approvals_pane.project_id:
+            self.status_bar.set_message("No project selected.")
+            return
+        approvals_pane.open()
+        self.previous_pane_name = self.active_pane_name
+        self.activate_pane('approvals')
+        self.status_bar.set_message("Space to select (a run's row selects all its approvals), Right/Left all/none, "
+                                    "A to approve, R to reject, Esc to close")
+        approvals_pane.start_load()
+
+    def prompt_approvals(self, status):
+        approvals_pane = self.panes['approvals']
+        if self.active_pane is not approvals_pane:
+            self.status_bar.set_message("Press 'a' to open the approvals view first.")
+            return
+        count = len(approvals_pane.selected_approvals)
+        if not count:
+            self.status_bar.set_message("No approvals selected.")
+            return
+        verb = 'approve' if status == 'approved' else 'reject'
+        action = InputAction.APPROVE if status == 'approved' else InputAction.REJECT
+        self.set_input_mode(prompt=f"Comment to {verb} {count} approvals (optional), then Enter: ", action=action)
+
+    def close_pane(self):
+        if self.active_pane_name in self.pane_order:
+            return  # Only full-screen views can be closed
+        self.active_pane.close()
+        self.activate_pane(self.previous_pane_name)
+        self.status_bar.set_message(f"Switched to {self.active_pane.title} pane")
+
+    def toggle_metrics(self):
+        self.metrics_overlay.toggle()
+        self.status_bar.set_message("Metrics overlay " + ("shown" if self.metrics_overlay.visible else "hidden"))
+
+    @metrics.timed('frame')
     def render(self):
+        # Render other panes first if full render is needed, so the active pane ends up on top
+        if self.full_render_needed:
+            for pane_name, pane in self.panes.items():
+                if pane != self.active_pane and pane.visible:
+                    pane.render()
+            self.active_pane.needs_render = True
+            self.full_render_needed = False
+        elif self.active_pane_name in self.pane_order:
+            # Side-by-side panes don't overlap, so one that changed can be redrawn on its own
+            for pane in self.panes.values():
+                if pane != self.active_pane and pane.visible and pane.needs_render:
+                    pane.render()
+                    pane.needs_render = False
+
         # Render active pane if it needs rendering
         if self.active_pane.needs_render:
             self.active_pane.render()
             self.active_pane.needs_render = False
 
-        # Render other panes if full render is needed
-        if self.full_render_needed:
-            for pane_name, pane in self.panes.items():
-                if pane != self.active_pane:
-                    pane.render()
-            self.full_render_needed = False
+        # Keep the metrics overlay on top of the panes while it is visible
+        self.metrics_overlay.render()
 
         # Always render the status bar
         self.status_bar.render()
@@ -90,18 +197,45 @@ class Layout:
             self.status_bar.set_message("Branch/tag cannot be empty.")
             return
 
-        tasks = [
-            self.azdo_client.trigger_pipeline(project_id, pipeline_id, branch)
-            for pipeline_id in selected_pipelines
-        ]
-        try:
-            await asyncio.gather(*tasks)
+        failed = []
+        async for pipeline_id, _, error in self.azdo_client.trigger_pipelines(project_id, selected_pipelines, branch):
+            if error:
+                failed.append(pipeline_id)
+                logger.error(f"Error triggering pipeline {pipeline_id}: {error}")
+            else:
+                pipelines_pane.selected_pipelines.discard(pipeline_id)
+        if failed:
+            self.status_bar.set_message(f"Failed to trigger {len(failed)} of {len(selected_pipelines)} pipelines on '{branch}'.")
+        else:
             self.status_bar.set_message(f"Triggered pipelines on '{branch}'.")
-            pipelines_pane.selected_pipelines.clear()
-            self.full_render_needed = True  # Refresh UI to update selection marks
-        except Exception as e:
-            self.status_bar.set_message(f"Failed to trigger pipelines: {e}")
-            logger.error(f"Error triggering pipelines: {e}", exc_info=True)
+        self.full_render_needed = True  # Refresh UI to update selection marks
+
+    async def update_selected_approvals(self, status):
+        approvals_pane = self.panes['approvals']
+        approval_ids = approvals_pane.selected_in_order()
+        project_id = approvals_pane.project_id
+        comment = self.input_buffer.strip()
+
+        if not approval_ids:
+            self.status_bar.set_message("No approvals selected.")
+            return
+
+        failed = []
+        async for approval_id, _, error in self.azdo_client.update_approvals(project_id, approval_ids, status, comment):
+            if error:
+                failed.append(approval_id)
+                approvals_pane.errors[approval_id] = str(error)
+                logger.error(f"Error setting approval {approval_id} to {status}: {error}")
+            else:
+                approvals_pane.selected_approvals.discard(approval_id)
+                approvals_pane.errors.pop(approval_id, None)
+        verb = 'Approved' if status == 'approved' else 'Rejected'
+        if failed:
+            self.status_bar.set_message(f"{verb} {len(approval_ids) - len(failed)} of {len(approval_ids)}; "
+                                        f"{len(failed)} failed and stay selected.")
+        else:
+            self.status_bar.set_message(f"{verb} {len(approval_ids)} approvals.")
+        approvals_pane.start_load()  # Completed approvals drop out of the list
 
     async def cancel_running_and_queued_builds(self):
         builds_pane = self.panes['builds']
@@ -111,32 +245,40 @@ class Layout:
             self.status_bar.set_message("No project selected.")
             return
 
-        builds_to_cancel = []
-        for category in ['running', 'queued']:
-            builds = builds_pane.builds_by_category.get(category, [])
-            builds_to_cancel.extend(builds)
+        # The pane shows only a few builds per category, so ask for all of them
+        data = await self.azdo_client.get_builds(
+            project_id, status_filter='inProgress,notStarted', top=1000,
+            definitions=builds_pane.pipeline_id, branchName=BUILDS_BRANCH
+        )
+        builds_to_cancel = data.get('value', [])
 
         if not builds_to_cancel:
             self.status_bar.set_message("No running or queued builds to cancel.")
             return
 
-        tasks = [
-            self.azdo_client.cancel_build(project_id, build['id'])
-            for build in builds_to_cancel
-        ]
-
-        try:
-            await asyncio.gather(*tasks)
-            self.status_bar.set_message(f"Cancelled {len(builds_to_cancel)} builds.")
-            await builds_pane.refresh_data()  # Refresh the builds pane
-        except Exception as e:
-            self.status_bar.set_message(f"Failed to cancel builds: {e}")
-            logger.error(f"Error cancelling builds: {e}", exc_info=True)
+        build_ids = [build['id'] for build in builds_to_cancel]
+        failed = []
+        cancelled = []
+        async for build_id, _, error in self.azdo_client.cancel_builds(project_id, build_ids):
+            if error:
+                failed.append(build_id)
+                logger.error(f"Error cancelling build {build_id}: {error}")
+            else:
+                cancelled.append(build_id)
+        if failed:
+            self.status_bar.set_message(f"Failed to cancel {len(failed)} of {len(build_ids)} builds.")
+        else:
+            self.status_bar.set_message(f"Cancelled {len(build_ids)} builds.")
+        if cancelled:
+            self.events.publish(BuildsCancelled(project_id, tuple(cancelled)))
 
     async def auto_refresh_pane(self, pane):
         while self.running:
             try:
-                await pane.refresh_data()
+                # A selection load already in flight is fresher than this tick
+                if not pane.load_in_flight():
+                    # asyncio.wait so a load cancelled by a new selection doesn't stop this loop
+                    await asyncio.wait([pane.start_load()])
                 pane.needs_render = True
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,56 @@
+# ui/metrics_overlay.py
+
+import curses
+import curses.panel
+
+from azdotui.utils.metrics import metrics
+
+
+class MetricsOverlay:
+    def __init__(self, layout):
+        self.layout = layout
+        self.visible = False
+        max_y, max_x = layout.screen.getmaxyx()
+        height = max(3, max_y - 4)
+        width = max(20, min(max_x - 4, 90))
+        self.window = curses.newwin(height, width, 1, max(0, (max_x - width) // 2))
+        self.panel = curses.panel.new_panel(self.window)
+        self.panel.hide()
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.panel.show()
+        else:
+            self.panel.hide()
+            self.layout.full_render_needed = True
+
+    def format_lines(self):
+        lines = [f"{'metric':<36} {'n':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for name, hist in sorted(metrics.histograms.items()):
+            summary = hist.summary()
+            lines.append(
+                f"{name[:36]:<36} {summary['count']:>7} {summary['p50']:>9.1f} "
+                f"{summary['p95']:>9.1f} {summary['max']:>9.1f}"
+            )
+        counters = [
+            (name, value) for name, value in sorted(metrics.counters.items())
+            if name.startswith(('cache.', 'connections.')) or name.endswith('.bytes')
+        ]
+        if counters:
+            lines.append('')
+            for name, value in counters:
+                lines.append(f"{name[:48]:<48} {value:>12}")
+        return lines
+
+    def render(self):
+        if not self.visible:
+            return
+        self.window.erase()
+        self.window.border()
+        self.window.addstr(0, 2, ' Metrics ', curses.A_BOLD)
+        max_y, max_x = self.window.getmaxyx()
+        for y, line in enumerate(self.format_lines()[:max_y - 2], start=1):
+            self.window.addnstr(y, 2, line, max_x - 4, curses.A_BOLD if y == 1 else curses.A_NORMAL)
+        self.panel.top()
+        self.window.noutrefresh()
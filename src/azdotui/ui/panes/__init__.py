@@ -1,7 +1,10 @@
 # src/azdotui/ui/panes/__init__.py
 
+from .agent_pools_pane import AgentPoolsPane
+from .approvals_pane import ApprovalsPane
 from .base_pane import BasePane
 from .builds_pane import BuildsPane
+from .log_pane import LogPane
 from .pipelines_pane import PipelinesPane
 from .projects_pane import ProjectsPane
 
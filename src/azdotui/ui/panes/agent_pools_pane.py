@@ -0,0 +1,180 @@
+# ui/panes/agent_pools_pane.py
+
+import asyncio
+import curses
+import logging
+import time
+
+from azdotui.config.settings import AGENT_POOLS_AGENTS_INTERVAL, AGENT_POOLS_INTERVAL
+from azdotui.utils.agent_pools import PoolCounters
+from azdotui.utils.bulk import run_bounded
+from azdotui.utils.metrics import metrics
+from azdotui.utils.run_history import format_duration
+
+from .base_pane import BasePane
+
+logger = logging.getLogger(__name__)
+
+
+class AgentPoolsPane(BasePane):
+    """
+    Full-screen view of every agent pool across the configured organizations:
+    online, busy and idle agents and the queued job depth, so a Queued build
+    can be traced to a saturated pool.
+
+    While open it polls each pool's pending job requests every
+    AGENT_POOLS_INTERVAL seconds and its agents every
+    AGENT_POOLS_AGENTS_INTERVAL seconds. Responses only update the pool's
+    counters, and rows are drawn from the counters, never from agent lists.
+    """
+
+    def __init__(self, layout):
+        super().__init__(layout, width_ratio=1, x_start=0)
+        self.title = 'Agent Pools'
+        self.visible = False
+        self.panel.hide()
+        self.auto_refresh_interval = AGENT_POOLS_INTERVAL
+        self.pools = {}  # (organization, pool id) -> PoolCounters
+        self.agents_fetched = {}  # Organization -> monotonic time agents were last fetched
+
+    def open(self):
+        self.visible = True
+        self.needs_render = True
+
+    def close(self):
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+        self.visible = False
+        self.panel.hide()
+
+    @metrics.timed('pane.agent_pools.refresh_data')
+    async def refresh_data(self):
+        if not self.visible:
+            return
+        self.is_loading = not self.pools
+        try:
+            results = await asyncio.gather(*[
+                self.refresh_organization(org, client) for org, client in self.layout.clients.items()
+            ])
+            if any(results):
+                self.set_items()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading agent pools: {e}", exc_info=True)
+        finally:
+            self.is_loading = False
+
+    async def refresh_organization(self, org, client):
+        """Update the counters of `org`'s pools. Returns True if any changed."""
+        data = await client.get_agent_pools()
+        if 'value' not in data:
+            return False  # Keep the last known counts
+        fetch_agents = time.monotonic() - self.agents_fetched.get(org, float('-inf')) >= AGENT_POOLS_AGENTS_INTERVAL
+        if fetch_agents:
+            self.agents_fetched[org] = time.monotonic()
+        pools = data['value']
+        current = {(org, pool['id']) for pool in pools}
+        changed = False
+        for key in [key for key in self.pools if key[0] == org and key not in current]:
+            del self.pools[key]  # Pool was deleted
+            changed = True
+
+        async def refresh_pool(pool):
+            key = (org, pool['id'])
+            counters = self.pools.get(key)
+            if counters is None:
+                counters = self.pools[key] = PoolCounters(org, pool)
+            updated = False
+            jobs = await client.get_pool_job_requests(pool['id'])
+            if 'value' in jobs:
+                updated = counters.update_jobs(jobs['value'])
+            if fetch_agents and not counters.hosted:
+                agents = await client.get_pool_agents(pool['id'])
+                if 'value' in agents:
+                    updated = counters.update_agents(agents['value']) or updated
+            return updated
+
+        async for pool, updated, error in run_bounded(pools, refresh_pool):
+            if error:
+                logger.error(f"Error refreshing agent pool {pool.get('name')} in {org}: {error}")
+            changed = changed or bool(updated)
+        return changed
+
+    def set_items(self):
+        """One row per pool in configured organization order, with an organization header when there are several."""
+        selected = self.items[self.selected_index] if self.items else None
+        grouped = len(self.layout.clients) > 1
+        self.items = []
+        for org in self.layout.clients:
+            pools = sorted((c for c in self.pools.values() if c.organization == org), key=lambda c: c.name.lower())
+            if grouped:
+                self.items.append(org)
+            self.items.extend(pools)
+        self.selected_index = self.items.index(selected) if selected in self.items else 0
+        self.viewport_start = min(self.viewport_start, self.selected_index)
+        self.needs_render = True
+
+    def summary(self):
+        pools = self.pools.values()
+        saturated = sum(1 for counters in pools if counters.saturated)
+        queued = sum(counters.queued for counters in pools)
+        return f"{len(self.pools)} pools, {queued} jobs queued, {saturated} saturated"
+
+    @staticmethod
+    def format_count(value):
+        return '-' if value is None else str(value)
+
+    def format_item(self, item):
+        if isinstance(item, str):
+            return f"== {item} =="
+        wait = item.longest_wait()
+        return (f"{'!' if item.saturated else ' '} {item.name[:32]:<32} "
+                f"{self.format_count(item.online):>6}/{self.format_count(item.agents):<6} "
+                f"{self.format_count(item.busy):>6} {self.format_count(item.idle):>6} "
+                f"{item.queued:>7} {item.running:>8}  {format_duration(wait) if wait is not None else ''}")
+
+    @metrics.timed('pane.agent_pools.render')
+    def render(self):
+        if not self.visible:
+            return
+        self.window.erase()
+        self.window.border()
+        self.window.addstr(0, 2, f' {self.title} ', curses.A_BOLD | curses.A_REVERSE)
+        max_y, max_x = self.window.getmaxyx()
+
+        if self.is_loading:
+            self.window.addstr(1, 2, "Loading...", curses.A_DIM)
+        else:
+            self.window.addnstr(1, 2, self.summary(), max_x - 4, curses.A_BOLD)
+            header = f"  {'Pool':<32} {'Online':>13} {'Busy':>6} {'Idle':>6} {'Queued':>7} {'Running':>8}  Longest wait"
+            self.window.addnstr(2, 2, header, max_x - 4, curses.A_UNDERLINE)
+            visible_height = max_y - 4  # Minus borders, summary and column headers
+            for y, index in enumerate(range(self.viewport_start, min(len(self.items), self.viewport_start + visible_height)), start=3):
+                item = self.items[index]
+                if index == self.selected_index:
+                    style = curses.A_REVERSE
+                elif isinstance(item, str) or item.saturated:
+                    style = curses.A_BOLD
+                else:
+                    style = curses.A_NORMAL
+                self.window.addnstr(y, 2, self.format_item(item), max_x - 4, style)
+
+        self.panel.top()
+        self.panel.show()
+        self.window.noutrefresh()
+
+    def navigate_by(self, delta):
+        # Two extra header rows compared to the list panes
+        if not self.items:
+            return
+        index = min(len(self.items) - 1, max(0, self.selected_index + delta))
+        if index == self.selected_index:
+            return
+        self.selected_index = index
+        visible_height = self.window.getmaxyx()[0] - 4
+        if index < self.viewport_start:
+            self.viewport_start = index
+        elif index >= self.viewport_start + visible_height:
+            self.viewport_start = index - visible_height + 1
+        self.needs_render = True
@@ -0,0 +1,203 @@
+# ui/panes/approvals_pane.py
+
+import curses
+import logging
+import time
+
+from azdotui.config.settings import APPROVALS_INTERVAL
+from azdotui.events.bus import ApprovalsUpdated, ProjectSelected
+from azdotui.utils.metrics import metrics
+from azdotui.utils.run_history import format_duration
+from dateutil import parser
+
+from .base_pane import BasePane
+
+logger = logging.getLogger(__name__)
+
+
+def run_of(approval):
+    """(run id, pipeline name, run name) of the run waiting on `approval`."""
+    pipeline = approval.get('pipeline') or {}
+    owner = pipeline.get('owner') or {}
+    return owner.get('id'), pipeline.get('name', 'Unknown Pipeline'), owner.get('name', '')
+
+
+def is_pending(approval):
+    return (approval.get('status') or '').lower() == 'pending'
+
+
+def waiting_runs(approvals):
+    """Ids of the runs waiting on any of the pending `approvals`."""
+    return frozenset(run_of(approval)[0] for approval in approvals if is_pending(approval))
+
+
+class ApprovalsPane(BasePane):
+    """
+    Full-screen view of the selected project's pending approvals, fetched in
+    one request and grouped under the run waiting on them.
+
+    Selection works like pipelines and folders in the Pipelines pane: Space
+    toggles an approval, or every approval of a run on its header row, and
+    `selected_approvals` holds the chosen approval ids. A and R approve or
+    reject the whole selection in one bulk action.
+    """
+
+    def __init__(self, layout):
+        super().__init__(layout, width_ratio=1, x_start=0)
+        self.title = 'Approvals'
+        self.visible = False
+        self.panel.hide()
+        self.auto_refresh_interval = APPROVALS_INTERVAL
+        self.project_id = None
+        self.approvals = {}  # Approval id -> pending approval
+        self.selected_approvals = set()
+        self.errors = {}  # Approval id -> error of the last bulk action that failed on it
+        layout.events.subscribe(ProjectSelected, self.on_project_selected)
+
+    def on_project_selected(self, event):
+        self.project_id = event.project_id
+        self.approvals = {}
+        self.items = []
+        self.selected_approvals.clear()
+        self.errors.clear()
+
+    def open(self):
+        self.visible = True
+        self.needs_render = True
+
+    def close(self):
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+        self.visible = False
+        self.panel.hide()
+
+    @metrics.timed('pane.approvals.refresh_data')
+    async def refresh_data(self):
+        if not self.visible or not self.project_id:
+            return
+        generation = self.load_generation
+        project_id = self.project_id
+        self.is_loading = not self.approvals
+        self.needs_render = True
+        try:
+            data = await self.layout.azdo_client.get_approvals(project_id)
+            if generation != self.load_generation:
+                return  # Superseded
+            if 'value' not in data:
+                return  # Keep showing the last list
+            self.set_approvals(data['value'])
+            self.layout.events.publish(ApprovalsUpdated(project_id, waiting_runs(self.approvals.values())))
+        finally:
+            if generation == self.load_generation:
+                self.is_loading = False
+                self.needs_render = True
+
+    def set_approvals(self, approvals):
+        """
+        Rebuild the rows: a header per waiting run followed by its approvals.
+        Approvals no longer pending leave the selection.
+        """
+        current = self.items[self.selected_index] if self.items else None
+        self.approvals = {approval['id']: approval for approval in approvals if is_pending(approval)}
+        runs = {}
+        for approval in self.approvals.values():
+            run_id, pipeline_name, run_name = run_of(approval)
+            if run_id not in runs:
+                runs[run_id] = {'run_id': run_id, 'title': f"{pipeline_name} {run_name}".strip(), 'approval_ids': []}
+            runs[run_id]['approval_ids'].append(approval['id'])
+        self.items = []
+        for run in runs.values():
+            self.items.append(run)
+            self.items.extend(self.approvals[approval_id] for approval_id in run['approval_ids'])
+        self.selected_approvals &= self.approvals.keys()
+        self.errors = {key: error for key, error in self.errors.items() if key in self.approvals}
+        key = self.item_key(current) if current else None
+        self.selected_index = next((i for i, item in enumerate(self.items) if self.item_key(item) == key), 0)
+        self.viewport_start = min(self.viewport_start, self.selected_index)
+
+    @staticmethod
+    def item_key(item):
+        return ('run', item['run_id']) if 'approval_ids' in item else ('approval', item['id'])
+
+    @staticmethod
+    def approval_ids(item):
+        return item['approval_ids'] if 'approval_ids' in item else [item['id']]
+
+    def selected_in_order(self):
+        """Selected approval ids in display order."""
+        return [approval_id for approval_id in self.approvals if approval_id in self.selected_approvals]
+
+    def toggle(self, item):
+        approval_ids = self.approval_ids(item)
+        if self.selected_approvals.issuperset(approval_ids):
+            self.selected_approvals.difference_update(approval_ids)
+        else:
+            self.selected_approvals.update(approval_ids)
+        self.needs_render = True
+
+    async def handle_input(self, key):
+        if not self.items:
+            return
+        if key == ord(' '):
+            self.toggle(self.items[self.selected_index])
+        elif key == curses.KEY_RIGHT:
+            self.selected_approvals.update(self.approvals)
+            self.needs_render = True
+        elif key == curses.KEY_LEFT:
+            self.selected_approvals.clear()
+            self.needs_render = True
+
+    async def handle_selection(self):
+        if self.items:
+            self.toggle(self.items[self.selected_index])
+
+    def format_item(self, item):
+        checkbox = '[x]' if self.selected_approvals.issuperset(self.approval_ids(item)) else '[ ]'
+        if 'approval_ids' in item:
+            count = len(item['approval_ids'])
+            return f"{checkbox} {item['title']} ({count} approval{'s' if count != 1 else ''})"
+        approvers = ', '.join(
+            (step.get('assignedApprover') or {}).get('displayName', '?') for step in item.get('steps') or []
+        )
+        text = f"    {checkbox} {item.get('instructions') or 'Approval'}"
+        created = item.get('createdOn')
+        if created:
+            try:
+                text += f" | waiting {format_duration(max(0.0, time.time() - parser.isoparse(created).timestamp()))}"
+            except ValueError:
+                pass
+        if approvers:
+            text += f" | {approvers}"
+        if item['id'] in self.errors:
+            text += f" | failed: {self.errors[item['id']]}"
+        return text
+
+    @metrics.timed('pane.approvals.render')
+    def render(self):
+        if not self.visible:
+            return
+        self.window.erase()
+        self.window.border()
+        self.window.addstr(0, 2, f' {self.title} ', curses.A_BOLD | curses.A_REVERSE)
+        max_y, max_x = self.window.getmaxyx()
+
+        if self.is_loading:
+            self.window.addstr(1, 2, "Loading...", curses.A_DIM)
+        elif not self.items:
+            self.window.addstr(1, 2, "No pending approvals", curses.A_DIM)
+        else:
+            visible_height = max_y - 2  # Minus borders
+            for idx, item in enumerate(self.items[self.viewport_start:self.viewport_start + visible_height]):
+                if idx + self.viewport_start == self.selected_index:
+                    style = curses.A_REVERSE
+                elif 'approval_ids' in item:
+                    style = curses.A_BOLD
+                else:
+                    style = curses.A_NORMAL
+                self.window.addnstr(idx + 1, 2, self.format_item(item), max_x - 4, style)
+            selected = len(self.selected_approvals)
+            self.window.addnstr(max_y - 1, 2, f' {len(self.approvals)} pending, {selected} selected ', max_x - 4)
+
+        self.panel.top()
+        self.panel.show()
+        self.window.noutrefresh()
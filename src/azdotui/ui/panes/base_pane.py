@@ -1,7 +1,10 @@
 # ui/panes/base_pane.py
 
+import asyncio
 import curses
 
+from azdotui.utils.metrics import metrics
+
 
 class BasePane:
     def __init__(self, layout, width_ratio, x_start):
@@ -12,6 +15,7 @@ class BasePane:
         self.panel = None
         self.is_loading = False
         self.needs_render = True
+        self.visible = True
         self.initialize_window()
 
         # Common attributes
@@ -20,6 +24,8 @@ class BasePane:
         self.viewport_start = 0
         self.title = ''
         self.auto_refresh_interval = 0  # Default to no auto-refresh
+        self.load_task = None
+        self.load_generation = 0  # Bumped by every load; results from older generations are dropped
 
     def initialize_window(self):
         max_y, max_x = self.layout.screen.getmaxyx()
@@ -34,18 +40,31 @@ class BasePane:
 
     def navigate(self, direction):
         if direction == 'UP':
-            if self.selected_index > 0:
-                self.selected_index -= 1
-                if self.selected_index < self.viewport_start:
-                    self.viewport_start -= 1
-                self.needs_render = True
+            self.navigate_by(-1)
         elif direction == 'DOWN':
-            if self.selected_index < len(self.items) - 1:
-                self.selected_index += 1
-                max_y = self.window.getmaxyx()[0] - 2  # Minus borders
-                if self.selected_index >= self.viewport_start + max_y:
-                    self.viewport_start += 1
-                self.needs_render = True
+            self.navigate_by(1)
+
+    def navigate_by(self, delta):
+        """
+        Move the cursor `delta` rows (negative is up) in a single step, so a
+        burst of arrow keys costs one cursor move and one redraw.
+        """
+        if not self.items:
+            return
+        index = min(len(self.items) - 1, max(0, self.selected_index + delta))
+        if index == self.selected_index:
+            return
+        self.selected_index = index
+        max_y = self.window.getmaxyx()[0] - 2  # Minus borders
+        if index < self.viewport_start:
+            self.viewport_start = index
+        elif index >= self.viewport_start + max_y:
+            self.viewport_start = index - max_y + 1
+        self.needs_render = True
+        self.cursor_moved()
+
+    def cursor_moved(self):
+        pass  # Subclasses may prefetch data for the item now under the cursor
 
     async def handle_input(self, key):
         pass  # To be implemented by subclasses
@@ -56,3 +75,18 @@ class BasePane:
     async def refresh_data(self):
         pass  # To be implemented by subclasses
 
+    def start_load(self):
+        """
+        Run refresh_data in the background as the pane's only current load.
+        A load still in flight is cancelled and its results are discarded.
+        """
+        self.load_generation += 1
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+            metrics.increment('load.superseded')
+        self.load_task = asyncio.create_task(self.refresh_data())
+        return self.load_task
+
+    def load_in_flight(self):
+        return self.load_task is not None and not self.load_task.done()
+
@@ -3,14 +3,49 @@
 import asyncio
 import curses
 import logging
+import time
 from collections import defaultdict
 
+from azdotui.config.settings import APPROVALS_INTERVAL, BUILDS_BRANCH
+from azdotui.events.bus import (ApprovalsUpdated, BuildChanged, BuildsCancelled, BuildsUpdated, PipelineSelected,
+                                ProjectSelected)
+from azdotui.utils.metrics import metrics
 from dateutil import parser  # Import dateutil.parser
 
+from .approvals_pane import waiting_runs
 from .base_pane import BasePane
 
 logger = logging.getLogger(__name__)
 
+CATEGORIES_ORDER = ['succeeded', 'failed', 'warning', 'queued', 'running']
+BUILDS_PER_CATEGORY = 5
+# Server-side filters for each category, so each query returns exactly the builds the category shows
+CATEGORY_FILTERS = {
+    'succeeded': {'status_filter': 'completed', 'resultFilter': 'succeeded', 'queryOrder': 'finishTimeDescending'},
+    'failed': {'status_filter': 'completed', 'resultFilter': 'failed', 'queryOrder': 'finishTimeDescending'},
+    'warning': {'status_filter': 'completed', 'resultFilter': 'partiallySucceeded,canceled',
+                'queryOrder': 'finishTimeDescending'},
+    'queued': {'status_filter': 'notStarted', 'queryOrder': 'queueTimeDescending'},
+    'running': {'status_filter': 'inProgress', 'queryOrder': 'queueTimeDescending'},
+}
+# Build field each category is ordered by, newest first, matching its query's queryOrder
+CATEGORY_SORT_KEYS = {category: filters['queryOrder'].removesuffix('Descending')
+                      for category, filters in CATEGORY_FILTERS.items()}
+
+
+def category_queries(project_id, pipeline_id=None, branch_name=BUILDS_BRANCH):
+    """
+    (category, get_builds call) pairs that fetch what the Builds pane shows,
+    as (method, args, kwargs) so they can also be handed to the prefetcher.
+    """
+    return [
+        (category, ('get_builds', (project_id,),
+                    dict(CATEGORY_FILTERS[category], top=BUILDS_PER_CATEGORY,
+                         definitions=pipeline_id, branchName=branch_name)))
+        for category in CATEGORIES_ORDER
+    ]
+
+
 class BuildsPane(BasePane):
     def __init__(self, layout):
         super().__init__(layout, width_ratio=1/3, x_start=2/3)
@@ -20,75 +55,151 @@ class BuildsPane(BasePane):
         self.project_id = None
         self.pipeline_id = None
         self.builds_by_category = defaultdict(list)
+        self.awaiting_approval = frozenset()  # Ids of builds with a pending approval
+        self.approvals_due = float('-inf')  # Monotonic time the project's approvals are next fetched
+        self.approvals_failures = 0  # Failed approvals fetches in a row
+        layout.events.subscribe(ApprovalsUpdated, self.on_approvals_updated)
+        layout.events.subscribe(ProjectSelected, lambda event: self.load_builds(event.project_id))
+        layout.events.subscribe(PipelineSelected, lambda event: self.load_builds_for_pipeline(event.project_id, event.pipeline_id))
+        layout.events.subscribe(BuildChanged, lambda event: self.apply_build_update(event.project_id, event.build))
+        layout.events.subscribe(BuildsCancelled, self.on_builds_cancelled)
 
-    async def load_builds(self, project_id):
+    def load_builds(self, project_id):
         self.project_id = project_id
+        self.awaiting_approval = frozenset()
+        self.approvals_due = float('-inf')  # Fetch the new project's approvals with its builds
+        self.approvals_failures = 0
         self.pipeline_id = None  # Reset pipeline filter
-        await self.refresh_data()
+        return self.start_load()
 
-    async def load_builds_for_pipeline(self, project_id, pipeline_id):
+    def load_builds_for_pipeline(self, project_id, pipeline_id):
         self.project_id = project_id
         self.pipeline_id = pipeline_id
-        await self.refresh_data()
+        return self.start_load()
 
+    @metrics.timed('pane.builds.refresh_data')
     async def refresh_data(self):
+        generation = self.load_generation
         self.is_loading = True
         self.needs_render = True
         try:
             if self.project_id:
-                if self.pipeline_id:
-                    # Fetch builds for specific pipeline
-                    data = await self.layout.azdo_client.get_build_status(self.project_id, self.pipeline_id)
-                else:
-                    # Fetch builds for the project
-                    data = await self.layout.azdo_client.get_all_builds(self.project_id)
-                builds = data.get('value', [])
-                # Categorize builds
-                self.builds_by_category = self.categorize_builds(builds)
-                self.items = builds  # For navigation purposes
-                self.selected_index = 0
-                self.viewport_start = 0
+                # One query per category, optionally for a single pipeline
+                queries = category_queries(self.project_id, self.pipeline_id)
+                client = self.layout.azdo_client
+                calls = [getattr(client, method)(*args, **kwargs) for _, (method, args, kwargs) in queries]
+                # Pending approvals mark the builds waiting on them; they change less often than builds
+                fetch_approvals = time.monotonic() >= self.approvals_due
+                if fetch_approvals:
+                    calls.append(client.get_approvals(self.project_id))
+                results = await asyncio.gather(*calls)
+                if generation != self.load_generation:
+                    return  # Superseded by a newer selection
+                if fetch_approvals:
+                    self.publish_approvals(results.pop())
+                self.builds_by_category = {
+                    category: data.get('value', [])[:BUILDS_PER_CATEGORY]
+                    for (category, _), data in zip(queries, results)
+                }
+                self.set_items(self.displayed_builds())
                 self.layout.full_render_needed = True
+                self.layout.events.publish(BuildsUpdated(self.project_id, self.pipeline_id, self.builds_by_category))
         except asyncio.CancelledError:
             raise  # Re-raise to allow task cancellation
         except Exception as e:
-            logger.error(f"Error loading builds: {e}", exc_info=True)
-            # Ensure builds_by_category is set to an empty defaultdict
-            self.builds_by_category = defaultdict(list)
-            self.items = []
+            if generation == self.load_generation:
+                logger.error(f"Error loading builds: {e}", exc_info=True)
+                # Ensure builds_by_category is set to an empty defaultdict
+                self.builds_by_category = defaultdict(list)
+                self.items = []
         finally:
-            self.is_loading = False
-            self.needs_render = True  # Ensure the pane is re-rendered
-
-    def categorize_builds(self, builds):
-        categories = {
-            'succeeded': [],
-            'failed': [],
-            'warning': [],
-            'queued': [],
-            'running': []
-        }
-        for build in builds:
-            status = build.get('status', '').lower()
-            result = build.get('result', '').lower()
-            if status == 'completed':
-                if result == 'succeeded':
-                    categories['succeeded'].append(build)
-                elif result == 'failed':
-                    categories['failed'].append(build)
-                elif result == 'partiallysucceeded':
-                    categories['warning'].append(build)
-                else:
-                    categories['warning'].append(build)
-            elif status == 'inprogress':
-                categories['running'].append(build)
-            elif status == 'notstarted':
-                categories['queued'].append(build)
+            if generation == self.load_generation:
+                self.is_loading = False
+                self.needs_render = True  # Ensure the pane is re-rendered
+
+    def displayed_builds(self):
+        """
+        Builds in the order they are drawn, which is also the navigation order.
+        """
+        displayed = []
+        for category in CATEGORIES_ORDER:
+            displayed.extend(self.builds_by_category.get(category, [])[:BUILDS_PER_CATEGORY])
+        return displayed
+
+    def set_items(self, builds):
+        # Keep the cursor on the same build across refreshes
+        selected_id = self.items[self.selected_index].get('id') if self.items and self.selected_index < len(self.items) else None
+        self.items = builds
+        self.selected_index = next((i for i, build in enumerate(builds) if build.get('id') == selected_id), 0)
+        self.viewport_start = 0
+
+    def category_for(self, build):
+        status = (build.get('status') or '').lower()
+        result = (build.get('result') or '').lower()
+        if status == 'completed':
+            if result == 'succeeded':
+                return 'succeeded'
+            elif result == 'failed':
+                return 'failed'
             else:
-                # You can add other status handling if needed
-                pass
-        return categories
+                return 'warning'  # partiallySucceeded, canceled
+        elif status == 'inprogress':
+            return 'running'
+        elif status == 'notstarted':
+            return 'queued'
+        # You can add other status handling if needed
+        return None
 
+    def apply_build_update(self, project_id, update):
+        """
+        Apply a single pushed build change (e.g. from a service hook) without
+        refetching. Only the affected category is touched, and it keeps the
+        order and length its query would have returned.
+        """
+        if project_id != self.project_id:
+            return
+        if self.pipeline_id and update.get('definition', {}).get('id') not in (None, self.pipeline_id):
+            return
+        build = next((b for category in self.builds_by_category.values() for b in category if b.get('id') == update['id']), None)
+        # Shown builds already match the branch filter; others must say they do
+        if BUILDS_BRANCH and (update.get('sourceBranch') or (build or {}).get('sourceBranch')) != BUILDS_BRANCH:
+            return
+        if build:
+            self.builds_by_category[self.category_for(build)].remove(build)
+            build.update({key: value for key, value in update.items() if value is not None})
+        else:
+            build = update
+        category = self.category_for(build)
+        if category:
+            builds = self.builds_by_category.setdefault(category, [])
+            key = CATEGORY_SORT_KEYS[category]
+            position = next((i for i, b in enumerate(builds) if (b.get(key) or '') <= (build.get(key) or '')), len(builds))
+            builds.insert(position, build)
+            del builds[BUILDS_PER_CATEGORY:]
+        self.set_items(self.displayed_builds())
+        self.needs_render = True
+
+    def publish_approvals(self, data):
+        if 'value' not in data:
+            # Keep the last marks and back off, up to 8 intervals, rather than retrying on every refresh
+            self.approvals_failures += 1
+            self.approvals_due = time.monotonic() + APPROVALS_INTERVAL * min(2 ** self.approvals_failures, 8)
+            return
+        self.approvals_failures = 0
+        self.approvals_due = time.monotonic() + APPROVALS_INTERVAL
+        self.layout.events.publish(ApprovalsUpdated(self.project_id, waiting_runs(data['value'])))
+
+    def on_approvals_updated(self, event):
+        if event.project_id == self.project_id:
+            self.awaiting_approval = event.run_ids
+            self.needs_render = True
+
+    def on_builds_cancelled(self, event):
+        # Drop the cancelled builds from view now; the next refresh shows their final state
+        for build_id in event.build_ids:
+            self.apply_build_update(event.project_id, {'id': build_id, 'status': 'cancelling'})
+
+    @metrics.timed('pane.builds.render')
     def render(self):
         if not self.needs_render:
             return
@@ -102,8 +213,8 @@ class BuildsPane(BasePane):
             self.window.addstr(1, 2, "Loading...", curses.A_DIM)
         else:
             y = 1
-            categories_order = ['succeeded', 'failed', 'warning', 'queued', 'running']
-            for category in categories_order:
+            selected_build = self.items[self.selected_index] if self.layout.active_pane == self and self.items else None
+            for category in CATEGORIES_ORDER:
                 builds = self.builds_by_category.get(category, [])
                 if builds:
                     # Display category as a header
@@ -111,10 +222,11 @@ class BuildsPane(BasePane):
                     y += 1
                     count = 0
                     for build in builds:
-                        if y >= max_y - 1 or count >= 5:
+                        if y >= max_y - 1 or count >= BUILDS_PER_CATEGORY:
                             break  # Prevent drawing outside the window or exceeding 5 builds per category
                         display_text = self.format_item(build)
-                        self.window.addnstr(y, 2, display_text, max_x - 4)
+                        style = curses.A_REVERSE if build is selected_build else curses.A_NORMAL
+                        self.window.addnstr(y, 2, display_text, max_x - 4, style)
                         y += 1
                         count +=1
                 if y >= max_y - 1:
@@ -136,15 +248,16 @@ class BuildsPane(BasePane):
             except Exception as e:
                 logger.error(f"Error parsing queue_time '{queue_time}': {e}")
                 queue_time_formatted = queue_time  # Fallback to original string
-        return f"{pipeline_name} #{build_number}: {result_text} at {queue_time_formatted}"
-
-    def navigate(self, direction):
-        # Navigation logic can be implemented if needed
-        pass
+        text = f"{pipeline_name} #{build_number}: {result_text} at {queue_time_formatted}"
+        if item.get('id') in self.awaiting_approval:
+            text += " (awaiting approval)"
+        return text
 
     async def handle_selection(self):
-        # Handle selection if needed
-        pass
+        if not self.items:
+            return
+        # Open the log viewer for the highlighted build
+        await self.layout.open_build_log(self.project_id, self.items[self.selected_index])
 
     async def handle_input(self, key):
         if key == ord('c'):
@@ -0,0 +1,177 @@
+# ui/panes/log_pane.py
+
+import asyncio
+import curses
+import logging
+from collections import deque
+from itertools import islice
+
+from azdotui.config.settings import LOG_BUFFER_LINES
+from azdotui.events.bus import BuildChanged
+from azdotui.utils.metrics import metrics
+
+from .base_pane import BasePane
+
+logger = logging.getLogger(__name__)
+
+class LogPane(BasePane):
+    def __init__(self, layout):
+        super().__init__(layout, width_ratio=1, x_start=0)
+        self.title = 'Log'
+        self.visible = False
+        self.panel.hide()
+        self.auto_refresh_interval = 2  # Tail running builds every 2 seconds
+        self.project_id = None
+        self.build = None
+        self.lines = deque(maxlen=LOG_BUFFER_LINES)  # Raw bytes, decoded only when drawn
+        self.log_offsets = {}  # log id -> lines already fetched
+        self.timeline = {}  # record id -> timeline record
+        self.timeline_change_id = None
+        self.scroll = 0  # Lines scrolled up from the tail; 0 follows new output
+        self.finished = False
+        # One fetch at a time: two concurrent fetches would both read from the same offsets and append the lines twice
+        self.refresh_lock = asyncio.Lock()
+        layout.events.subscribe(BuildChanged, self.on_build_changed)
+
+    def on_build_changed(self, event):
+        # Fetch straight away instead of waiting for the next tail interval
+        if self.visible and self.build and event.build.get('id') == self.build['id'] and not self.load_in_flight():
+            self.finished = False
+            self.start_load()
+
+    def open(self, project_id, build):
+        self.project_id = project_id
+        self.build = build
+        self.title = f"Log: {build.get('definition', {}).get('name', 'Unknown Pipeline')} #{build.get('buildNumber', 'N/A')}"
+        self.lines.clear()
+        self.log_offsets = {}
+        self.timeline = {}
+        self.timeline_change_id = None
+        self.scroll = 0
+        self.finished = False
+        self.visible = True
+        self.needs_render = True
+
+    def close(self):
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+        self.visible = False
+        self.build = None
+        self.lines.clear()
+        self.panel.hide()
+
+    @metrics.timed('pane.logs.refresh_data')
+    async def refresh_data(self):
+        async with self.refresh_lock:
+            await self.fetch_new_lines()
+
+    async def fetch_new_lines(self):
+        if not self.visible or not self.build or self.finished:
+            return
+        client = self.layout.azdo_client
+        build_id = self.build['id']
+        self.is_loading = not self.lines
+        try:
+            build, timeline, logs = await asyncio.gather(
+                client.get_build(self.project_id, build_id),
+                client.get_build_timeline(self.project_id, build_id, self.timeline_change_id),
+                client.get_build_logs(self.project_id, build_id),
+            )
+            if not self.build or self.build['id'] != build_id:
+                return  # Closed or switched to another build while fetching
+            if build:
+                self.build = build
+            for record in timeline.get('records', []):
+                self.timeline[record['id']] = record
+            self.timeline_change_id = timeline.get('changeId', self.timeline_change_id)
+
+            complete = True
+            for log in sorted(logs.get('value', []), key=lambda log: log['id']):
+                if not self.build or self.build['id'] != build_id:
+                    return
+                line_count = log.get('lineCount', 0)
+                offset = self.log_offsets.get(log['id'], 0)
+                if line_count <= offset:
+                    continue
+                if log['id'] not in self.log_offsets:
+                    self.append_line(f"===== {self.step_name(log['id'])} =====".encode())
+                    # Only the tail fits in the buffer, so skip what would be dropped anyway
+                    offset = max(0, line_count - self.lines.maxlen)
+                self.log_offsets[log['id']] = offset
+                async for line in client.iter_build_log_lines(self.project_id, build_id, log['id'], offset + 1):
+                    self.append_line(line)
+                    # Per line, so a fetch cancelled part way through resumes after the last line shown
+                    self.log_offsets[log['id']] += 1
+                complete = complete and self.log_offsets[log['id']] >= line_count
+            # Stop polling once the build is over and every log has been read
+            self.finished = self.build.get('status', '').lower() == 'completed' and complete
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading build log: {e}", exc_info=True)
+        finally:
+            self.is_loading = False
+            self.needs_render = True
+
+    def append_line(self, line):
+        self.lines.append(line)
+        if self.scroll:
+            # Keep a scrolled-up view pinned to the same lines while new output arrives
+            self.scroll = min(self.scroll + 1, len(self.lines) - 1)
+
+    def step_name(self, log_id):
+        for record in self.timeline.values():
+            if (record.get('log') or {}).get('id') == log_id:
+                return record.get('name', f'Log {log_id}')
+        return f'Log {log_id}'
+
+    def current_step(self):
+        running = [r for r in self.timeline.values() if r.get('state') == 'inProgress' and r.get('type') == 'Task']
+        return running[0].get('name') if running else None
+
+    def summary(self):
+        status = self.build.get('status', 'N/A')
+        result = self.build.get('result')
+        text = f"{status}: {result}" if result else status
+        step = self.current_step()
+        if step:
+            text += f" | {step}"
+        if self.scroll:
+            text += f" | scrolled {self.scroll} lines up"
+        return text
+
+    @metrics.timed('pane.logs.render')
+    def render(self):
+        if not self.visible:
+            return
+        self.window.erase()
+        self.window.border()
+        self.window.addstr(0, 2, f' {self.title} ', curses.A_BOLD | curses.A_REVERSE)
+        max_y, max_x = self.window.getmaxyx()
+
+        if self.is_loading:
+            self.window.addstr(1, 2, "Loading...", curses.A_DIM)
+        elif self.build:
+            self.window.addnstr(1, 2, self.summary(), max_x - 4, curses.A_BOLD)
+            visible_height = max_y - 3  # Minus borders and summary line
+            end = len(self.lines) - self.scroll
+            start = max(0, end - visible_height)
+            # Only the visible window of the ring buffer is decoded
+            for y, line in enumerate(islice(self.lines, start, end), start=2):
+                self.window.addnstr(y, 2, line.decode('utf-8', errors='replace'), max_x - 4)
+
+        self.panel.top()
+        self.panel.show()
+        self.window.noutrefresh()
+
+    def navigate(self, direction):
+        page = self.window.getmaxyx()[0] - 3
+        self.navigate_by({'UP': -1, 'DOWN': 1, 'PAGE_UP': -page, 'PAGE_DOWN': page}.get(direction, 0))
+
+    def navigate_by(self, delta):
+        # Moving down scrolls towards the tail
+        max_scroll = max(0, len(self.lines) - (self.window.getmaxyx()[0] - 3))
+        scroll = min(max_scroll, max(0, self.scroll - delta))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self.needs_render = True
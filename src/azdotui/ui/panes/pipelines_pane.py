@@ -1,11 +1,18 @@
 # ui/panes/pipelines_pane.py
 
+import asyncio
 import curses
 import logging
 
+from azdotui.config.settings import OFFLOAD_MIN_PIPELINES
+from azdotui.events.bus import BuildChanged, BuildsUpdated, PipelineSelected, ProjectSelected
+from azdotui.utils.metrics import metrics
+from azdotui.utils.offload import offload
+from azdotui.utils.run_history import RunHistory
 from azdotui.utils.tree import build_tree
 
 from .base_pane import BasePane
+from .builds_pane import category_queries
 
 logger = logging.getLogger(__name__)
 
@@ -22,32 +29,63 @@ class PipelinesPane(BasePane):
         self.needs_render = True
         self.selected_index = 0
         self.viewport_start = 0
-
-    async def load_pipelines(self, project_id):
+        self.histories = {}  # (project id, pipeline id) -> RunHistory
+        self.history_tasks = {}  # (project id, pipeline id) -> update in flight
+        layout.events.subscribe(ProjectSelected, lambda event: self.load_pipelines(event.project_id))
+        layout.events.subscribe(BuildsUpdated, self.on_builds_updated)
+        layout.events.subscribe(BuildChanged, lambda event: self.refresh_histories(event.project_id, [event.build]))
+
+    def load_pipelines(self, project_id):
+        if project_id != self.project_id:
+            # Histories are only shown for the selected project; drop the previous one's
+            for task in self.history_tasks.values():
+                task.cancel()
+            self.histories = {}
+            self.history_tasks = {}
         self.project_id = project_id
-        await self.refresh_data()
+        return self.start_load()
 
+    @metrics.timed('pane.pipelines.refresh_data')
     async def refresh_data(self):
         if not self.project_id:
             return
+        generation = self.load_generation
         self.is_loading = True
         self.needs_render = True
         try:
             data = await self.layout.azdo_client.get_pipelines(self.project_id)
-            self.pipelines = data.get('value', [])
-            self.tree_root = build_tree(self.pipelines)
-            self.items = self.flatten_tree(self.tree_root)
+            if generation != self.load_generation:
+                return  # Superseded by a newer selection
+            pipelines = data.get('value', [])
+            tree_root, items = await offload(self.prepare_tree, pipelines,
+                                             size=len(pipelines), threshold=OFFLOAD_MIN_PIPELINES)
+            if generation != self.load_generation:
+                return
+            # Swap everything in together so render never sees a mix of projects
+            self.pipelines, self.tree_root, self.items = pipelines, tree_root, items
             self.selected_index = 0
             self.viewport_start = 0
             self.layout.full_render_needed = True
         except Exception as e:
-            logger.error(f"Error loading pipelines: {e}", exc_info=True)
-            self.items = []
-            self.pipelines = []
-            self.tree_root = None
+            if generation == self.load_generation:
+                logger.error(f"Error loading pipelines: {e}", exc_info=True)
+                self.items = []
+                self.pipelines = []
+                self.tree_root = None
         finally:
-            self.is_loading = False
-            self.needs_render = True
+            if generation == self.load_generation:
+                self.is_loading = False
+                self.needs_render = True
+
+    def prepare_tree(self, pipelines):
+        """
+        Build the folder tree and its initial flattened rows. Runs on a worker
+        thread for large projects, so it only creates new objects.
+        """
+        tree_root = build_tree(pipelines)
+        with metrics.timer('pipelines.flatten_tree'):
+            items = self.flatten_tree(tree_root)
+        return tree_root, items
 
     def flatten_tree(self, node, level=0):
         """
@@ -69,6 +107,7 @@ class PipelinesPane(BasePane):
                 flattened.extend(self.flatten_tree(child, level + 1))
         return flattened
 
+    @metrics.timed('pane.pipelines.render')
     def render(self):
         self.window.erase()
         self.window.border()
@@ -105,6 +144,11 @@ class PipelinesPane(BasePane):
                     line = f"{prefix}{checkbox} {node.name}"
                 self.window.addnstr(y, 2, line, max_x - 4, style)
 
+            # Run statistics for the pipeline under the cursor, drawn on the bottom border
+            history = self.history_under_cursor()
+            if history:
+                self.window.addnstr(max_y - 1, 2, f' {history.summary(max_x // 4)} ', max_x - 4)
+
         self.panel.top()
         self.panel.show()
         self.window.noutrefresh()
@@ -134,6 +178,61 @@ class PipelinesPane(BasePane):
         elif key == curses.KEY_RIGHT:
             await self.expand_node(node)
 
+    def cursor_moved(self):
+        node = self.items[self.selected_index]
+        if node.is_folder:
+            self.layout.prefetcher.cancel()
+        else:
+            self.layout.prefetcher.schedule(*[call for _, call in category_queries(self.project_id, node.pipeline_id)])
+
+    def history_under_cursor(self):
+        if not self.items:
+            return None
+        node = self.items[self.selected_index]
+        return None if node.is_folder else self.histories.get((self.project_id, node.pipeline_id))
+
+    def load_history(self, pipeline_id):
+        """
+        Bring the pipeline's run history up to date in the background. Only
+        runs newer than those already held are fetched.
+        """
+        key = (self.project_id, pipeline_id)
+        history = self.histories.get(key)
+        if history is None:
+            history = self.histories[key] = RunHistory(self.project_id, pipeline_id)
+        task = self.history_tasks.get(key)
+        if task is None or task.done():
+            self.history_tasks[key] = asyncio.create_task(self.update_history(history))
+
+    def on_builds_updated(self, event):
+        self.refresh_histories(event.project_id, [build for builds in event.builds_by_category.values() for build in builds])
+
+    def refresh_histories(self, project_id, builds):
+        """
+        Update the loaded histories of pipelines with a build among `builds`
+        that finished after their newest run, so statistics follow new runs
+        without refetching whole histories.
+        """
+        if project_id != self.project_id:
+            return
+        for build in builds:
+            pipeline_id = (build.get('definition') or {}).get('id')
+            history = self.histories.get((project_id, pipeline_id))
+            if (history and (build.get('status') or '').lower() == 'completed'
+                    and history.finished_since(build.get('finishTime'))):
+                self.load_history(pipeline_id)
+
+    async def update_history(self, history):
+        try:
+            added = await history.update(self.layout.azdo_client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading run history for pipeline {history.pipeline_id}: {e}", exc_info=True)
+            return
+        if added:
+            self.needs_render = True
+
     async def handle_selection(self):
         node = self.items[self.selected_index]
         if node.is_folder:
@@ -142,8 +241,8 @@ class PipelinesPane(BasePane):
             self.items = self.flatten_tree(self.tree_root)
             self.needs_render = True
         else:
-            # Load builds for the selected pipeline
-            await self.layout.panes['builds'].load_builds_for_pipeline(self.project_id, node.pipeline_id)
+            self.layout.events.publish(PipelineSelected(self.project_id, node.pipeline_id))
+            self.load_history(node.pipeline_id)
 
     async def collapse_node(self, node):
         if node.is_folder and node.expanded:
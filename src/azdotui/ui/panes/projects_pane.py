@@ -1,9 +1,14 @@
 # ui/panes/projects_pane.py
 
+import asyncio
 import curses
 import logging
 
+from azdotui.events.bus import ProjectSelected
+from azdotui.utils.metrics import metrics
+
 from .base_pane import BasePane
+from .builds_pane import category_queries
 
 logger = logging.getLogger(__name__)
 
@@ -12,30 +17,80 @@ class ProjectsPane(BasePane):
         super().__init__(layout, width_ratio=1/3, x_start=0)
         self.title = 'Projects'
         self.projects = []
+        self.projects_by_org = {}  # Organization -> projects, once loaded
+        self.unavailable_orgs = set()
+        self.selected_project = None  # (organization, project id) last selected
         self.items = []
         self.selected_index = 0
         self.viewport_start = 0
         self.is_loading = False
         self.needs_render = True
 
+    @property
+    def grouped(self):
+        return len(self.layout.clients) > 1
+
+    @metrics.timed('pane.projects.refresh_data')
     async def refresh_data(self):
+        """
+        Load every organization's projects concurrently. Each organization is
+        shown as soon as its projects arrive, so a slow or throttled one
+        doesn't hold up the others, and the first project is selected once
+        there is one.
+        """
         self.is_loading = True
         self.needs_render = True
         try:
-            data = await self.layout.azdo_client.get_projects()
-            self.projects = data.get('value', [])
-            self.items = self.projects
-            self.selected_index = 0
-            self.viewport_start = 0
-            self.layout.full_render_needed = True
-        except Exception as e:
-            logger.error(f"Error loading projects: {e}", exc_info=True)
-            self.items = []
-            self.projects = []
+            await asyncio.gather(*[self.load_organization(org, client) for org, client in self.layout.clients.items()])
         finally:
             self.is_loading = False
             self.needs_render = True
 
+    async def load_organization(self, org, client):
+        try:
+            data = await client.get_projects()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading projects for {org}: {e}", exc_info=True)
+            data = {}
+        if 'value' in data:
+            self.projects_by_org[org] = data['value']
+            self.unavailable_orgs.discard(org)
+        else:
+            self.unavailable_orgs.add(org)  # get_projects returns {} on failure; keep what was shown before
+        self.set_items()
+        if self.selected_project is None:
+            await self.handle_selection()
+
+    def set_items(self):
+        """
+        Rebuild the list in configured organization order, with a header row
+        per organization when there are several, keeping the cursor on the
+        same row.
+        """
+        current = self.items[self.selected_index] if self.items else None
+        self.items = []
+        self.projects = []
+        for org in self.layout.clients:
+            if self.grouped:
+                self.items.append({'organization': org, 'header': True})
+            for project in self.projects_by_org.get(org, []):
+                project = dict(project, organization=org)
+                self.items.append(project)
+                self.projects.append(project)
+        key = self.item_key(current) if current else None
+        self.selected_index = next((i for i, item in enumerate(self.items) if self.item_key(item) == key),
+                                   next((i for i, item in enumerate(self.items) if not item.get('header')), 0))
+        self.viewport_start = min(self.viewport_start, self.selected_index)
+        self.layout.full_render_needed = True
+        self.needs_render = True
+
+    @staticmethod
+    def item_key(item):
+        return item['organization'], item.get('id')
+
+    @metrics.timed('pane.projects.render')
     def render(self):
         self.window.erase()
         self.window.border()
@@ -49,7 +104,7 @@ class ProjectsPane(BasePane):
         self.window.addstr(0, 2, f' {self.title} ', title_style)
         max_y, max_x = self.window.getmaxyx()
 
-        if self.is_loading:
+        if self.is_loading and not self.items:
             self.window.addstr(1, 2, "Loading...", curses.A_DIM)
         else:
             visible_height = max_y - 2  # Minus borders
@@ -57,6 +112,8 @@ class ProjectsPane(BasePane):
                 y = idx + 1
                 if idx + self.viewport_start == self.selected_index:
                     style = curses.A_REVERSE
+                elif item.get('header'):
+                    style = curses.A_BOLD
                 else:
                     style = curses.A_NORMAL
                 self.window.addnstr(y, 2, self.format_item(item), max_x - 4, style)
@@ -66,16 +123,38 @@ class ProjectsPane(BasePane):
         self.window.noutrefresh()
 
     def format_item(self, item):
-        return item['name'][:self.window.getmaxyx()[1] - 4]
+        if item.get('header'):
+            org = item['organization']
+            if org in self.unavailable_orgs:
+                status = ' (unavailable)'
+            elif org not in self.projects_by_org:
+                status = ' (loading)'
+            else:
+                status = ''
+            return f"== {org}{status} =="
+        name = f"  {item['name']}" if self.grouped else item['name']
+        return name[:self.window.getmaxyx()[1] - 4]
+
+    def cursor_moved(self):
+        item = self.items[self.selected_index]
+        if item.get('header'):
+            self.layout.prefetcher.cancel()
+            return
+        project_id = item['id']
+        self.layout.prefetcher.schedule(
+            ('get_pipelines', (project_id,), {}),
+            *[call for _, call in category_queries(project_id)],
+            client=self.layout.clients[item['organization']]
+        )
 
     async def handle_selection(self):
-        if not self.items:
+        if not self.items or self.items[self.selected_index].get('header'):
             return
         project = self.items[self.selected_index]
         project_id = project['id']
-        self.layout.status_bar.set_message(f"Selected Project: {project['name']}")
-        # Load pipelines for the selected project
-        await self.layout.panes['pipelines'].load_pipelines(project_id)
-        # Load builds for the selected project
-        await self.layout.panes['builds'].load_builds(project_id)
-
+        org = project['organization']
+        self.selected_project = self.item_key(project)
+        # Switch clients before anyone reacts to the selection
+        self.layout.use_organization(org)
+        self.layout.status_bar.set_message(f"Selected Project: {project['name']}" + (f" ({org})" if self.grouped else ''))
+        self.layout.events.publish(ProjectSelected(project_id, project['name'], org))
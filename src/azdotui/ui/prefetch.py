@@ -0,0 +1,73 @@
+# ui/prefetch.py
+
+import asyncio
+import time
+from collections import deque
+
+from azdotui.config.logger import logger
+from azdotui.config.settings import PREFETCH_BUDGET, PREFETCH_DELAY
+from azdotui.utils.debounce import debounce
+from azdotui.utils.metrics import metrics
+
+
+class Prefetcher:
+    """
+    Warms the client for the item under the cursor once the cursor has rested
+    on it for `delay` seconds, so selecting it shows data without waiting on
+    a round trip. Moving the cursor again cancels the prefetch.
+
+    Only the item under the cursor is prefetched, nothing starts while a pane
+    is loading, and at most `budget` items are prefetched per minute, so
+    prefetching stays out of the way of requests the user actually made.
+    """
+
+    def __init__(self, layout, delay=PREFETCH_DELAY, budget=PREFETCH_BUDGET):
+        self.layout = layout
+        self.budget = budget
+        self.started = deque()  # Start times of prefetches within the last minute
+        self.tasks = set()
+        self.run = debounce(delay)(self.prefetch)
+
+    def schedule(self, *calls, client=None):
+        """
+        Prefetch the (method, args, kwargs) client calls for one item,
+        replacing whatever was scheduled before. `client` defaults to the
+        selected organization's.
+        """
+        if self.budget <= 0:
+            return
+        task = asyncio.create_task(self.run(calls, client))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def cancel(self):
+        self.run.cancel()
+
+    def foreground_busy(self):
+        return any(pane.load_in_flight() for pane in self.layout.panes.values())
+
+    def take_budget(self):
+        now = time.monotonic()
+        while self.started and now - self.started[0] > 60:
+            self.started.popleft()
+        if len(self.started) >= self.budget:
+            return False
+        self.started.append(now)
+        return True
+
+    async def prefetch(self, calls, client=None):
+        if self.foreground_busy():
+            metrics.increment('prefetch.skipped.busy')
+            return
+        if not self.take_budget():
+            metrics.increment('prefetch.skipped.budget')
+            return
+        metrics.increment('prefetch.started')
+        client = client or self.layout.azdo_client
+        results = await asyncio.gather(
+            *[client.prefetch(method, *args, **kwargs) for method, args, kwargs in calls],
+            return_exceptions=True
+        )
+        for (method, args, kwargs), result in zip(calls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Prefetch of {method}{args} failed: {result}")
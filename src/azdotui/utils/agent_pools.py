@@ -0,0 +1,77 @@
+# utils/agent_pools.py
+
+import time
+
+from dateutil import parser
+
+
+class PoolCounters:
+    """
+    Agent and job counts for one agent pool. Agent and job request lists are
+    reduced to these numbers as soon as they arrive and then dropped, so the
+    Agent Pools view holds and draws one small row per pool however many
+    agents and jobs there are.
+
+    Agent counts are None until the pool's agents have been fetched; hosted
+    pools never report them.
+    """
+
+    __slots__ = ('organization', 'pool_id', 'name', 'hosted', 'agents', 'online', 'busy',
+                 'queued', 'running', 'oldest_queued')
+
+    def __init__(self, organization, pool):
+        self.organization = organization
+        self.pool_id = pool['id']
+        self.name = pool.get('name', str(pool['id']))
+        self.hosted = bool(pool.get('isHosted'))
+        self.agents = self.online = self.busy = None
+        self.queued = self.running = 0
+        self.oldest_queued = None  # queueTime of the longest-waiting job
+
+    def update_agents(self, agents):
+        """Recount agents. Returns True if any count changed."""
+        enabled = [agent for agent in agents if agent.get('enabled', True)]
+        online = [agent for agent in enabled if (agent.get('status') or '').lower() == 'online']
+        counts = (len(enabled), len(online), sum(1 for agent in online if agent.get('assignedRequest')))
+        if counts == (self.agents, self.online, self.busy):
+            return False
+        self.agents, self.online, self.busy = counts
+        return True
+
+    def update_jobs(self, requests):
+        """Recount queued and running job requests. Returns True if any count changed."""
+        queued = running = 0
+        oldest = None
+        for request in requests:
+            if request.get('finishTime'):
+                continue
+            if request.get('assignTime') or request.get('reservedAgent'):
+                running += 1
+            else:
+                queued += 1
+                queue_time = request.get('queueTime')
+                if queue_time and (oldest is None or queue_time < oldest):
+                    oldest = queue_time
+        counts = (queued, running, oldest)
+        if counts == (self.queued, self.running, self.oldest_queued):
+            return False
+        self.queued, self.running, self.oldest_queued = counts
+        return True
+
+    @property
+    def idle(self):
+        return None if self.online is None else self.online - self.busy
+
+    @property
+    def saturated(self):
+        """Jobs are waiting and no online agent is free to take them."""
+        return self.queued > 0 and (self.idle is None or self.idle <= 0)
+
+    def longest_wait(self, now=None):
+        """Seconds the oldest queued job has waited, or None."""
+        if not self.oldest_queued:
+            return None
+        try:
+            return max(0.0, (now or time.time()) - parser.isoparse(self.oldest_queued).timestamp())
+        except ValueError:
+            return None
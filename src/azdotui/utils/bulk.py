@@ -0,0 +1,32 @@
+# utils/bulk.py
+
+import asyncio
+
+from azdotui.config.settings import BULK_CONCURRENCY
+
+
+async def run_bounded(items, fn, limit=BULK_CONCURRENCY):
+    """
+    Run `fn(item)` for every item with at most `limit` calls in flight.
+
+    Yields (item, result, error) tuples in completion order; a failing call
+    yields its exception instead of stopping the batch.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item):
+        async with semaphore:
+            try:
+                return item, await fn(item), None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                return item, None, e
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
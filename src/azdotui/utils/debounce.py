@@ -4,20 +4,31 @@ import asyncio
 
 
 def debounce(wait):
+    """
+    Delay calls to an async function until `wait` seconds pass without another
+    call. A new call cancels the previous one, even if it is already running,
+    so only the latest call completes. `debounced.cancel()` drops a pending call.
+    """
     def decorator(fn):
         last_call = None
 
+        async def call_later(args, kwargs):
+            await asyncio.sleep(wait)
+            await fn(*args, **kwargs)
+
         async def debounced(*args, **kwargs):
             nonlocal last_call
-            if last_call:
-                last_call.cancel()
-            last_call = asyncio.create_task(asyncio.sleep(wait))
+            cancel()
+            last_call = asyncio.create_task(call_later(args, kwargs))
             try:
                 await last_call
-                await fn(*args, **kwargs)
             except asyncio.CancelledError:
                 pass
 
+        def cancel():
+            if last_call and not last_call.done():
+                last_call.cancel()
+
+        debounced.cancel = cancel
         return debounced
     return decorator
-
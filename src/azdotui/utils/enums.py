@@ -6,5 +6,7 @@ from enum import Enum
 class InputAction(Enum):
     TRIGGER_PIPELINES = 'trigger_pipelines'
     CANCEL_BUILDS = 'cancel_builds'
+    APPROVE = 'approve'
+    REJECT = 'reject'
     # Add other actions as needed
 
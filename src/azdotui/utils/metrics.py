@@ -0,0 +1,111 @@
+# utils/metrics.py
+
+import asyncio
+import functools
+import json
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class RollingHistogram:
+    """
+    Keeps the most recent samples of a measurement so percentiles reflect
+    current behaviour rather than the whole session.
+    """
+
+    def __init__(self, window=512):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': max(self.samples) if self.samples else 0.0,
+            'last': self.samples[-1] if self.samples else 0.0,
+        }
+
+
+class Metrics:
+    def __init__(self, window=512):
+        self.window = window
+        self.histograms = defaultdict(lambda: RollingHistogram(self.window))
+        self.counters = defaultdict(int)
+
+    def observe(self, name, value):
+        self.histograms[name].add(value)
+
+    def increment(self, name, amount=1):
+        self.counters[name] += amount
+
+    def record_request(self, endpoint, elapsed, status, nbytes):
+        """
+        Record one HTTP round trip. Latency is stored in milliseconds.
+        """
+        self.observe(f'request.{endpoint}', elapsed * 1000)
+        self.increment(f'request.{endpoint}.status.{status}')
+        self.increment(f'request.{endpoint}.bytes', nbytes)
+
+    def record_cache(self, endpoint, hit):
+        self.increment(f'cache.{endpoint}.{"hit" if hit else "miss"}')
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        """
+        Decorator recording the wall time of a sync or async function under `name`.
+        """
+        def decorator(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.timer(name):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        return {
+            'timestamp': time.time(),
+            'histograms': {name: hist.summary() for name, hist in sorted(self.histograms.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def dump(self, path):
+        with open(path, 'a') as f:
+            f.write(json.dumps(self.snapshot()) + '\n')
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+
+
+# Shared registry used by the client, panes and layout
+metrics = Metrics()
@@ -0,0 +1,44 @@
+# utils/offload.py
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from azdotui.config.settings import OFFLOAD_WORKERS
+from azdotui.utils.metrics import metrics
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=OFFLOAD_WORKERS, thread_name_prefix='azdotui-offload')
+    return _executor
+
+
+async def offload(fn, *args, size=0, threshold=0):
+    """
+    Run fn(*args) on a worker thread when `size` reaches `threshold`, and
+    inline otherwise, since small inputs are quicker to process than to hand
+    off. The UI loop keeps handling input and rendering while the worker
+    runs, since the interpreter switches threads every few milliseconds.
+    Single C calls such as json.loads hold the GIL throughout and gain
+    nothing from this.
+
+    `fn` must not touch state the UI loop reads; return new objects and swap
+    them in once this returns.
+    """
+    if size < threshold:
+        metrics.increment('offload.inline')
+        return fn(*args)
+    metrics.increment('offload.pool')
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args))
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,143 @@
+# utils/run_history.py
+
+import bisect
+import math
+from array import array
+
+from azdotui.config.settings import HISTORY_RUNS
+from dateutil import parser
+
+SUCCEEDED, FAILED, OTHER = 0, 1, 2  # Result codes; OTHER covers partiallySucceeded and canceled
+RESULT_CODES = {'succeeded': SUCCEEDED, 'failed': FAILED}
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f'{hours}h{minutes:02d}m'
+    return f'{minutes}m{seconds:02d}s'
+
+
+class RunHistory:
+    """
+    The last `window` completed runs of one pipeline, kept column-wise in
+    fixed-size ring buffers (run id, start time, duration, result code)
+    rather than as run dicts.
+
+    Duration percentiles and the failure rate are maintained as runs are
+    added and evicted, so reading them never rescans runs or raw JSON.
+    """
+
+    def __init__(self, project_id, pipeline_id, window=HISTORY_RUNS):
+        self.project_id = project_id
+        self.pipeline_id = pipeline_id
+        self.window = window
+        self.ids = array('q', [0]) * window
+        self.started = array('d', [0.0]) * window  # Epoch seconds
+        self.durations = array('d', [0.0]) * window  # Seconds
+        self.results = array('b', [0]) * window
+        self.head = 0  # Next slot to write; the oldest run once the window is full
+        self.count = 0
+        self.known_ids = set()
+        self.sorted_durations = []
+        self.result_counts = [0, 0, 0]
+        self.latest_finished = float('-inf')  # Epoch seconds the newest run held finished; runs are fetched past it
+
+    def add(self, run_id, started, duration, result):
+        if run_id in self.known_ids:
+            return False
+        slot = self.head
+        if self.count == self.window:
+            self.evict(slot)
+        else:
+            self.count += 1
+        self.ids[slot] = run_id
+        self.started[slot] = started
+        self.durations[slot] = duration
+        self.results[slot] = result
+        self.known_ids.add(run_id)
+        bisect.insort(self.sorted_durations, duration)
+        self.result_counts[result] += 1
+        self.head = (slot + 1) % self.window
+        self.latest_finished = max(self.latest_finished, started + duration)
+        return True
+
+    def evict(self, slot):
+        self.known_ids.discard(self.ids[slot])
+        del self.sorted_durations[bisect.bisect_left(self.sorted_durations, self.durations[slot])]
+        self.result_counts[self.results[slot]] -= 1
+
+    def add_run(self, run):
+        """
+        Add a run from the pipeline runs API. Runs that have not completed
+        are ignored.
+        """
+        if run.get('state') != 'completed' or not run.get('createdDate') or not run.get('finishedDate'):
+            return False
+        started = parser.isoparse(run['createdDate']).timestamp()
+        finished = parser.isoparse(run['finishedDate']).timestamp()
+        result = RESULT_CODES.get((run.get('result') or '').lower(), OTHER)
+        return self.add(run['id'], started, max(0.0, finished - started), result)
+
+    def finished_since(self, finished_date):
+        """True if a run that finished at `finished_date` (ISO 8601) finished after every run held."""
+        return bool(finished_date) and parser.isoparse(finished_date).timestamp() > self.latest_finished
+
+    async def update(self, client):
+        """
+        Fetch runs that finished after the newest run held, following
+        continuation tokens until a page holds only runs that finished before
+        it, or the window is filled. Runs are listed newest first by
+        creation, so a run that started before a held run but finished after
+        it is still picked up. Returns the number of runs added.
+        """
+        new_runs = []
+        token = None
+        while True:
+            data = await client.get_pipeline_runs(self.project_id, self.pipeline_id, continuation_token=token)
+            reached_watermark = True
+            for run in data.get('value', []):
+                completed = run.get('state') == 'completed'
+                if completed and not self.finished_since(run.get('finishedDate')):
+                    continue  # Finished no later than the newest run held
+                reached_watermark = False  # Still running, or finished after it
+                if completed and run.get('id') not in self.known_ids:
+                    new_runs.append(run)
+            token = data.get('continuationToken')
+            if reached_watermark or not token or len(new_runs) >= self.window:
+                break
+        # Oldest first, so the newest run ends up last in the ring
+        new_runs.sort(key=lambda run: run.get('finishedDate') or '')
+        return sum(self.add_run(run) for run in new_runs[-self.window:])
+
+    def percentile(self, q):
+        if not self.sorted_durations:
+            return None
+        return self.sorted_durations[max(0, math.ceil(q * self.count) - 1)]
+
+    def failure_rate(self):
+        return self.result_counts[FAILED] / self.count if self.count else None
+
+    def recent_slots(self, n):
+        n = min(n, self.count)
+        return [(self.head - n + i) % self.window for i in range(n)]
+
+    def sparkline(self, width=20):
+        """
+        Durations of the last `width` runs, oldest first, scaled between the
+        shortest and longest of them.
+        """
+        durations = [self.durations[slot] for slot in self.recent_slots(width)]
+        if not durations:
+            return ''
+        low, high = min(durations), max(durations)
+        scale = (len(SPARK_CHARS) - 1) / (high - low) if high > low else 0
+        return ''.join(SPARK_CHARS[int((duration - low) * scale)] for duration in durations)
+
+    def summary(self, width=20):
+        if not self.count:
+            return 'No completed runs'
+        return (f'p50 {format_duration(self.percentile(0.5))}  p95 {format_duration(self.percentile(0.95))}  '
+                f'{self.failure_rate():.0%} failed  {self.sparkline(width)}')
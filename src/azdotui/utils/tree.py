@@ -1,5 +1,8 @@
 # utils/tree.py
 
+from azdotui.utils.metrics import metrics
+
+
 class TreeNode:
     def __init__(self, name, is_folder=False):
         self.name = name
@@ -11,6 +14,7 @@ class TreeNode:
     def add_child(self, child):
         self.children.append(child)
 
+@metrics.timed('tree.build_tree')
 def build_tree(pipelines):
     root = TreeNode('root', is_folder=True)
     root.expanded = True  # Set root to expanded by default
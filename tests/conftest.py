@@ -0,0 +1,60 @@
+# tests/conftest.py
+#
+# pytest-asyncio isn't a dependency, so async code is driven with
+# asyncio.run inside plain tests.
+
+import os
+import tempfile
+
+# config/logger.py opens LOG_FILE when first imported; keep test logs out of the tree
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.mkdtemp(prefix='azdotui-tests-'), 'app.log'))
+# Never talk to a polling daemon that happens to be running
+os.environ['AZDOTUI_DAEMON_SOCKET'] = ''
+
+import asyncio  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+
+import pytest  # noqa: E402
+from azdotui.api.azdo import AzureDevOpsClient  # noqa: E402
+from azdotui.devtools.headless import headless_curses  # noqa: E402
+from azdotui.devtools.mock_server import MockAzureDevOps, MockServer  # noqa: E402
+from azdotui.devtools.synthetic import SyntheticOrg  # noqa: E402
+
+
+@asynccontextmanager
+async def _mock_client(**options):
+    """Yield (mock, client) for a mock server on a free port."""
+    options.setdefault('org', SyntheticOrg(projects=2, pipelines=20, builds=200, seed=1))
+    mock = MockAzureDevOps(**options)
+    async with MockServer(mock.create_app()) as server:
+        client = AzureDevOpsClient(server.base_url, 'pat')
+        try:
+            yield mock, client
+        finally:
+            await client.close()
+
+
+@asynccontextmanager
+async def _headless_layout(client):
+    """Yield a Layout drawing to a virtual screen, with auto-refresh stopped."""
+    from azdotui.ui.layout import Layout
+
+    with headless_curses() as screen:
+        layout = Layout(screen, client)
+        for task in layout.auto_refresh_tasks:
+            task.cancel()
+        await asyncio.gather(*layout.auto_refresh_tasks, return_exceptions=True)
+        try:
+            yield layout
+        finally:
+            layout.prefetcher.cancel()
+
+
+@pytest.fixture
+def mock_client():
+    return _mock_client
+
+
+@pytest.fixture
+def headless_layout():
+    return _headless_layout
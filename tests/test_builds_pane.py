@@ -0,0 +1,127 @@
+import asyncio
+
+from azdotui.events.bus import BuildsCancelled
+from azdotui.ui.panes import builds_pane
+from azdotui.ui.panes.builds_pane import BUILDS_PER_CATEGORY
+
+
+def build(build_id, status, result=None, queued=0, finished=None, pipeline_id=1):
+    build = {'id': build_id, 'status': status, 'buildNumber': str(build_id),
+             'queueTime': f'2026-01-01T00:{queued:02d}:00Z', 'definition': {'id': pipeline_id, 'name': 'ci'}}
+    if result:
+        build.update(result=result, finishTime=f'2026-01-01T01:{finished:02d}:00Z')
+    return build
+
+
+def test_completed_builds_are_ordered_by_finish_time(headless_layout):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            # Finish order differs from queue order
+            pane.builds_by_category = {'succeeded': [build(1, 'completed', 'succeeded', queued=1, finished=30),
+                                                     build(2, 'completed', 'succeeded', queued=5, finished=10)]}
+            pane.apply_build_update('project', build(3, 'completed', 'succeeded', queued=0, finished=20))
+            assert [b['id'] for b in pane.builds_by_category['succeeded']] == [1, 3, 2]
+
+    asyncio.run(main())
+
+
+def test_running_builds_are_ordered_by_queue_time_and_trimmed(headless_layout):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            pane.builds_by_category = {'running': [build(i, 'inProgress', queued=50 - i * 10)
+                                                   for i in range(BUILDS_PER_CATEGORY)]}
+            pane.apply_build_update('project', build(99, 'inProgress', queued=45))
+            running = [b['id'] for b in pane.builds_by_category['running']]
+            assert len(running) == BUILDS_PER_CATEGORY
+            assert running[:2] == [0, 99]
+            assert BUILDS_PER_CATEGORY - 1 not in running  # The oldest fell off
+
+    asyncio.run(main())
+
+
+def test_update_moves_a_build_between_categories(headless_layout):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            pane.builds_by_category = {'running': [build(1, 'inProgress')], 'failed': []}
+            layout.full_render_needed = False
+            pane.needs_render = False
+            pane.apply_build_update('project', {'id': 1, 'status': 'completed', 'result': 'failed',
+                                                'finishTime': '2026-01-01T01:00:00Z'})
+            assert pane.builds_by_category['running'] == []
+            assert [b['id'] for b in pane.builds_by_category['failed']] == [1]
+            assert pane.builds_by_category['failed'][0]['definition']['id'] == 1  # Merged into the held build
+            assert [b['id'] for b in pane.items] == [1]
+            assert pane.needs_render and not layout.full_render_needed
+
+    asyncio.run(main())
+
+
+def test_updates_for_other_projects_or_pipelines_are_ignored(headless_layout):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            pane.pipeline_id = 1
+            pane.apply_build_update('other', build(1, 'inProgress'))
+            pane.apply_build_update('project', build(2, 'inProgress', pipeline_id=2))
+            assert not any(pane.builds_by_category.values())
+
+    asyncio.run(main())
+
+
+def test_updates_for_other_branches_are_ignored(headless_layout, monkeypatch):
+    monkeypatch.setattr(builds_pane, 'BUILDS_BRANCH', 'refs/heads/main')
+
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            pane.builds_by_category = {'running': [dict(build(1, 'inProgress'), sourceBranch='refs/heads/main')]}
+            pane.set_items(pane.displayed_builds())
+            pane.apply_build_update('project', dict(build(2, 'inProgress'), sourceBranch='refs/heads/feature'))
+            pane.apply_build_update('project', build(3, 'inProgress'))  # Branch unknown
+            pane.on_builds_cancelled(BuildsCancelled('project', (4,)))
+            assert [b['id'] for b in pane.items] == [1]
+
+            # Updates without a branch still apply to builds already shown
+            pane.apply_build_update('project', {'id': 1, 'status': 'completed', 'result': 'failed'})
+            assert [b['id'] for b in pane.builds_by_category['failed']] == [1]
+
+    asyncio.run(main())
+
+
+class FailingApprovals:
+    def __init__(self):
+        self.approval_calls = 0
+
+    async def get_builds(self, project_id, **params):
+        return {'value': []}
+
+    async def get_approvals(self, project_id, state='pending'):
+        self.approval_calls += 1
+        return {}
+
+
+def test_failed_approvals_fetch_backs_off_and_keeps_marks(headless_layout):
+    async def main():
+        client = FailingApprovals()
+        async with headless_layout(client) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'project'
+            pane.awaiting_approval = frozenset({1})
+            await pane.refresh_data()
+            await pane.refresh_data()
+            assert client.approval_calls == 1
+            assert pane.awaiting_approval == {1}
+
+            pane.approvals_due = float('-inf')
+            await pane.refresh_data()
+            assert client.approval_calls == 2 and pane.approvals_failures == 2
+
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import asyncio
+
+from azdotui.utils.bulk import run_bounded
+
+
+async def collect(items, fn, limit):
+    return [result async for result in run_bounded(items, fn, limit)]
+
+
+def test_yields_in_completion_order():
+    async def fn(delay):
+        await asyncio.sleep(delay)
+        return delay * 10
+
+    results = asyncio.run(collect([0.03, 0.01, 0.02], fn, limit=3))
+    assert results == [(0.01, 0.1, None), (0.02, 0.2, None), (0.03, 0.3, None)]
+
+
+def test_limits_calls_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def fn(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item
+
+    results = asyncio.run(collect(range(10), fn, limit=3))
+    assert peak == 3
+    assert sorted(item for item, _, _ in results) == list(range(10))
+
+
+def test_failures_are_yielded_without_stopping_the_batch():
+    async def fn(item):
+        if item == 2:
+            raise ValueError('boom')
+        return item
+
+    results = {item: (result, error) for item, result, error in asyncio.run(collect(range(4), fn, limit=2))}
+    assert set(results) == {0, 1, 2, 3}
+    assert results[2][0] is None and isinstance(results[2][1], ValueError)
+    assert all(results[item] == (item, None) for item in (0, 1, 3))
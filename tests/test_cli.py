@@ -0,0 +1,20 @@
+import asyncio
+
+from azdotui import cli
+from azdotui.api.azdo import AzureDevOpsClient
+
+
+def test_status_fails_for_unknown_projects_and_unreachable_servers(mock_client, capsys):
+    async def main():
+        async with mock_client() as (mock, client):
+            name = mock.org.projects[0]['name']
+            assert await cli.status(client, cli.parse_args(['status', '--project', name])) == 0
+            assert await cli.status(client, cli.parse_args(['status', '--project', name, '--project', 'missing'])) == 1
+        unreachable = AzureDevOpsClient('http://127.0.0.1:9/org', 'pat')
+        try:
+            assert await cli.status(unreachable, cli.parse_args(['status'])) == 1
+        finally:
+            await unreachable.close()
+
+    asyncio.run(main())
+    assert "Project 'missing' not found" in capsys.readouterr().out
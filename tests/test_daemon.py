@@ -0,0 +1,149 @@
+import asyncio
+import os
+
+import pytest
+from azdotui.daemon.client import DaemonClient
+from azdotui.daemon import protocol, server
+from azdotui.daemon.server import PollingDaemon
+
+
+class CountingClient:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+
+    async def get_builds(self, project_id, **params):
+        self.calls.append(project_id)
+        call = len(self.calls)
+        await asyncio.sleep(self.delay)
+        return {'value': [{'id': call, 'project': project_id}]}
+
+    async def close(self):
+        pass
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def main():
+        upstream = CountingClient()
+        daemon = PollingDaemon(upstream, socket_path=None)
+        entries = await asyncio.gather(*[daemon.get('get_builds', ['p'], {}) for _ in range(5)],
+                                       daemon.get('get_builds', ['q'], {}))
+        assert sorted(upstream.calls) == ['p', 'q']
+        assert len({id(entry) for entry in entries[:5]}) == 1
+        assert entries[0].data == {'value': [{'id': 1, 'project': 'p'}]}
+        assert entries[0].pending is None
+
+        # Served from the cache until the poll interval has passed
+        await daemon.get('get_builds', ['p'], {})
+        assert len(upstream.calls) == 2
+
+    asyncio.run(main())
+
+
+def test_requests_over_the_socket_are_coalesced(tmp_path):
+    async def main():
+        path = str(tmp_path / 'daemon.sock')
+        upstream = CountingClient()
+        daemon = PollingDaemon(upstream, path)
+        server = asyncio.create_task(daemon.serve())
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+        fallback = CountingClient()
+        clients = [await DaemonClient.connect(path, fallback) for _ in range(3)]
+        results = await asyncio.gather(*[client.get_builds('p') for client in clients])
+        assert results == [{'value': [{'id': 1, 'project': 'p'}]}] * 3
+        assert upstream.calls == ['p'] and fallback.calls == []
+
+        # A second daemon must not take over a socket that still answers
+        with pytest.raises(RuntimeError):
+            await PollingDaemon(CountingClient(), path).serve()
+        assert os.path.exists(path)
+
+        for client in clients:
+            await client.close()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+        assert not os.path.exists(path)
+
+    asyncio.run(main())
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    import socket
+
+    async def main():
+        path = str(tmp_path / 'daemon.sock')
+        with socket.socket(socket.AF_UNIX) as stale:
+            stale.bind(path)  # Bound but not listening, like a socket left by a killed daemon
+        server = asyncio.create_task(PollingDaemon(CountingClient(), path).serve())
+        client = None
+        for _ in range(100):
+            client = await DaemonClient.connect(path, CountingClient())
+            if client:
+                break
+            await asyncio.sleep(0.01)
+        assert client is not None
+        await client.close()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_running_build_logs_are_refreshed(mock_client):
+    async def main():
+        async with mock_client() as (mock, client):
+            project_id, builds = next(iter(mock.org.builds.items()))
+            running = next(b for b in builds if b['status'] == 'inProgress')
+            daemon = PollingDaemon(client, socket_path=None, poll_interval=0.01)
+
+            def line_count(entry):
+                return sum(log['lineCount'] for log in entry.data['value'])
+
+            first = line_count(await daemon.get('get_build_logs', [project_id, running['id']], {}))
+            await asyncio.sleep(0.02)
+            assert line_count(await daemon.get('get_build_logs', [project_id, running['id']], {})) > first
+
+    asyncio.run(main())
+
+
+def test_lists_expire(monkeypatch):
+    async def main():
+        upstream = CountingClient()
+        upstream.get_projects = lambda: upstream.get_builds('projects')
+        daemon = PollingDaemon(upstream, socket_path=None, poll_interval=0.01)
+        await daemon.get('get_projects', [], {})
+        await asyncio.sleep(0.02)
+        await daemon.get('get_projects', [], {})
+        assert len(upstream.calls) == 1  # Lists aren't polled
+
+        monkeypatch.setattr(server, 'LIST_TTL', 0.01)
+        await daemon.get('get_projects', [], {})
+        assert len(upstream.calls) == 2
+
+    asyncio.run(main())
+
+
+def test_shared_socket_is_group_accessible(tmp_path):
+    async def main():
+        path = str(tmp_path / 'daemon.sock')
+        server = asyncio.create_task(PollingDaemon(CountingClient(), path, allow_group=os.getgid()).serve())
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        assert os.stat(path).st_mode & 0o777 == 0o660
+        assert os.stat(path).st_gid == os.getgid()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_peers_of_other_users_need_the_allowed_group(monkeypatch):
+    other_uid = os.getuid() + 4242
+    monkeypatch.setattr(protocol, 'peer_credentials', lambda sock: (other_uid, 4242))
+    assert not protocol.trusted_peer(object())
+    assert not protocol.trusted_peer(object(), group=4343)
+    assert protocol.trusted_peer(object(), group=4242)
+    assert protocol.trusted_peer(object(), owner=other_uid)
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from azdotui import cli
+
+
+class Interrupted(Exception):
+    pass
+
+
+class FailAfterPages:
+    """Wraps a client so iter_builds fails after `pages` pages, like a dropped connection."""
+
+    def __init__(self, client, pages):
+        self.client = client
+        self.pages = pages
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def iter_builds(self, *args, **kwargs):
+        served = 0
+        async for page in self.client.iter_builds(*args, **kwargs):
+            if served == self.pages:
+                raise Interrupted('connection lost')
+            served += 1
+            yield page
+
+
+def read_ids(path):
+    with open(path) as f:
+        return [json.loads(line)['id'] for line in f]
+
+
+def test_export_resumes_from_its_checkpoint(mock_client, tmp_path, capsys):
+    output = str(tmp_path / 'builds.ndjson')
+    checkpoint = str(tmp_path / 'export.ckpt')
+    args = cli.parse_args(['export', '--output', output, '--checkpoint', checkpoint, '--concurrency', '1'])
+
+    async def main():
+        async with mock_client(page_size=30) as (mock, client):
+            expected = {build['id'] for builds in mock.org.builds.values() for build in builds}
+
+            assert await cli.export(FailAfterPages(client, pages=2), args) == 1
+            with open(checkpoint) as f:
+                saved = json.load(f)
+            assert not all(state['done'] for state in saved['projects'].values())
+            partial = read_ids(output)
+            assert 0 < len(partial) < len(expected)
+
+            assert await cli.export(client, args) == 0
+            ids = read_ids(output)
+            assert len(ids) == len(set(ids)) == len(expected)  # Nothing lost or written twice
+            assert set(ids) == expected
+            assert ids[:len(partial)] == partial
+
+    asyncio.run(main())
+    capsys.readouterr()
+
+
+def test_checkpoint_of_another_export_is_refused(mock_client, tmp_path, capsys):
+    checkpoint = str(tmp_path / 'export.ckpt')
+    with open(checkpoint, 'w') as f:
+        json.dump({'query': {'branchName': 'other'}, 'format': 'ndjson', 'projects': {}}, f)
+    args = cli.parse_args(['export', '--output', str(tmp_path / 'out'), '--checkpoint', checkpoint])
+
+    async def main():
+        async with mock_client() as (_, client):
+            assert await cli.export(client, args) == 1
+
+    asyncio.run(main())
+    assert 'different export' in capsys.readouterr().out
+
+
+def test_export_is_bounded_by_queue_time(mock_client, tmp_path, capsys):
+    output = str(tmp_path / 'builds.ndjson')
+
+    async def main():
+        async with mock_client() as (mock, client):
+            builds = [build for builds in mock.org.builds.values() for build in builds]
+            queued = sorted(build['queueTime'] for build in builds)
+            since, until = queued[len(queued) // 4], queued[len(queued) * 3 // 4]
+            args = cli.parse_args(['export', '--output', output, '--since', since, '--until', until])
+            assert await cli.export(client, args) == 0
+            expected = {build['id'] for build in builds if since <= build['queueTime'] < until}
+            ids = read_ids(output)
+            assert expected and len(ids) == len(expected) and set(ids) == expected
+
+    asyncio.run(main())
+    capsys.readouterr()
@@ -0,0 +1,73 @@
+import asyncio
+import curses
+
+from azdotui.events import keybindings
+from azdotui.events.keybindings import handle_keys
+
+
+def projects(layout, count):
+    pane = layout.panes['projects']
+    pane.items = [{'id': str(i), 'name': f'project-{i}', 'organization': None} for i in range(count)]
+    pane.cursor_moved = lambda: None  # Nothing to prefetch without a client
+    return pane
+
+
+def test_arrow_runs_become_one_move(headless_layout, monkeypatch):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = projects(layout, 10)
+            moves = []
+            navigate_by = pane.navigate_by
+            monkeypatch.setattr(pane, 'navigate_by', lambda delta: (moves.append(delta), navigate_by(delta)))
+            await handle_keys(layout, [curses.KEY_DOWN] * 5 + [curses.KEY_UP])
+            assert moves == [4]
+            assert pane.selected_index == 4
+
+    asyncio.run(main())
+
+
+def test_moves_are_flushed_around_other_keys(headless_layout, monkeypatch):
+    async def main():
+        async with headless_layout(None) as layout:
+            pane = projects(layout, 10)
+            moves = []
+            navigate_by = pane.navigate_by
+            monkeypatch.setattr(pane, 'navigate_by', lambda delta: (moves.append(delta), navigate_by(delta)))
+            await handle_keys(layout, [curses.KEY_DOWN, curses.KEY_DOWN, 9, curses.KEY_UP])
+            assert moves == [2]  # The Up after Tab moves the now active Pipelines pane, which is empty
+            assert pane.selected_index == 2
+            assert layout.active_pane_name == 'pipelines'
+
+    asyncio.run(main())
+
+
+def test_repeated_toggles_are_collapsed(headless_layout, monkeypatch):
+    async def main():
+        async with headless_layout(None) as layout:
+            handled = []
+            handle_key = keybindings.handle_key
+
+            async def counting(layout, key):
+                handled.append(key)
+                await handle_key(layout, key)
+
+            monkeypatch.setattr(keybindings, 'handle_key', counting)
+            await handle_keys(layout, [ord('m')] * 4)  # Shown and hidden twice
+            assert handled == [] and not layout.metrics_overlay.visible
+            await handle_keys(layout, [ord('m')] * 3)
+            assert handled == [ord('m')] and layout.metrics_overlay.visible
+            handled.clear()
+            await handle_keys(layout, [9] * 4)  # Three panes, so four Tabs are one
+            assert handled == [9] and layout.active_pane_name == 'pipelines'
+
+    asyncio.run(main())
+
+
+def test_prompt_input_is_never_collapsed(headless_layout):
+    async def main():
+        async with headless_layout(None) as layout:
+            layout.set_input_mode('Branch: ', None)
+            await handle_keys(layout, [ord('m')] * 4)
+            assert layout.input_buffer == 'mmmm'
+
+    asyncio.run(main())
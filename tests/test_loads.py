@@ -0,0 +1,62 @@
+import asyncio
+
+from azdotui.events.bus import BuildsUpdated
+from azdotui.utils.metrics import metrics
+
+
+def running_build(build_id):
+    return {'id': build_id, 'status': 'inProgress', 'buildNumber': str(build_id),
+            'queueTime': '2026-01-01T00:00:00Z', 'definition': {'id': 1, 'name': 'ci'}}
+
+
+BUILD_IDS = {'slow': 1, 'fast': 2}
+
+
+class SlowBuilds:
+    """Serves one running build per project after a per-project delay."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def get_builds(self, project_id, **params):
+        await asyncio.sleep(self.delays[project_id])
+        if params.get('status_filter') != 'inProgress':
+            return {'value': []}
+        return {'value': [running_build(BUILD_IDS[project_id])]}
+
+    async def get_approvals(self, project_id, state='pending'):
+        return {'value': []}
+
+
+def test_superseded_load_is_dropped(headless_layout):
+    async def main():
+        async with headless_layout(SlowBuilds({'slow': 0.05, 'fast': 0})) as layout:
+            pane = layout.panes['builds']
+            published = []
+            layout.events.subscribe(BuildsUpdated, published.append)
+            superseded = metrics.counters.get('load.superseded', 0)
+            first = pane.load_builds('slow')
+            second = pane.load_builds('fast')
+            await asyncio.gather(first, second, return_exceptions=True)
+            assert first.cancelled()
+            assert metrics.counters['load.superseded'] == superseded + 1
+            assert [event.project_id for event in published] == ['fast']
+            assert [b['id'] for b in pane.items] == [BUILD_IDS['fast']]
+            assert not pane.is_loading
+
+    asyncio.run(main())
+
+
+def test_results_of_an_older_generation_are_dropped(headless_layout):
+    async def main():
+        async with headless_layout(SlowBuilds({'slow': 0.05, 'fast': 0})) as layout:
+            pane = layout.panes['builds']
+            pane.project_id = 'slow'
+            stale = asyncio.create_task(pane.refresh_data())  # Not cancelled, unlike a start_load
+            await asyncio.sleep(0.01)
+            pane.project_id = 'fast'
+            await pane.start_load()
+            await stale
+            assert [b['id'] for b in pane.items] == [BUILD_IDS['fast']]
+
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+import asyncio
+
+
+def test_concurrent_refreshes_append_each_line_once(mock_client, headless_layout):
+    async def main():
+        async with mock_client() as (mock, client):
+            async with headless_layout(client) as layout:
+                project_id = mock.org.projects[0]['id']
+                build = (await client.get_builds(project_id, top=1))['value'][0]
+                pane = layout.panes['logs']
+                pane.open(project_id, build)
+                await asyncio.gather(pane.refresh_data(), pane.refresh_data(), pane.refresh_data())
+                headers = len(pane.log_offsets)
+                assert headers
+                assert len(pane.lines) == sum(pane.log_offsets.values()) + headers
+
+    asyncio.run(main())
+
+
+def test_throttled_log_stream_is_retried(mock_client):
+    async def main():
+        async with mock_client(throttle_rate=1.0, retry_after=0.05) as (mock, client):
+            project_id = mock.org.projects[0]['id']
+            build = next(b for b in mock.org.builds[project_id] if b['status'] == 'completed')
+
+            async def stream():
+                return [line async for line in client.iter_build_log_lines(project_id, build['id'], 1)]
+
+            task = asyncio.create_task(stream())
+            await asyncio.sleep(0.01)
+            mock.throttle_rate = 0
+            lines = await task
+            assert lines and client.throttled_until > 0
+            assert mock.request_counts[f'/mock/{project_id}/_apis/build/builds/{build["id"]}/logs/1'] == 2
+
+    asyncio.run(main())
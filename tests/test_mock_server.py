@@ -0,0 +1,24 @@
+import asyncio
+
+
+def test_top_limits_the_total_across_pages(mock_client):
+    async def main():
+        async with mock_client(page_size=10) as (mock, client):
+            project_id = mock.org.projects[0]['id']
+            pages = [len(builds) async for builds, _ in client.iter_builds(project_id, **{'$top': 25})]
+            assert pages == [10, 10, 5]
+            pages = [len(builds) async for builds, _ in client.iter_builds(project_id)]
+            assert sum(pages) == len(mock.org.builds[project_id])
+            assert max(pages) == 10
+
+    asyncio.run(main())
+
+
+def test_top_within_one_page_has_no_continuation_token(mock_client):
+    async def main():
+        async with mock_client(page_size=10) as (mock, client):
+            data = await client.get_builds(mock.org.projects[0]['id'], top=5)
+            assert len(data['value']) == 5
+            assert 'continuationToken' not in data
+
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+import asyncio
+
+from azdotui.utils.run_history import FAILED, SUCCEEDED, RunHistory
+
+
+def run(run_id, created_minute, finished_minute=None, result='succeeded'):
+    run = {'id': run_id, 'state': 'inProgress', 'createdDate': f'2026-01-01T00:{created_minute:02d}:00Z'}
+    if finished_minute is not None:
+        run.update(state='completed', result=result, finishedDate=f'2026-01-01T00:{finished_minute:02d}:00Z')
+    return run
+
+
+class PagedRuns:
+    """Stands in for the client; serves `pages` newest first with continuation tokens."""
+
+    def __init__(self, *pages):
+        self.pages = pages
+        self.calls = 0
+
+    async def get_pipeline_runs(self, project_id, pipeline_id, continuation_token=None):
+        self.calls += 1
+        index = int(continuation_token or 0)
+        data = {'value': self.pages[index]}
+        if index + 1 < len(self.pages):
+            data['continuationToken'] = str(index + 1)
+        return data
+
+
+def test_percentiles_and_failure_rate():
+    history = RunHistory('project', 1, window=100)
+    for run_id in range(1, 101):
+        history.add(run_id, 0.0, float(run_id), FAILED if run_id % 4 == 0 else SUCCEEDED)
+    assert history.percentile(0.5) == 50
+    assert history.percentile(0.95) == 95
+    assert history.percentile(1.0) == 100
+    assert history.failure_rate() == 0.25
+
+
+def test_window_evicts_oldest_runs():
+    history = RunHistory('project', 1, window=3)
+    for run_id, duration, result in [(1, 50.0, FAILED), (2, 10.0, SUCCEEDED), (3, 30.0, SUCCEEDED),
+                                     (4, 20.0, SUCCEEDED), (5, 40.0, FAILED)]:
+        assert history.add(run_id, 0.0, duration, result)
+    assert history.count == 3
+    assert history.known_ids == {3, 4, 5}
+    assert history.sorted_durations == [20.0, 30.0, 40.0]
+    assert history.result_counts == [2, 1, 0]
+    assert [history.ids[slot] for slot in history.recent_slots(3)] == [3, 4, 5]
+    assert not history.add(5, 0.0, 1.0, SUCCEEDED)  # Already held
+
+
+def test_update_fetches_only_runs_finished_since_the_last_update():
+    history = RunHistory('project', 1)
+    assert asyncio.run(history.update(PagedRuns([run(3, 10, 12), run(2, 5, 8), run(1, 1)]))) == 2
+
+    # Run 1 started before the runs held but finished after them; run 0 is older than all of them
+    client = PagedRuns([run(4, 20, 21), run(3, 10, 12)], [run(2, 5, 8), run(1, 1, 30)], [run(0, 0, 2)])
+    assert asyncio.run(history.update(client)) == 2
+    assert history.known_ids == {1, 2, 3, 4}
+    assert client.calls == 3  # The last page holds only runs finished before the watermark
+
+    # Nothing new: one page is enough
+    client = PagedRuns([run(4, 20, 21), run(3, 10, 12)], [run(2, 5, 8)])
+    assert asyncio.run(history.update(client)) == 0
+    assert client.calls == 1
+
+
+def test_update_adds_runs_oldest_first():
+    history = RunHistory('project', 1, window=2)
+    asyncio.run(history.update(PagedRuns([run(3, 10, 12), run(2, 5, 8), run(1, 1, 2)])))
+    assert [history.ids[slot] for slot in history.recent_slots(2)] == [2, 3]
+
+
+def test_update_against_the_mock_server(mock_client):
+    async def main():
+        async with mock_client(page_size=10) as (mock, client):
+            project_id = mock.org.projects[0]['id']
+            pipeline_id = mock.org.builds[project_id][0]['definition']['id']
+            completed = {build['id'] for build in mock.org.builds[project_id]
+                         if build['definition']['id'] == pipeline_id and build['status'] == 'completed'}
+            history = RunHistory(project_id, pipeline_id)
+            assert await history.update(client) == len(completed)
+            assert history.known_ids == completed
+            assert await history.update(client) == 0
+
+    asyncio.run(main())
+
+
+def test_switching_projects_drops_histories(mock_client, headless_layout):
+    async def main():
+        async with mock_client() as (mock, client):
+            async with headless_layout(client) as layout:
+                first, second = (project['id'] for project in mock.org.projects[:2])
+                pipeline_id = mock.org.builds[first][0]['definition']['id']
+                pane = layout.panes['pipelines']
+                pane.project_id = first
+                pane.load_history(pipeline_id)
+                task = pane.history_tasks[(first, pipeline_id)]
+                await pane.load_pipelines(first)
+                assert (first, pipeline_id) in pane.histories
+
+                await pane.load_pipelines(second)
+                assert task.done()
+                assert pane.histories == {} and pane.history_tasks == {}
+
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+from azdotui.api.webhooks import build_from_payload
+
+
+def test_build_complete_payload():
+    payload = {
+        'eventType': 'build.complete',
+        'resource': {'id': 7, 'result': 'failed', 'finishTime': '2026-01-01T00:05:00Z',
+                     'project': {'id': 'project'}, 'definition': {'id': 3, 'name': 'ci'}},
+    }
+    project_id, build = build_from_payload(payload)
+    assert project_id == 'project'
+    assert build['id'] == 7 and build['status'] == 'completed' and build['result'] == 'failed'
+    assert build['definition'] == {'id': 3, 'name': 'ci'}
+
+
+def test_run_state_changed_payload():
+    payload = {
+        'eventType': 'ms.vss-pipelines.run-state-changed-event',
+        'resource': {
+            'run': {'id': 9, 'name': '20260101.1', 'state': 'completed', 'result': 'succeeded',
+                    'createdDate': '2026-01-01T00:00:00Z', 'finishedDate': '2026-01-01T00:03:00Z',
+                    'resources': {'repositories': {'self': {'refName': 'refs/heads/main'}}}},
+            'pipeline': {'id': 3, 'name': 'ci', 'folder': '\\services'},
+        },
+        'resourceContainers': {'project': {'id': 'project'}},
+    }
+    project_id, build = build_from_payload(payload)
+    assert project_id == 'project'
+    assert build == {
+        'id': 9, 'buildNumber': '20260101.1', 'status': 'completed', 'result': 'succeeded',
+        'queueTime': '2026-01-01T00:00:00Z', 'finishTime': '2026-01-01T00:03:00Z',
+        'definition': {'id': 3, 'name': 'ci', 'path': '\\services'}, 'sourceBranch': 'refs/heads/main',
+    }
+
+
+def test_running_run_has_no_result():
+    payload = {
+        'eventType': 'ms.vss-pipelines.run-state-changed-event',
+        'resource': {'run': {'id': 9, 'state': 'inProgress'}, 'pipeline': {'id': 3}},
+        'resourceContainers': {'project': {'id': 'project'}},
+    }
+    _, build = build_from_payload(payload)
+    assert build['status'] == 'inProgress'
+    assert 'result' not in build and 'finishTime' not in build
+
+
+def test_other_events_are_ignored():
+    assert build_from_payload({'eventType': 'git.push', 'resource': {}}) == (None, None)